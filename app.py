@@ -1,13 +1,26 @@
 import dash
-from dash import Dash, html, dcc, Input, Output, State, callback, callback_context, DiskcacheManager
+from dash import Dash, html, dcc, Input, Output, State, callback, DiskcacheManager
 import dash_bootstrap_components as dbc
-from flask import Flask
+from flask import Flask, Response, abort, g, request
 from dotenv import load_dotenv
 import os
 import sys
-import diskcache
+import time
 import multiprocess
 
+# Ensure project root is in sys.path for Render
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Before any project import: logic modules read their settings from the environment at import time
+load_dotenv()
+
+from logic.dataset_cache import get_cache
+from logic.metrics import observe, register_gauge, render_prometheus
+from logic.job_pool import BACKGROUND_WORKERS, WarmPoolManager
+from logic.progress import open_stream as open_progress_stream, valid_channel
+
 # On macOS, spawn is default but we want to be explicit and avoid crashes
 # We use multiprocess because DiskcacheManager uses it if available
 try:
@@ -17,18 +30,63 @@ except RuntimeError:
     # Already set
     pass
 
-# DiskCache for background callbacks
-cache = diskcache.Cache("./.cache")
-background_callback_manager = DiskcacheManager(cache)
+# DiskCache for background callbacks, shared with the server-side dataset cache.
+# Jobs run on a pool of workers that have already imported the app; with
+# BACKGROUND_WORKERS=0 every job spawns a fresh process instead.
+if BACKGROUND_WORKERS > 0:
+    background_callback_manager = WarmPoolManager(get_cache())
+    register_gauge('background_jobs_queued', 'Background jobs waiting for a worker.',
+                   lambda: background_callback_manager.stats()['queued'])
+    register_gauge('background_jobs_running', 'Background jobs currently running.',
+                   lambda: background_callback_manager.stats()['running'])
+    register_gauge('background_workers', 'Background worker processes.',
+                   lambda: background_callback_manager.stats()['workers'])
+    register_gauge('background_worker_utilisation', 'Fraction of background workers busy.',
+                   lambda: background_callback_manager.stats()['utilisation'])
+else:
+    background_callback_manager = DiskcacheManager(get_cache())
 
-# Ensure project root is in sys.path for Render
-PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
-if PROJECT_ROOT not in sys.path:
-    sys.path.insert(0, PROJECT_ROOT)
+server = Flask(__name__)
 
-load_dotenv()
 
-server = Flask(__name__)
+# Server-side latency of every Dash callback request, labelled by its output(s)
+@server.before_request
+def _start_request_timer():
+    g.request_started = time.perf_counter()
+    # Warm the worker pool as soon as this process serves traffic (not in the pool workers themselves)
+    if isinstance(background_callback_manager, WarmPoolManager):
+        background_callback_manager.start()
+
+
+@server.after_request
+def _record_callback_latency(response):
+    if request.path.endswith('/_dash-update-component') and 'request_started' in g:
+        body = request.get_json(silent=True) or {}
+        observe('dash_callback_seconds', time.perf_counter() - g.request_started,
+                callback=body.get('output', 'unknown'))
+    return response
+
+
+@server.route('/metrics')
+def metrics():
+    return Response(render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+
+# Server-sent progress of one data fetch (PROGRESS_TRANSPORT=sse). Each open
+# stream holds a worker thread; gunicorn.conf.py runs threaded workers and
+# refuses to start sync ones with SSE enabled, and at most
+# PROGRESS_SSE_MAX_STREAMS are served at once (the rest get 503, and the
+# browser does not retry them).
+@server.route('/progress/<channel>')
+def progress(channel):
+    if not valid_channel(channel):
+        abort(404)
+    events = open_progress_stream(channel)
+    if events is None:
+        return Response('Too many progress streams', status=503, headers={'Retry-After': '30'})
+    return Response(events, mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 app = Dash(
     __name__,
     server=server,
@@ -52,25 +110,28 @@ app.layout = html.Div(id='theme-main-container', children=[
 ])
 
 
-@callback(
+# Theme toggle runs in the browser: a theme switch needs no server round-trip
+app.clientside_callback(
+    """
+    function(n_clicks, stored_theme) {
+        let theme = stored_theme || 'dark';
+        const triggered = window.dash_clientside.callback_context.triggered || [];
+        const trigger_id = triggered.length ? triggered[0].prop_id.split('.')[0] : null;
+        if (trigger_id === 'theme-switch-button' && n_clicks > 0) {
+            theme = stored_theme === 'dark' ? 'light' : 'dark';
+        }
+
+        const icon = theme === 'light' ? '☀️' : '🌙';
+        const class_name = theme === 'light' ? 'light-theme' : '';
+        return [class_name, icon, theme];
+    }
+    """,
     Output('theme-main-container', 'className'),
     Output('theme-switch-button', 'children'),
     Output('theme-store', 'data'),
     Input('theme-switch-button', 'n_clicks'),
     State('theme-store', 'data')
 )
-def update_theme(n_clicks, stored_theme):
-    ctx = callback_context
-    theme = stored_theme or 'dark'
-    
-    if ctx.triggered:
-        trigger_id = ctx.triggered[0]['prop_id'].split('.')[0]
-        if trigger_id == 'theme-switch-button' and n_clicks > 0:
-            theme = 'light' if stored_theme == 'dark' else 'dark'
-
-    icon = "☀️" if theme == 'light' else "🌙"
-    class_name = 'light-theme' if theme == 'light' else ''
-    return class_name, icon, theme
 
 
 # Clientside callback to sync theme to body class for portals (like dropdown menus)
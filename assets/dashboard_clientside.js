@@ -0,0 +1,162 @@
+// Clientside versions of the dashboard's predictor/theme callbacks (see
+// CLIENTSIDE_RENDERING in pages/dashboard.py). They mirror the server-side
+// functions of the same purpose and read the columnar `fetched-data` payload
+// produced by logic/columnar.py.
+(function() {
+const TYPED_ARRAY_DTYPES = {float32: 'f4', float64: 'f8'};
+
+// Base64 columns are handed to plotly.js as typed-array specs, so nothing is decoded here.
+function scatter(x, column, name, color, yaxis) {
+    const y = typeof column.data === 'string'
+        ? {dtype: TYPED_ARRAY_DTYPES[column.dtype], bdata: column.data}
+        : column.data;
+    return {type: 'scatter', x: x, y: y, name: name, line: {color: color, width: 2}, xaxis: 'x', yaxis: yaxis};
+}
+
+// Id of the component that triggered the current clientside callback (dicts for pattern ids).
+function triggeredId() {
+    const triggered = window.dash_clientside.callback_context.triggered;
+    if (!triggered || !triggered.length || !triggered[0].prop_id || triggered[0].prop_id === '.') {
+        return null;
+    }
+    const propId = triggered[0].prop_id;
+    const id = propId.slice(0, propId.lastIndexOf('.'));
+    return id.charAt(0) === '{' ? JSON.parse(id) : id;
+}
+
+window.dash_clientside = window.dash_clientside || {};
+window.dash_clientside.dashboard = {
+    renderDropdown: function(options, selectedValue) {
+        if (!options || !options.length) {
+            return [[{
+                namespace: 'dash_html_components', type: 'Div',
+                props: {children: 'No predictors available', className: 'custom-dropdown-empty'}
+            }], 'Select a factor...'];
+        }
+
+        let selectedLabel = 'Select a factor...';
+        const optionElements = options.map(function(option) {
+            const isSelected = option.value === selectedValue;
+            if (isSelected) {
+                selectedLabel = option.label;
+            }
+            return {
+                namespace: 'dash_html_components', type: 'Div',
+                props: {
+                    id: {type: 'predictor-option', index: option.value},
+                    className: isSelected ? 'custom-dropdown-option active' : 'custom-dropdown-option',
+                    n_clicks: 0,
+                    children: [
+                        {namespace: 'dash_html_components', type: 'Span', props: {children: option.label}},
+                        {namespace: 'dash_html_components', type: 'Span', props: {children: '✓', className: 'custom-dropdown-check'}}
+                    ]
+                }
+            };
+        });
+        return [optionElements, selectedLabel];
+    },
+
+    selectOption: function() {
+        const triggerId = triggeredId();
+        if (triggerId && triggerId.type === 'predictor-option') {
+            return triggerId.index;
+        }
+        return window.dash_clientside.no_update;
+    },
+
+    toggleDropdown: function(controlClicks, backdropClicks, optionClicks, selectedValue, isOpen) {
+        const triggerId = triggeredId();
+        let nextState;
+        if (triggerId === 'custom-dropdown-control') {
+            nextState = !isOpen;
+        } else if (triggerId === 'custom-dropdown-backdrop' || triggerId === 'predictor-dropdown-value') {
+            nextState = false;
+        } else if (triggerId && triggerId.type === 'predictor-option') {
+            nextState = false;
+        } else {
+            nextState = Boolean(isOpen);
+        }
+
+        return [
+            nextState,
+            {display: nextState ? 'block' : 'none'},
+            {transform: nextState ? 'rotate(180deg)' : 'rotate(0deg)'},
+            {display: nextState ? 'block' : 'none'}
+        ];
+    },
+
+    // Derived features only exist in the monthly 'last' view: lock the frequency selector to it for them
+    lockChartFrequency: function(predictor, monthlyOnly, frequencyOptions, aggregationOptions) {
+        const locked = Boolean(predictor) && (monthlyOnly || []).indexOf(predictor) !== -1;
+        const lock = function(options, keep) {
+            return options.map(function(option) {
+                return Object.assign({}, option, {disabled: locked && option.value !== keep});
+            });
+        };
+        const noUpdate = window.dash_clientside.no_update;
+        return [
+            lock(frequencyOptions, 'M'),
+            locked ? 'M' : noUpdate,
+            lock(aggregationOptions, 'last'),
+            locked ? 'last' : noUpdate
+        ];
+    },
+
+    // `view` is the selected frequency's payload (chart-data), null for the monthly panel itself
+    renderGraph: function(predictor, data, view, theme, layouts) {
+        const empty = {data: [], layout: {}};
+        data = view || data;
+        if (!data || !predictor || !layouts) {
+            return empty;
+        }
+        const columns = data.columns;
+        if (!columns[predictor] || !columns.ZAR_USD) {
+            return empty;
+        }
+
+        // Deep copy so the stored base layout is never mutated
+        const layout = JSON.parse(JSON.stringify(layouts[theme === 'dark' ? 'dark' : 'light']));
+        layout.yaxis2.title = {text: predictor};
+        return {
+            data: [
+                // Primary axis: ZAR/USD
+                scatter(data.index, columns.ZAR_USD, 'ZAR/USD', '#38bdf8', 'y'),
+                // Secondary axis: Selected Predictor
+                scatter(data.index, columns[predictor], predictor, '#8b5cf6', 'y2')
+            ],
+            layout: layout
+        };
+    },
+
+    // PROGRESS_TRANSPORT=sse: follow the fetch's progress channel instead of waiting for polls;
+    // returns the channel followed (null when none) for the progress-stream store
+    followProgress: function(channel) {
+        if (window.dashboardProgressSource) {
+            window.dashboardProgressSource.close();
+            window.dashboardProgressSource = null;
+        }
+        if (!channel || typeof EventSource === 'undefined') {
+            return null;
+        }
+        const source = new EventSource('/progress/' + channel);
+        source.onmessage = function(event) {
+            const update = JSON.parse(event.data);
+            const value = update.value;
+            window.dash_clientside.set_props('fetch-progress-bar', {value: value[0]});
+            window.dash_clientside.set_props('progress-percentage', {children: value[1]});
+            window.dash_clientside.set_props('progress-status', {children: value[2]});
+            if (update.done) {
+                source.close();
+            }
+        };
+        source.onerror = function() {
+            // Refused (too many streams) or gone: the fetch result still arrives through its callback
+            if (source.readyState === EventSource.CLOSED && window.dashboardProgressSource === source) {
+                window.dashboardProgressSource = null;
+            }
+        };
+        window.dashboardProgressSource = source;
+        return channel;
+    }
+};
+})();
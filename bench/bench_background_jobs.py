@@ -0,0 +1,73 @@
+"""Compare time-to-first-progress of background jobs: a spawned process per job vs the warm worker pool.
+
+Each job reports progress immediately and returns, so the timings are the
+fixed cost of starting a job: spawning and importing the app for
+DiskcacheManager, a queue hand-off for WarmPoolManager.
+
+Usage: python bench/bench_background_jobs.py [--jobs 5]
+"""
+import argparse
+import importlib
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+os.environ.setdefault('CACHE_DIR', tempfile.mkdtemp())
+
+import app  # noqa: F401  (a spawned job process imports the app, as in production)
+from dash import DiskcacheManager
+from logic.dataset_cache import cache
+from logic.job_pool import WarmPoolManager
+
+
+def sample_job(set_progress, n):
+    set_progress((0, '0%', 'Starting...'))
+    return sum(range(n))
+
+
+def run_job(manager, job_fn, i):
+    key = f'bench-job-{time.time_ns()}-{i}'
+    progress_key = manager._make_progress_key(key)
+    start = time.perf_counter()
+    manager.call_job_fn(key, job_fn, [1000], {})
+    first_progress = None
+    while not manager.result_ready(key):
+        if first_progress is None and cache.get(progress_key) is not None:
+            first_progress = time.perf_counter() - start
+        time.sleep(0.001)
+    total = time.perf_counter() - start
+    assert cache.get(key) == sum(range(1000))
+    cache.delete(key)
+    cache.delete(progress_key)
+    return first_progress if first_progress is not None else total, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=5)
+    args = parser.parse_args()
+
+    # Referenced through the module so workers unpickle it by name
+    job = importlib.import_module('bench.bench_background_jobs').sample_job
+
+    pool = WarmPoolManager(cache, workers=2, preload=['app', 'bench.bench_background_jobs'])
+    pool.start()
+    managers = {'spawn per job': DiskcacheManager(cache), 'warm pool': pool}
+    for label, manager in managers.items():
+        job_fn = manager.make_job_fn(job, progress=True)
+        run_job(manager, job_fn, -1)  # warm-up (waits for the pool workers to finish preloading)
+        timings = [run_job(manager, job_fn, i) for i in range(args.jobs)]
+        first = sorted(t[0] for t in timings)[len(timings) // 2] * 1000
+        total = sorted(t[1] for t in timings)[len(timings) // 2] * 1000
+        print(f"{label:14s}: first progress {first:8.1f} ms, result {total:8.1f} ms (median of {args.jobs})")
+    time.sleep(0.1)  # let the pool deliver the last completion
+    print(f"pool stats: {pool.stats()}")
+
+
+if __name__ == '__main__':
+    main()
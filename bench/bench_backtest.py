@@ -0,0 +1,52 @@
+"""Benchmark the walk-forward backtest: in-process vs process pool over shared memory, then a cached re-run.
+
+Usage: python bench/bench_backtest.py [--rows 400] [--predictors 9] [--workers 4]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+os.environ.setdefault('CACHE_DIR', tempfile.mkdtemp())
+# Always use the pool when asked, so the pool row measures it
+os.environ.setdefault('BACKTEST_PARALLEL_MIN_SIZE', '0')
+
+import numpy as np
+
+from bench.bench_model import make_panel
+from logic import backtest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=400)
+    parser.add_argument('--predictors', type=int, default=9)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    df = make_panel(args.rows, args.predictors)
+    configs = backtest.default_configs()
+    print(f"{len(configs)} configurations, {args.rows} rows x {args.predictors} predictors")
+
+    results = {}
+    for label, workers, use_cache in (('serial', 1, False), (f'pool x{args.workers}', args.workers, False),
+                                      ('cached', args.workers, True)):
+        start = time.perf_counter()
+        results[label] = backtest.run_backtest(df, configs, max_workers=workers, use_cache=use_cache)
+        print(f"{label:10s}: {time.perf_counter() - start:7.3f}s")
+
+    serial = results['serial']
+    metrics = ['rmse', 'mae', 'directional_accuracy']
+    for label, other in results.items():
+        # Shared-memory workers see a row-major copy of the panel, so sums may differ in the last bits
+        assert np.allclose(serial[metrics], other[metrics], equal_nan=True), f"{label} results differ"
+    print(serial.head(5).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
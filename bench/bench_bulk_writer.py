@@ -0,0 +1,74 @@
+"""Exercise BulkWriter against the local PostgREST stand-in.
+
+Reports payload size per chunk and wall-clock time for several chunk sizes
+and in-flight limits, then injects transient and permanent failures and
+asserts the retry behaviour (tests/test_bulk_writer.py covers the same cases).
+Usage: python bench/bench_bulk_writer.py [--rows 10000]
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+os.environ.setdefault('CACHE_DIR', tempfile.mkdtemp())
+
+import pandas as pd
+
+from bench.fake_servers import FakePostgrestServer
+from logic.bulk_writer import BulkWriter, BulkWriteError
+
+
+def make_records(rows):
+    dates = pd.date_range('1900-01-01', periods=rows, freq='D').strftime('%Y-%m-%d')
+    return [{'Date': d, 'ZAR_USD': 15.0 + i % 100 / 10, 'VIX': 20.0, 'GOLD_PRICE': None}
+            for i, d in enumerate(dates)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--latency', type=float, default=0.02)
+    args = parser.parse_args()
+    logging.getLogger("BulkWriter").setLevel(logging.ERROR)
+    records = make_records(args.rows)
+
+    print("chunk_size in_flight   time  chunks  max_payload")
+    for chunk_size, in_flight in ((500, 1), (500, 4), (2000, 4)):
+        with FakePostgrestServer(latency=args.latency) as server:
+            writer = BulkWriter(server.client(), 'data', chunk_size=chunk_size, max_in_flight=in_flight)
+            start = time.perf_counter()
+            metrics = writer.upsert(records)
+            elapsed = time.perf_counter() - start
+            assert len(server.rows) == args.rows
+            print(f"{chunk_size:10d} {in_flight:9d} {elapsed:6.2f}s {len(metrics):7d} "
+                  f"{max(m['bytes'] for m in metrics) / 1e3:9.1f} kB")
+
+    with FakePostgrestServer(fail_every=3) as server:
+        writer = BulkWriter(server.client(), 'data', chunk_size=500, base_delay=0.01)
+        metrics = writer.upsert(records)
+        retries = sum(m['attempts'] - 1 for m in metrics)
+        assert retries > 0, "no request failed"
+        assert len(server.rows) == args.rows, f"{len(server.rows)}/{args.rows} rows stored"
+        print(f"transient failures (every 3rd request): {retries} retries, "
+              f"{len(server.rows)}/{args.rows} rows stored")
+
+    with FakePostgrestServer(fail_every=1) as server:
+        writer = BulkWriter(server.client(), 'data', chunk_size=500, max_retries=2, base_delay=0.01)
+        try:
+            writer.upsert(records)
+        except BulkWriteError as e:
+            failed = [m for m in e.metrics if not m['ok']]
+            assert len(failed) == len(e.metrics) and all(m['attempts'] == 3 for m in failed)
+            print(f"permanent failure: {e.__class__.__name__} on {len(failed)} chunks after "
+                  f"{failed[0]['attempts']} attempts each")
+        else:
+            raise AssertionError("permanent failures did not raise BulkWriteError")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Compare the pandas and streaming parsers of the CMO "Monthly Prices" sheet.
+
+Usage: python bench/bench_cmo_parse.py [--commodities 70] [--repeat 3]
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+os.environ.setdefault('CACHE_DIR', tempfile.mkdtemp())
+
+from bench.fake_servers import build_cmo_workbook
+from logic import data_fetcher
+
+
+def measure(parser, workbook, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = data_fetcher._parse_world_bank_gold_workbook(io.BytesIO(workbook), parser=parser)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    data_fetcher._parse_world_bank_gold_workbook(io.BytesIO(workbook), parser=parser)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--commodities', type=int, default=70)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    workbook = build_cmo_workbook(n_commodities=args.commodities).getvalue()
+    print(f"workbook: {args.commodities} commodities, {len(workbook) / 1e6:.2f} MB")
+
+    results = {}
+    for name in ('pandas', 'streaming'):
+        results[name], elapsed, peak = measure(name, workbook, args.repeat)
+        print(f"{name:10s}: {elapsed * 1000:8.1f} ms, peak {peak / 1e6:7.2f} MB, {len(results[name])} rows")
+
+    assert results['pandas'].equals(results['streaming']), "parsers disagree"
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Benchmark the correlation matrix + lead/lag (-12..+12) computation at 10 and 50+ series, cold and cached.
+
+Usage: python bench/bench_correlation.py [--rows 400]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+os.environ.setdefault('CACHE_DIR', tempfile.mkdtemp())
+
+from bench.bench_model import make_panel
+from logic import correlation
+
+
+def per_lag_loop(df):
+    # Reference: pandas corr() plus one shifted corrwith() per lag
+    target = df[correlation.TARGET]
+    predictors = df.drop(columns=correlation.TARGET)
+    matrix = df.corr()
+    lead_lag = {k: predictors.corrwith(target.shift(-k)) for k in range(-correlation.MAX_LAG, correlation.MAX_LAG + 1)}
+    return matrix, lead_lag
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=400)
+    args = parser.parse_args()
+
+    print(f"{'series':>6s} {'loop ms':>8s} {'batched ms':>11s} {'cached ms':>10s}")
+    for predictors in (9, 60):
+        df = make_panel(args.rows, predictors)
+        loop_ms = timed(lambda: per_lag_loop(df))
+        batched_ms = timed(lambda: correlation.get_correlation_analysis(df))
+        cached_ms = timed(lambda: correlation.get_correlation_analysis(df))
+        print(f"{predictors + 1:6d} {loop_ms:8.1f} {batched_ms:11.1f} {cached_ms:10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark the daily master panel: memory and build time at 20 years x 100 daily series, and view query times.
+
+Usage: python bench/bench_daily_panel.py [--years 20] [--series 100]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+os.environ.setdefault('CACHE_DIR', tempfile.mkdtemp())
+
+from logic.panel import VIEW_AGGREGATIONS, VIEW_FREQUENCIES, aggregate, build_panel, get_view, series_metadata
+
+TARGET = 'ZAR_USD'
+
+
+def make_raw(n_series, years, seed=0):
+    # Outer-joined fetch result of daily series: business days with ~3% missing (holidays, gaps)
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range('2005-01-03', periods=years * 261)
+    values = 100 + rng.standard_normal((len(days), n_series)).cumsum(axis=0)
+    values[rng.random(values.shape) < 0.03] = np.nan
+    columns = [f'S{i:03d}' for i in range(n_series - 1)] + [TARGET]
+    return pd.DataFrame(values, index=days, columns=columns)
+
+
+def make_config(columns):
+    sources = ('FRED', 'WORLD_BANK', 'HARDCODED')
+    return {c: {'source': sources[i % 3], 'label': f'Series {c}', 'frequency': 'daily'} for i, c in enumerate(columns)}
+
+
+def megabytes(df):
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+def timed(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--years', type=int, default=20)
+    parser.add_argument('--series', type=int, default=100)
+    args = parser.parse_args()
+
+    raw = make_raw(args.series, args.years)
+    columns = list(raw.columns)
+    daily, build_ms = timed(lambda: build_panel(raw, columns, required=[TARGET], freq='B', dtype='float32'))
+    daily64 = daily.astype('float64')
+    config = make_config(columns)
+    meta = series_metadata(config)
+    meta_objects = meta.astype({c: object for c in ('source', 'frequency', 'fill')})
+
+    print(f"{args.years} years x {args.series} series: {daily.shape[0]} business days, built in {build_ms:.1f} ms")
+    print(f"{'':22s} {'MB':>8s}")
+    print(f"{'panel float64':22s} {megabytes(daily64):8.2f}")
+    print(f"{'panel float32':22s} {megabytes(daily):8.2f}")
+    print(f"{'metadata object':22s} {megabytes(meta_objects):8.3f}")
+    print(f"{'metadata categorical':22s} {megabytes(meta):8.3f}")
+
+    print(f"\n{'view':10s} {'rows':>6s} {'aggregate ms':>13s} {'cached ms':>10s}")
+    version = 'bench'
+    for freq in VIEW_FREQUENCIES:
+        for how in (('last',) if freq == 'D' else VIEW_AGGREGATIONS):
+            view, cold_ms = timed(lambda: aggregate(daily, freq, how))
+            get_view(daily, freq, how, version=version)
+            cached, cached_ms = timed(lambda: get_view(daily, freq, how, version=version))
+            pd.testing.assert_frame_equal(cached, view)
+            print(f"{freq + ' ' + how:10s} {len(view):6d} {cold_ms:13.1f} {cached_ms:10.2f}")
+
+
+if __name__ == '__main__':
+    main()
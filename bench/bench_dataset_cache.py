@@ -0,0 +1,63 @@
+"""Simulate many analysts loading the dashboard at once against the shared dataset cache.
+
+Spawns N processes that all ask for the dataset at the same moment; the
+refresh sleeps to mimic the upstream pipeline. With single-flight only one
+refresh should run. Usage: python bench/bench_dataset_cache.py [--clients 20]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import pandas as pd
+
+
+def slow_refresh(progress_callback=None):
+    from logic import dataset_cache
+    dataset_cache.cache.incr('bench:refresh_calls')
+    time.sleep(1.0)
+    df = pd.DataFrame({'ZAR_USD': [18.1, 18.4]}, index=pd.date_range('2024-01-31', periods=2, freq='ME'))
+    return {'data': df}
+
+
+def client(_):
+    from logic import dataset_cache
+    start = time.perf_counter()
+    entry, refreshed = dataset_cache.get_or_refresh_dataset(slow_refresh)
+    return time.perf_counter() - start, refreshed, entry['version']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['CACHE_DIR'] = tmp
+        from logic import dataset_cache
+        dataset_cache.cache.set('bench:refresh_calls', 0)
+
+        with multiprocessing.Pool(args.clients) as pool:
+            results = pool.map(client, range(args.clients))
+        calls = dataset_cache.cache.get('bench:refresh_calls')
+
+        latencies = sorted(r[0] for r in results)
+        print(f"{args.clients} concurrent clients -> {calls} upstream refresh(es)")
+        print(f"latency: min {latencies[0]:.2f}s, max {latencies[-1]:.2f}s; "
+              f"versions served: {len({r[2] for r in results})}")
+
+        start = time.perf_counter()
+        client(None)
+        print(f"warm hit within TTL: {(time.perf_counter() - start) * 1000:.1f} ms, "
+              f"refresh calls still {dataset_cache.cache.get('bench:refresh_calls')}")
+        dataset_cache.cache.close()
+
+
+if __name__ == '__main__':
+    main()
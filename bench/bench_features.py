@@ -0,0 +1,44 @@
+"""Benchmark the feature stage: computing every derived feature at the real panel size and larger.
+
+Usage: python bench/bench_features.py [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+os.environ.setdefault('CACHE_DIR', tempfile.mkdtemp())
+
+from bench.bench_supabase_sync import make_panel
+from logic.features import FEATURE_CONFIG, compute_features
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'months':>7s} {'features':>8s} {'ms':>8s}")
+    # About 105 months is the real panel
+    for months in (105, 1000, 10000):
+        panel = make_panel(months)
+        full_ms, features = best_of(lambda: compute_features(panel), args.repeat)
+        assert len(features) == months and set(features.columns) <= set(FEATURE_CONFIG)
+        print(f"{months:7d} {features.shape[1]:8d} {full_ms:8.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Benchmark update_graph with a cold vs warm figure cache while switching predictors back and forth.
+
+Usage: python bench/bench_figure_cache.py [--rows 5000] [--columns 10] [--switches 50]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+os.environ.setdefault('CACHE_DIR', tempfile.mkdtemp())
+
+from plotly.io.json import to_json_plotly
+
+import app  # noqa: F401  (pages can only be imported once the Dash app exists)
+from bench.bench_store_payload import make_frame
+from logic import columnar
+from pages import dashboard
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--columns', type=int, default=10)
+    parser.add_argument('--switches', type=int, default=50)
+    args = parser.parse_args()
+
+    payload = columnar.encode_frame(make_frame(args.rows, args.columns))
+    predictors = [c for c in payload['columns'] if c != 'ZAR_USD'][:3]
+    selections = [(predictors[i % len(predictors)], ('dark', 'light')[(i // len(predictors)) % 2])
+                  for i in range(args.switches)]
+
+    for label in ('uncached', 'cached'):
+        dashboard._figure_cache.clear()
+        columnar.decode_frame(payload)
+        if label == 'uncached':
+            dashboard.FIGURE_CACHE_SIZE, saved = 0, dashboard.FIGURE_CACHE_SIZE
+        start = time.perf_counter()
+        for predictor, theme in selections:
+            # Dash serializes the returned figure into the callback response
+            to_json_plotly(dashboard.update_graph(predictor, payload, None, theme))
+        elapsed = (time.perf_counter() - start) / len(selections) * 1000
+        if label == 'uncached':
+            dashboard.FIGURE_CACHE_SIZE = saved
+        print(f"{label:8s}: {elapsed:7.2f} ms per switch over {len(selections)} switches "
+              f"({len(set(selections))} distinct figures)")
+
+
+if __name__ == '__main__':
+    main()
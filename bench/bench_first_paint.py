@@ -0,0 +1,47 @@
+"""Time the dashboard's page-load path: stored data -> rendered table and dropdown.
+
+Measures a cold cache (read the 'data' table from a local PostgREST stand-in)
+and a warm cache (local diskcache snapshot). Usage: python bench/bench_first_paint.py
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from bench.bench_supabase_sync import make_panel
+from bench.fake_servers import FakePostgrestServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--months', type=int, default=240)
+    parser.add_argument('--latency', type=float, default=0.05, help="Per-request latency of the fake server (s).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, FakePostgrestServer(latency=args.latency) as server:
+        os.environ['CACHE_DIR'] = tmp
+        import app  # noqa: F401  (pages can only be imported once the Dash app exists)
+        from logic import data_fetcher, dataset_cache
+        from pages.dashboard import render_dataset
+
+        client = server.client()
+        data_fetcher.save_to_supabase(make_panel(args.months), client=client)
+
+        def loader():
+            return data_fetcher.load_from_supabase(client=client)
+
+        for label in ('cold (Supabase)', 'warm (snapshot)'):
+            start = time.perf_counter()
+            entry = dataset_cache.load_latest_dataset(loader)
+            render_dataset(entry, '')
+            print(f"{label:16s}: {(time.perf_counter() - start) * 1000:7.1f} ms ({len(entry['data'])} rows)")
+        dataset_cache.cache.close()
+
+
+if __name__ == '__main__':
+    main()
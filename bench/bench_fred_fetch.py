@@ -0,0 +1,51 @@
+"""Compare serial vs concurrent FRED fetching against a local fake FRED server.
+
+Usage: python bench/bench_fred_fetch.py [--latency 0.3]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+os.environ.setdefault('CACHE_DIR', tempfile.mkdtemp())
+
+from bench.fake_servers import FakeFredServer
+from logic import data_fetcher
+from logic.rate_limiter import TokenBucket
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.3, help="Per-request latency of the fake server (s).")
+    args = parser.parse_args()
+
+    fred_series = {name: cfg['id'] for name, cfg in data_fetcher.SERIES_CONFIG.items() if cfg['source'] == 'FRED'}
+    n = len(fred_series)
+
+    with FakeFredServer(latency=args.latency) as server:
+        data_fetcher.FRED_API_URL = server.url
+
+        # Legacy behaviour: one request at a time with a 0.5s gap between them.
+        start = time.perf_counter()
+        serial = data_fetcher.fetch_fred_data(fred_series, api_key='bench', max_workers=1,
+                                              rate_limiter=TokenBucket(rate=2.0, capacity=1), incremental=False)
+        serial_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        concurrent = data_fetcher.fetch_fred_data(fred_series, api_key='bench', incremental=False)
+        concurrent_time = time.perf_counter() - start
+
+    assert serial.equals(concurrent), "serial and concurrent results differ"
+    print(f"series={n} latency={args.latency:.2f}s")
+    print(f"serial      : {serial_time:6.2f}s (1 worker, 0.5s spacing; old loop ~{n * (args.latency + 0.5):.2f}s)")
+    print(f"concurrent  : {concurrent_time:6.2f}s (workers={data_fetcher.FRED_MAX_WORKERS}, "
+          f"rate={data_fetcher.FRED_RATE_LIMIT}/s burst={data_fetcher.FRED_RATE_BURST})")
+
+
+if __name__ == '__main__':
+    main()
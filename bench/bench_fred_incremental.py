@@ -0,0 +1,51 @@
+"""Benchmark cold-start vs warm incremental FRED refresh against a local fake FRED server.
+
+Usage: python bench/bench_fred_incremental.py [--latency 0.1] [--lookback-days 90]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+os.environ.setdefault('CACHE_DIR', tempfile.mkdtemp())
+
+from bench.fake_servers import FakeFredServer
+from logic import data_fetcher
+from logic.observation_store import ObservationStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.1, help="Per-request latency of the fake server (s).")
+    parser.add_argument('--lookback-days', type=int, default=data_fetcher.FRED_REVISION_LOOKBACK_DAYS)
+    args = parser.parse_args()
+
+    fred_series = {name: cfg['id'] for name, cfg in data_fetcher.SERIES_CONFIG.items() if cfg['source'] == 'FRED'}
+
+    with tempfile.TemporaryDirectory() as tmp, FakeFredServer(latency=args.latency) as server:
+        data_fetcher.FRED_API_URL = server.url
+        store = ObservationStore(os.path.join(tmp, 'observations.sqlite'))
+
+        results = {}
+        for label in ('cold', 'warm'):
+            served_before = server.rows_served
+            start = time.perf_counter()
+            df = data_fetcher.fetch_fred_data(fred_series, api_key='bench', incremental=True, store=store,
+                                              lookback_days=args.lookback_days)
+            results[label] = df
+            elapsed = time.perf_counter() - start
+            rows = df.attrs['fetched_rows']
+            print(f"{label:5s}: {elapsed:6.3f}s, {server.rows_served - served_before:6d} rows transferred")
+            for name in fred_series:
+                print(f"    {name:28s} {rows.get(name, 0):6d}")
+
+    assert results['cold'].equals(results['warm']), "warm refresh returned different data"
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Report the import-time cost of the web app and the refresh worker, per module (-X importtime).
+
+Each target is imported in a fresh interpreter, as a gunicorn worker or a
+spawned background-callback process would, and the slowest modules by
+cumulative import time are listed.
+
+Usage: python bench/bench_import_time.py [--runs 5] [--top 15] [--target app]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def import_times(target):
+    """{module: (self us, cumulative us, depth)} for one fresh `import target`."""
+    env = dict(os.environ, CACHE_DIR=tempfile.mkdtemp(), PYTHONPATH=PROJECT_ROOT)
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {target}'],
+                          cwd=PROJECT_ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode:
+        raise RuntimeError(f"import {target} failed:\n{proc.stderr[-2000:]}")
+    times = {}
+    for line in proc.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            times[match.group(4)] = (int(match.group(1)), int(match.group(2)), len(match.group(3)) // 2)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--target', action='append', help="Module to import (default: app and logic.refresh_worker).")
+    args = parser.parse_args()
+
+    for target in args.target or ['app', 'logic.refresh_worker']:
+        runs = [import_times(target) for _ in range(args.runs)]
+        total = statistics.median(run[target][1] for run in runs) / 1000
+        print(f"import {target}: median {total:.0f} ms over {args.runs} runs")
+
+        modules = {name for run in runs for name in run}
+        cumulative = {name: statistics.median(run[name][1] for run in runs if name in run) / 1000 for name in modules}
+        top_level = [name for name in modules if runs[0].get(name, (0, 0, 1))[2] == 1]
+        for name in sorted(top_level, key=cumulative.get, reverse=True)[:args.top]:
+            print(f"  {cumulative[name]:8.1f} ms  {name}")
+        print()
+
+
+if __name__ == '__main__':
+    main()
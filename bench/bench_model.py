@@ -0,0 +1,77 @@
+"""Benchmark the batched rolling regression engine against a per-window refit loop.
+
+Usage: python bench/bench_model.py [--window 60] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+os.environ.setdefault('CACHE_DIR', tempfile.mkdtemp())
+
+import numpy as np
+import pandas as pd
+
+from logic import model
+
+
+def make_panel(rows, predictors):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(rows, predictors)).cumsum(axis=0)
+    y = X @ rng.normal(scale=0.1, size=predictors) + rng.normal(size=rows) + 15
+    df = pd.DataFrame(X, columns=[f'SERIES_{i}' for i in range(predictors)],
+                      index=pd.date_range('1990-01-31', periods=rows, freq='ME', name='Date'))
+    df[model.TARGET] = y
+    return df
+
+
+def loop_regression(df, window, expanding, method, alpha):
+    # Reference: standardize and refit every window separately
+    data = df.dropna()
+    X, y = data.drop(columns=model.TARGET).to_numpy(), data[model.TARGET].to_numpy()
+    k = X.shape[1] + 1
+    penalty = np.diag(np.r_[0.0, np.full(k - 1, alpha)]) if method == 'ridge' else 0
+    betas = []
+    for end in range(window, len(y) + 1):
+        start = 0 if expanding else end - window
+        Xw, yw = X[start:end], y[start:end]
+        Zw = np.column_stack([np.ones(len(Xw)), (Xw - Xw.mean(axis=0)) / Xw.std(axis=0)])
+        betas.append(np.linalg.solve(Zw.T @ Zw + penalty, Zw.T @ yw))
+    return np.array(betas)
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--window', type=int, default=60)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'rows':>5s} {'preds':>5s} {'windows':>7s} {'mode':>16s} {'batched ms':>11s} {'loop ms':>8s} {'max |diff|':>11s}")
+    for rows, predictors in ((120, 9), (400, 30), (1000, 50)):
+        df = make_panel(rows, predictors)
+        for expanding, method in ((False, 'ols'), (False, 'ridge'), (True, 'ols')):
+            fast_ms, result = best_of(lambda: model.rolling_regression(
+                df, window=args.window, expanding=expanding, method=method, alpha=1.0), args.repeat)
+            loop_ms, betas = best_of(lambda: loop_regression(df, args.window, expanding, method, 1.0), args.repeat)
+            diff = np.abs(result['coefficients'].to_numpy() - betas).max()
+            mode = f"{'expanding' if expanding else 'rolling'} {method}"
+            print(f"{rows:5d} {predictors:5d} {result['summary']['windows']:7d} {mode:>16s} "
+                  f"{fast_ms:11.2f} {loop_ms:8.2f} {diff:11.2e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark building the monthly panel from raw daily + monthly series at 10 and 500 series.
+
+Usage: python bench/bench_panel.py [--years 8]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+os.environ.setdefault('CACHE_DIR', tempfile.mkdtemp())
+
+from logic.panel import build_panel
+
+TARGET = 'ZAR_USD'
+
+
+def make_raw(n_series, years, seed=0):
+    # Outer-joined fetch result: a third of the series daily on business days, the rest monthly,
+    # with missing observations sprinkled through both
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range('2018-01-01', periods=years * 261)
+    month_starts = pd.date_range('2018-01-01', days[-1], freq='MS')
+    columns = {}
+    for i in range(n_series):
+        dates = days if i % 3 == 0 else month_starts
+        values = 100 + rng.standard_normal(len(dates)).cumsum()
+        values[rng.random(len(dates)) < 0.05] = np.nan
+        columns[TARGET if i == n_series - 1 else f'S{i:03d}'] = pd.Series(values, index=dates)
+    return pd.concat(columns, axis=1, sort=False)
+
+
+def resample_ffill(raw, columns, start_date, end_date):
+    # Reference: the previous process_data (resample, ffill, slice, then keep and drop)
+    df = raw.sort_index().resample('ME').last().ffill().loc[start_date:end_date]
+    df = df[[c for c in columns if c in df.columns]].dropna(subset=[TARGET])
+    df.index.name = 'Date'
+    return df
+
+
+def timed(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--years', type=int, default=8)
+    args = parser.parse_args()
+
+    start_date, end_date = '2018-01-31', '2025-06-30'
+    print(f"{'series':>6s} {'resample ms':>12s} {'one-pass ms':>12s}")
+    for n_series in (10, 500):
+        raw = make_raw(n_series, args.years)
+        columns = list(raw.columns)
+        expected, before_ms = timed(lambda: resample_ffill(raw, columns, start_date, end_date))
+        result, after_ms = timed(lambda: build_panel(raw, columns, start_date=start_date, end_date=end_date,
+                                                     required=[TARGET]))
+        pd.testing.assert_frame_equal(result, expected, check_freq=False)
+        print(f"{n_series:6d} {before_ms:12.1f} {after_ms:12.1f}")
+
+
+if __name__ == '__main__':
+    main()
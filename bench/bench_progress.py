@@ -0,0 +1,60 @@
+"""Compare raw vs throttled progress reporting: diskcache writes and time spent reporting.
+
+Simulates a refresh that reports progress `--updates` times over `--seconds`
+(per-series and per-stage messages), writing each delivered value to the
+shared diskcache as the background callback manager does.
+
+Usage: python bench/bench_progress.py [--updates 400] [--seconds 2]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+os.environ.setdefault('CACHE_DIR', tempfile.mkdtemp())
+
+from logic.dataset_cache import cache
+from logic.progress import ThrottledProgress
+
+
+def simulate(report, updates, seconds):
+    spent = 0.0
+    for i in range(updates):
+        percent = int((i + 1) / updates * 100)
+        start = time.perf_counter()
+        report((percent, f'{percent}%', f'Processing: {percent}% - step {i + 1}'))
+        spent += time.perf_counter() - start
+        time.sleep(seconds / updates)
+    return spent
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--updates', type=int, default=400)
+    parser.add_argument('--seconds', type=float, default=2.0)
+    args = parser.parse_args()
+
+    writes = {'raw': 0}
+
+    def write(value):
+        writes['raw'] += 1
+        cache.set('bench-progress', list(value))
+
+    spent = simulate(write, args.updates, args.seconds)
+    print(f"raw      : {writes['raw']:5d} writes, {spent * 1000:7.1f} ms spent reporting")
+
+    throttled = ThrottledProgress(lambda value: cache.set('bench-progress', list(value)))
+    spent = simulate(throttled, args.updates, args.seconds)
+    throttled((100, '100%', 'Complete!'), final=True)
+    print(f"throttled: {throttled.writes:5d} writes, {spent * 1000:7.1f} ms spent reporting "
+          f"(interval {throttled.interval}s)")
+    assert cache.get('bench-progress')[0] == 100, "final progress value was not delivered last"
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Micro-benchmark Supabase payload serialization: per-record loops vs column-wise encoding.
+
+Usage: python bench/bench_serialization.py [--rows 10000 100000]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+os.environ.setdefault('CACHE_DIR', tempfile.mkdtemp())
+
+from logic import data_fetcher
+from logic.serialization import json_array, to_json_rows
+
+
+def make_frame(rows):
+    columns = [c for c in data_fetcher.SUPABASE_DATA_COLUMNS if c != 'Date']
+    rng = np.random.default_rng(0)
+    values = rng.random((rows, len(columns))) * 100
+    values[rng.random(values.shape) < 0.05] = np.nan
+    df = pd.DataFrame(values, columns=columns, index=pd.date_range('1900-01-01', periods=rows, freq='D'))
+    df.index.name = 'Date'
+    return df
+
+
+def legacy_payload(df):
+    """The serialization save_to_supabase used before the column-wise encoder."""
+    df_to_save = df.reset_index()
+    df_to_save['Date'] = df_to_save['Date'].dt.strftime('%Y-%m-%d')
+    df_to_save = df_to_save.where(pd.notnull(df_to_save), None)
+    records = df_to_save.to_dict('records')
+    for record in records:
+        for key, value in record.items():
+            if pd.isna(value):
+                record[key] = None
+    valid_columns = set(data_fetcher.SUPABASE_DATA_COLUMNS)
+    filtered = [{k: v for k, v in record.items() if k in valid_columns} for record in records]
+    return json.dumps(filtered).encode('utf-8')
+
+
+def columnar_payload(df):
+    return json_array(to_json_rows(data_fetcher._prepare_supabase_frame(df)))
+
+
+def best_of(fn, df, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn(df)
+        best = min(best, time.perf_counter() - start)
+    return out, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000])
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        df = make_frame(rows)
+        old, old_t = best_of(legacy_payload, df)
+        new, new_t = best_of(columnar_payload, df)
+        assert json.loads(old) == json.loads(new), "payloads differ"
+        print(f"{rows:7d} rows: legacy {old_t * 1000:8.1f} ms, column-wise {new_t * 1000:8.1f} ms "
+              f"({old_t / new_t:4.1f}x), {len(new) / 1e6:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Compare fetching each data source in turn vs all sources concurrently through the adapter registry.
+
+Uses the local fake FRED and World Bank servers; every run starts from an
+empty observation store so each source is downloaded in full.
+
+Usage: python bench/bench_sources.py [--fred-latency 0.3] [--world-bank-latency 0.5]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+os.environ.setdefault('CACHE_DIR', tempfile.mkdtemp())
+# The fake FRED server accepts any key; never send the real one to it
+os.environ['FRED_API_KEY'] = 'bench'
+
+from bench.fake_servers import FakeFredServer, FakeWorldBankServer, build_cmo_workbook
+from logic import data_fetcher, observation_store
+from logic.sources import SOURCE_ADAPTERS, fetch_all
+
+
+def fetch_in_turn(series_config):
+    # The pre-registry pipeline: one source after the other
+    timings, frames = {}, []
+    for source in dict.fromkeys(cfg['source'] for cfg in series_config.values()):
+        series = {name: cfg for name, cfg in series_config.items() if cfg['source'] == source}
+        start = time.perf_counter()
+        frames.append(SOURCE_ADAPTERS[source]().fetch_sync(series, '2018-01-31'))
+        timings[source] = time.perf_counter() - start
+    raw = data_fetcher.pd.concat(frames, axis=1, sort=True)
+    return raw[[name for name in series_config if name in raw.columns]], timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--fred-latency', type=float, default=0.3)
+    parser.add_argument('--world-bank-latency', type=float, default=0.5)
+    args = parser.parse_args()
+
+    workbook = build_cmo_workbook().getvalue()
+    with FakeFredServer(latency=args.fred_latency) as fred, \
+            FakeWorldBankServer(workbook, latency=args.world_bank_latency) as world_bank:
+        data_fetcher.FRED_API_URL = fred.url
+        data_fetcher.WORLD_BANK_COMMODITY_PAGE_URL = world_bank.page_url
+
+        results = {}
+        for label in ('in turn', 'concurrent'):
+            with tempfile.TemporaryDirectory() as tmp:
+                observation_store.OBSERVATION_STORE_PATH = os.path.join(tmp, 'observations.sqlite')
+                start = time.perf_counter()
+                if label == 'in turn':
+                    raw, timings = fetch_in_turn(data_fetcher.SERIES_CONFIG)
+                else:
+                    raw = fetch_all(data_fetcher.SERIES_CONFIG)
+                    timings = raw.attrs['source_timings']
+                elapsed = time.perf_counter() - start
+            results[label] = raw
+            per_source = ', '.join(f'{source} {t:.2f}s' for source, t in timings.items())
+            print(f"{label:10s}: {elapsed:6.2f}s total ({per_source})")
+
+    assert results['in turn'].equals(results['concurrent']), "in-turn and concurrent results differ"
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark dcc.Store payload size and update_graph latency: record dicts vs the columnar format.
+
+Usage: python bench/bench_store_payload.py [--rows 5000] [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+os.environ.setdefault('CACHE_DIR', tempfile.mkdtemp())
+
+import numpy as np
+import pandas as pd
+from plotly.io.json import to_json_plotly
+
+import app  # noqa: F401  (pages can only be imported once the Dash app exists)
+from logic import columnar
+from pages import dashboard
+
+
+def make_frame(rows, columns):
+    rng = np.random.default_rng(0)
+    index = pd.date_range('2000-01-01', periods=rows, freq='D', name='Date')
+    data = rng.normal(size=(rows, columns)).cumsum(axis=0)
+    data[rng.random(size=data.shape) < 0.05] = np.nan
+    names = ['ZAR_USD'] + [f'SERIES_{i}' for i in range(1, columns)]
+    return pd.DataFrame(data, index=index, columns=names)
+
+
+def records_payload(df):
+    df_all = df.reset_index()
+    df_all['Date'] = df_all['Date'].dt.strftime('%Y-%m-%d')
+    return df_all.sort_values('Date', ascending=False).to_dict('records')
+
+
+def legacy_decode(data):
+    # What update_graph did with a record payload on every predictor/theme change
+    df = pd.DataFrame(data)
+    df['Date'] = pd.to_datetime(df['Date'])
+    return df.sort_values('Date')
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'columns':>7s} {'format':>9s} {'store kB':>9s} {'encode ms':>10s} "
+          f"{'decode ms (1st)':>16s} {'decode ms (next)':>17s}")
+    for columns in (10, 100):
+        df = make_frame(args.rows, columns)
+        cases = [('records', records_payload, legacy_decode),
+                 ('columnar', columnar.encode_frame, columnar.decode_frame)]
+        for label, encode, decode in cases:
+            payload = encode(df)
+            size = len(to_json_plotly(payload)) / 1e3
+            encode_ms = timed(lambda: to_json_plotly(encode(df)), max(1, args.repeat // 4))
+            columnar._decoded.clear()
+            first_ms = timed(lambda: decode(payload), 1)
+            next_ms = timed(lambda: decode(payload), args.repeat)
+            print(f"{columns:7d} {label:>9s} {size:9.1f} {encode_ms:10.2f} {first_ms:16.2f} {next_ms:17.3f}")
+
+        # End-to-end callback on the columnar payload (figure build included)
+        payload = columnar.encode_frame(df)
+        graph_ms = timed(lambda: dashboard.update_graph(df.columns[-1], payload, None, 'dark'), args.repeat)
+        print(f"{columns:7d} update_graph (columnar, warm decode): {graph_ms:.2f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Compare 'replace' and 'diff' Supabase sync against a local PostgREST stand-in.
+
+Simulates a routine refresh: the last two months are revised and one new
+month is appended. Usage: python bench/bench_supabase_sync.py [--months 240]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+os.environ.setdefault('CACHE_DIR', tempfile.mkdtemp())
+
+from bench.fake_servers import FakePostgrestServer
+from logic import data_fetcher
+
+
+def make_panel(months):
+    dates = pd.date_range(end=pd.Timestamp.now().normalize(), periods=months, freq='ME')
+    columns = [c for c in data_fetcher.SUPABASE_DATA_COLUMNS if c != 'Date']
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(np.round(rng.random((months, len(columns))) * 100, 4), index=dates, columns=columns)
+    df.index.name = 'Date'
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--months', type=int, default=240)
+    args = parser.parse_args()
+
+    previous = make_panel(args.months + 1).iloc[:-1]
+    refreshed = make_panel(args.months + 1)
+    refreshed.iloc[-3:-1] += 0.5
+
+    for mode in ('replace', 'diff'):
+        with FakePostgrestServer() as server:
+            client = server.client()
+            data_fetcher.save_to_supabase(previous, mode='replace', client=client)
+            server.reset_counters()
+
+            start = time.perf_counter()
+            result = data_fetcher.save_to_supabase(refreshed, mode=mode, client=client)
+            elapsed = time.perf_counter() - start
+
+            stored = len(server.rows)
+            print(f"{mode:8s}: {elapsed * 1000:7.1f} ms, {server.requests} requests, "
+                  f"{server.rows_written} rows upserted, {server.rows_deleted} deleted, "
+                  f"{server.bytes_received / 1e3:.1f} kB sent, {stored} rows stored")
+            if mode == 'diff':
+                print(f"          reported: {result}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark the observations table: legacy iterrows rendering vs column-wise formatting with paging.
+
+Usage: python bench/bench_table_render.py [--columns 11]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+os.environ.setdefault('CACHE_DIR', tempfile.mkdtemp())
+
+import pandas as pd
+from dash import html
+from plotly.io.json import to_json_plotly
+
+import app  # noqa: F401  (pages can only be imported once the Dash app exists)
+from bench.bench_store_payload import make_frame
+from pages import dashboard
+
+
+def legacy_table(processed):
+    # The pre-paging renderer, applied to every row
+    df_all = processed.reset_index()
+    df_all['Date'] = pd.to_datetime(df_all['Date']).dt.strftime('%Y-%m-%d')
+    df_table = df_all.sort_values('Date', ascending=False)
+    columns = ['Date'] + [c for c in df_table.columns if c != 'Date']
+    header = html.Thead(html.Tr([html.Th(col) for col in columns]))
+    body_rows = []
+    for _, row in df_table.iterrows():
+        tds = []
+        for col in columns:
+            val = row[col]
+            if col == 'Date':
+                tds.append(html.Td(val))
+            elif pd.isna(val):
+                tds.append(html.Td('-'))
+            else:
+                tds.append(html.Td(f"{float(val):.4f}"))
+        body_rows.append(html.Tr(tds))
+    return html.Table(className='custom-table', children=[header, html.Tbody(body_rows)])
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--columns', type=int, default=11)
+    args = parser.parse_args()
+
+    print(f"page size {dashboard.TABLE_PAGE_SIZE}")
+    print(f"{'rows':>6s} {'legacy ms':>10s} {'legacy kB':>10s} {'format ms':>10s} {'page ms':>8s} "
+          f"{'page kB':>8s} {'cached page ms':>15s}")
+    for rows in (10, 1000, 10000):
+        df = make_frame(rows, args.columns)
+        legacy_ms, legacy = timed(lambda: to_json_plotly(legacy_table(df)))
+        format_ms, table = timed(lambda: dashboard.format_table(df))
+        page_ms, page = timed(lambda: to_json_plotly(dashboard.render_table_page(table, 0)[0]))
+
+        dashboard._table_cache.clear()
+        payload = {'version': 'bench'}
+        dashboard._cached_table(payload, df)
+        cached_ms, _ = timed(lambda: to_json_plotly(
+            dashboard.render_table_page(dashboard._cached_table(payload), rows // dashboard.TABLE_PAGE_SIZE // 2)[0]))
+        print(f"{rows:6d} {legacy_ms:10.1f} {len(legacy) / 1e3:10.1f} {format_ms:10.1f} {page_ms:8.1f} "
+              f"{len(page) / 1e3:8.1f} {cached_ms:15.2f}")
+
+
+if __name__ == '__main__':
+    main()
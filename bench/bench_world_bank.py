@@ -0,0 +1,48 @@
+"""Benchmark World Bank gold retrieval: cold download vs conditional-GET revalidation.
+
+Usage: python bench/bench_world_bank.py [--latency 0.2]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+os.environ.setdefault('CACHE_DIR', tempfile.mkdtemp())
+
+from bench.fake_servers import FakeWorldBankServer, build_cmo_workbook
+from logic import data_fetcher
+from logic.observation_store import ObservationStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.2, help="Per-request latency of the fake server (s).")
+    args = parser.parse_args()
+
+    workbook = build_cmo_workbook().getvalue()
+    print(f"workbook size: {len(workbook) / 1e6:.2f} MB")
+
+    with tempfile.TemporaryDirectory() as tmp, FakeWorldBankServer(workbook, latency=args.latency) as server:
+        data_fetcher.WORLD_BANK_COMMODITY_PAGE_URL = server.page_url
+        store = ObservationStore(os.path.join(tmp, 'observations.sqlite'))
+
+        results = {}
+        for label in ('cold', 'revalidate'):
+            start = time.perf_counter()
+            results[label] = data_fetcher.fetch_world_bank_gold_data(store=store)
+            elapsed = time.perf_counter() - start
+            print(f"{label:10s}: {elapsed:6.3f}s ({len(results[label])} rows)")
+
+        print(f"page scrapes={server.page_hits} full downloads={server.full_downloads} "
+              f"304 responses={server.not_modified}")
+
+    assert results['cold'].equals(results['revalidate']), "cached series differs from parsed series"
+
+
+if __name__ == '__main__':
+    main()
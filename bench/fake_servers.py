@@ -0,0 +1,306 @@
+"""Local stand-ins for the upstream services, used by the benchmark scripts."""
+import hashlib
+import io
+import json
+import threading
+import time
+import urllib.parse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import numpy as np
+import pandas as pd
+
+
+def _observations_xml(series_id, start, end=None, freq='ME'):
+    """Render a deterministic FRED series/observations XML document."""
+    end = end or pd.Timestamp.now().strftime('%Y-%m-%d')
+    dates = pd.date_range(start=start, end=end, freq=freq)
+    # Values depend only on (series, date) so overlapping requests agree.
+    phase = sum(series_id.encode()) % 97
+    days = (dates - pd.Timestamp('2000-01-01')).days.to_numpy()
+    values = np.round(100 + 10 * np.sin(days / 45.0 + phase), 4)
+    rows = ''.join(
+        f'<observation realtime_start="{end}" realtime_end="{end}" date="{d:%Y-%m-%d}" value="{v}"/>'
+        for d, v in zip(dates, values)
+    )
+    return (
+        f'<?xml version="1.0" encoding="utf-8" ?><observations realtime_start="{end}" '
+        f'realtime_end="{end}" count="{len(dates)}">{rows}</observations>'
+    ).encode('utf-8')
+
+
+# Series that FRED publishes at business-day frequency
+DAILY_FRED_SERIES = {'VIXCLS', 'DEXSFUS'}
+
+
+class FakeFredServer:
+    """Serves /fred/series/observations with a fixed per-request latency."""
+
+    def __init__(self, latency=0.3, latencies=None):
+        self.latency = latency
+        self.latencies = latencies or {}
+        self.rows_served = 0
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                parsed = urllib.parse.urlparse(self.path)
+                query = dict(urllib.parse.parse_qsl(parsed.query))
+                series_id = query.get('series_id', 'UNKNOWN')
+                server.requests.append((series_id, query))
+                time.sleep(server.latencies.get(series_id, server.latency))
+                freq = 'B' if series_id in DAILY_FRED_SERIES else 'ME'
+                body = _observations_xml(series_id, query.get('observation_start', '2018-01-31'), freq=freq)
+                server.rows_served += body.count(b'<observation ')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/xml')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/fred"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def build_cmo_workbook(path_or_buffer=None, n_commodities=70, start='1960-01-01', end=None):
+    """Write a workbook shaped like the World Bank CMO-Historical-Data-Monthly.xlsx."""
+    from openpyxl import Workbook
+
+    end = end or pd.Timestamp.now().strftime('%Y-%m-%d')
+    months = pd.date_range(start=start, end=end, freq='MS')
+    names = [f"Commodity {i}" for i in range(n_commodities - 1)]
+    names.insert(n_commodities // 2, 'Gold')
+    rng = np.random.default_rng(0)
+    values = np.round(50 + rng.random((len(months), n_commodities)) * 1000, 2)
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Monthly Prices')
+    ws.append(['World Bank Commodity Price Data (The Pink Sheet)'])
+    ws.append(['Monthly prices in nominal US dollars'])
+    ws.append([])
+    ws.append([])
+    ws.append([None] + names)
+    ws.append([None] + ['($/unit)'] * n_commodities)
+    for month, row in zip(months, values):
+        ws.append([f"{month.year}M{month.month:02d}"] + row.tolist())
+    ws.append(['Note: generated benchmark workbook'])
+
+    target = path_or_buffer if path_or_buffer is not None else io.BytesIO()
+    wb.save(target)
+    return target
+
+
+class FakeWorldBankServer:
+    """Serves the commodity-markets page and the CMO workbook with ETag/304 support.
+
+    publish() puts a new workbook under a new path and links the page to it;
+    earlier paths keep serving the workbook they had.
+    """
+
+    WORKBOOK_NAME = 'CMO-Historical-Data-Monthly.xlsx'
+
+    def __init__(self, workbook_bytes, latency=0.0):
+        self.workbooks = {}
+        self.latency = latency
+        self.page_hits = 0
+        self.full_downloads = 0
+        self.not_modified = 0
+        self.publish(workbook_bytes, '/files')
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                time.sleep(server.latency)
+                if self.path.startswith('/en/research/commodity-markets'):
+                    server.page_hits += 1
+                    body = (
+                        f'<html><a href="{server.url}{server.workbook_path}">'
+                        'Monthly prices</a></html>'
+                    ).encode('utf-8')
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/html')
+                elif self.path in server.workbooks:
+                    workbook, etag = server.workbooks[self.path]
+                    if self.headers.get('If-None-Match') == etag:
+                        server.not_modified += 1
+                        self.send_response(304)
+                        self.send_header('ETag', etag)
+                        self.end_headers()
+                        return
+                    server.full_downloads += 1
+                    body = workbook
+                    self.send_response(200)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Type', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+                else:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}"
+        self.page_url = f"{self.url}/en/research/commodity-markets"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def publish(self, workbook_bytes, directory):
+        """Serve `workbook_bytes` at `directory`/WORKBOOK_NAME and link the page to it."""
+        self.workbook_path = f"{directory}/{self.WORKBOOK_NAME}"
+        etag = '"' + hashlib.md5(workbook_bytes).hexdigest() + '"'
+        self.workbooks[self.workbook_path] = (workbook_bytes, etag)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class FakePostgrestServer:
+    """In-memory stand-in for the Supabase REST endpoint of tables keyed by Date.
+
+    Supports the subset the app uses: select with offset/limit, upsert
+    (POST with merge-duplicates) and delete with gte/in filters on Date.
+    `rows` is the 'data' table; `tables` holds every table by name.
+    """
+
+    def __init__(self, latency=0.0, fail_every=0):
+        self.rows = {}
+        self.tables = {'data': self.rows}
+        self.latency = latency
+        self.fail_every = fail_every
+        self.requests = 0
+        self.rows_written = 0
+        self.rows_deleted = 0
+        self.bytes_received = 0
+        self.payload_sizes = []
+        self._lock = threading.Lock()
+        server = self
+
+        def matches(date_key, filters):
+            for column, expr in filters:
+                if column != 'Date':
+                    continue
+                op, _, arg = expr.partition('.')
+                if op == 'gte' and not date_key >= arg[:10]:
+                    return False
+                if op == 'lte' and not date_key <= arg[:10]:
+                    return False
+                if op == 'in':
+                    values = {v.strip('"')[:10] for v in arg.strip('()').split(',')}
+                    if date_key not in values:
+                        return False
+            return True
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, payload=None):
+                body = json.dumps(payload if payload is not None else []).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _begin(self):
+                time.sleep(server.latency)
+                with server._lock:
+                    server.requests += 1
+                    failing = server.fail_every and server.requests % server.fail_every == 0
+                if failing:
+                    self._reply(503, {'message': 'injected failure'})
+                    return None
+                parsed = urllib.parse.urlparse(self.path)
+                with server._lock:
+                    table = server.tables.setdefault(parsed.path.rstrip('/').rsplit('/', 1)[-1], {})
+                return table, urllib.parse.parse_qsl(parsed.query)
+
+            def do_GET(self):
+                request = self._begin()
+                if request is None:
+                    return
+                table, query = request
+                params = dict(query)
+                with server._lock:
+                    keys = sorted(k for k in table if matches(k, query))
+                    offset = int(params.get('offset', 0))
+                    limit = int(params.get('limit', len(keys)))
+                    rows = [table[k] for k in keys[offset:offset + limit]]
+                self._reply(200, rows)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = self.rfile.read(length)
+                request = self._begin()
+                if request is None:
+                    return
+                table = request[0]
+                records = json.loads(body)
+                if isinstance(records, dict):
+                    records = [records]
+                with server._lock:
+                    server.bytes_received += len(body)
+                    server.payload_sizes.append(len(body))
+                    for record in records:
+                        key = str(record['Date'])[:10]
+                        row = dict(table.get(key, {}))
+                        row.update(record)
+                        row['Date'] = f"{key}T00:00:00+00:00"
+                        table[key] = row
+                    server.rows_written += len(records)
+                self._reply(201, [])
+
+            def do_DELETE(self):
+                request = self._begin()
+                if request is None:
+                    return
+                table, query = request
+                with server._lock:
+                    keys = [k for k in table if matches(k, query)]
+                    for key in keys:
+                        del table[key]
+                    server.rows_deleted += len(keys)
+                self._reply(200, [])
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def client(self):
+        """Return a supabase client pointed at this server."""
+        from supabase import create_client
+        return create_client(self.url, 'fake-service-key')
+
+    def reset_counters(self):
+        self.requests = self.rows_written = self.rows_deleted = self.bytes_received = 0
+        self.payload_sizes = []
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,20 @@
+"""Gunicorn settings for the web process (see Procfile); GUNICORN_CMD_ARGS and WEB_CONCURRENCY still apply.
+
+Threaded workers keep slow requests from blocking a whole worker, and each
+open /progress/<channel> stream (PROGRESS_TRANSPORT=sse) holds one thread
+rather than one sync worker until its timeout kills it.
+"""
+import os
+
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+
+def on_starting(server):
+    # A sync worker serves one request at a time and is killed after `timeout`:
+    # every progress stream would block a worker and then be cut off
+    if (os.environ.get('PROGRESS_TRANSPORT') == 'sse'
+            and server.cfg.worker_class_str == 'sync' and server.cfg.threads <= 1):
+        raise RuntimeError("PROGRESS_TRANSPORT=sse needs threaded or async gunicorn workers "
+                           "(e.g. --worker-class gthread --threads 8), not sync workers.")
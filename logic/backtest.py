@@ -0,0 +1,136 @@
+"""Walk-forward backtests of the regression models in logic.model.
+
+Every configuration (method, window, lag, ...) is scored on one-step-ahead
+forecasts over the monthly panel from process_data. Small runs score in
+process; larger ones can fan out across a process pool (BACKTEST_MAX_WORKERS),
+where the panel is copied once into shared memory and each worker maps it
+read-only, so tasks only carry the small config dict. Results are cached in
+the shared diskcache by dataset hash.
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+from logic.dataset_cache import dataset_version, get_derived
+from logic.model import TARGET, rolling_regression
+
+logger = logging.getLogger("Backtest")
+
+# Worker processes for a backtest run (1 runs in-process)
+BACKTEST_MAX_WORKERS = int(os.environ.get('BACKTEST_MAX_WORKERS', 1))
+# Runs smaller than this many config x row cells score in-process whatever BACKTEST_MAX_WORKERS is:
+# spawning workers costs more than the work
+BACKTEST_PARALLEL_MIN_SIZE = int(os.environ.get('BACKTEST_PARALLEL_MIN_SIZE', 100_000))
+
+RESULT_COLUMNS = ['method', 'window', 'expanding', 'lag', 'alpha', 'forecasts', 'rmse', 'mae', 'directional_accuracy']
+
+# Per-worker view of the shared panel, set by _attach_panel
+_panel = None
+_panel_shm = None
+
+
+def default_configs():
+    """The default grid: OLS/ridge x rolling 24/36/60 and expanding windows x predictor lags 1/3/6.
+
+    Every lag is at least one month, so each forecast only uses predictor
+    values published before the month it forecasts.
+    """
+    configs = []
+    for method, (window, expanding), lag in product(('ols', 'ridge'),
+                                                    ((24, False), (36, False), (60, False), (36, True)),
+                                                    (1, 3, 6)):
+        configs.append({'method': method, 'window': window, 'expanding': expanding, 'lag': lag,
+                        'alpha': 1.0 if method == 'ridge' else 0.0})
+    return configs
+
+
+def score_config(df, config):
+    """Walk forward over `df` with one configuration and return its forecast error metrics.
+
+    Predictors are lagged by `lag` periods, so with lag >= 1 each forecast
+    only uses predictor values known before the forecast month.
+    """
+    result = rolling_regression(df, window=config['window'], expanding=config['expanding'],
+                                method=config['method'], alpha=config['alpha'], lag=config['lag'])
+    row = dict(config)
+    if result is None or result['forecasts'].empty:
+        return {**row, 'forecasts': 0, 'rmse': np.nan, 'mae': np.nan, 'directional_accuracy': np.nan}
+
+    forecasts = result['forecasts']
+    # Direction of the move from the previous month's actual value
+    previous = df[TARGET].shift(1).reindex(forecasts.index).to_numpy()
+    hit = np.sign(forecasts['forecast'].to_numpy() - previous) == np.sign(forecasts['actual'].to_numpy() - previous)
+    valid = ~np.isnan(previous)
+    return {
+        **row,
+        'forecasts': len(forecasts),
+        'rmse': result['summary']['rmse'],
+        'mae': result['summary']['mae'],
+        'directional_accuracy': float(hit[valid].mean()) if valid.any() else np.nan,
+    }
+
+
+def _attach_panel(name, shape, index, columns):
+    """Pool initializer: map the shared panel once per worker, without copying it."""
+    global _panel, _panel_shm
+    _panel_shm = SharedMemory(name=name)
+    values = np.ndarray(shape, dtype='float64', buffer=_panel_shm.buf)
+    values.flags.writeable = False
+    _panel = pd.DataFrame(values, index=pd.DatetimeIndex(index, name='Date'), columns=columns, copy=False)
+
+
+def _score_shared(config):
+    return score_config(_panel, config)
+
+
+def _configs_key(configs):
+    return hashlib.sha1(json.dumps(configs, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def run_backtest(df, configs=None, max_workers=None, use_cache=True):
+    """Score every configuration on the panel `df` and return a results table sorted by RMSE.
+
+    Results are cached by (dataset hash, configurations); pass use_cache=False
+    to force re-scoring.
+    """
+    configs = default_configs() if configs is None else list(configs)
+    max_workers = BACKTEST_MAX_WORKERS if max_workers is None else max_workers
+    df = df.astype('float64')
+    return get_derived('backtest', dataset_version(df), lambda: _score_all(df, configs, max_workers),
+                       _configs_key(configs), refresh=not use_cache)
+
+
+def _score_all(df, configs, max_workers):
+    start = time.perf_counter()
+    workers = min(max_workers, len(configs))
+    if len(configs) * len(df) < BACKTEST_PARALLEL_MIN_SIZE:
+        workers = 1
+    if workers <= 1:
+        rows = [score_config(df, config) for config in configs]
+    else:
+        values = np.ascontiguousarray(df.to_numpy())
+        shm = SharedMemory(create=True, size=max(values.nbytes, 1))
+        try:
+            np.ndarray(values.shape, dtype='float64', buffer=shm.buf)[:] = values
+            init_args = (shm.name, values.shape, df.index.to_numpy(), list(df.columns))
+            with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'),
+                                     initializer=_attach_panel, initargs=init_args) as executor:
+                rows = list(executor.map(_score_shared, configs, chunksize=max(1, len(configs) // (4 * workers))))
+        finally:
+            shm.close()
+            shm.unlink()
+
+    results = pd.DataFrame(rows, columns=RESULT_COLUMNS).sort_values('rmse', na_position='last')
+    results = results.reset_index(drop=True)
+    logger.info(f"Scored {len(configs)} configurations with {workers} worker(s) "
+                f"in {time.perf_counter() - start:.2f}s.")
+    return results
@@ -0,0 +1,130 @@
+import random
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from logic.serialization import dumps, json_array
+
+logger = logging.getLogger("BulkWriter")
+
+
+def _size(payload):
+    """Bytes a payload takes on the wire."""
+    return len(payload) if isinstance(payload, bytes) else len(dumps(payload))
+
+
+class BulkWriteError(Exception):
+    """Raised when one or more chunks still fail after all retries."""
+
+    def __init__(self, message, metrics):
+        super().__init__(message)
+        self.metrics = metrics
+
+
+class BulkWriter:
+    """Chunked, parallel writer for Supabase tables with retry and backoff.
+
+    Records are split into chunks of `chunk_size`, and chunks whose encoded
+    payload exceeds `max_bytes` (if set) are halved until they fit or hold
+    one row. At most `max_in_flight` chunks are sent at once, and each
+    failing chunk is retried up to `max_retries` times with exponential
+    backoff and full jitter. Every call returns per-chunk metrics (rows,
+    payload bytes, attempts, seconds).
+    """
+
+    def __init__(self, client, table, chunk_size=500, max_in_flight=4, max_retries=4,
+                 base_delay=0.5, max_delay=8.0, max_bytes=None):
+        self.client = client
+        self.table = table
+        self.chunk_size = max(1, int(chunk_size))
+        self.max_bytes = int(max_bytes) if max_bytes else None
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.max_retries = max(0, int(max_retries))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def _backoff(self, attempt):
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _post_json(self, payload, on_conflict=''):
+        """POST an already-encoded JSON array as an upsert, bypassing per-record serialization."""
+        builder = self.client.table(self.table)
+        headers = dict(builder.headers)
+        headers['Prefer'] = 'return=minimal,resolution=merge-duplicates'
+        headers['Content-Type'] = 'application/json'
+        params = {'on_conflict': on_conflict} if on_conflict else {}
+        response = builder.session.request(
+            'POST', str(builder.path), content=payload, params=params, headers=headers, auth=builder.auth
+        )
+        if response.status_code >= 400:
+            raise RuntimeError(f"HTTP {response.status_code}: {response.text[:200]}")
+
+    def _batches(self, items, encode):
+        """(rows, encoded payload) pairs of at most chunk_size rows and, above one row, max_bytes bytes."""
+        pending = [items[i:i + self.chunk_size] for i in range(0, len(items), self.chunk_size)]
+        batches = []
+        while pending:
+            chunk = pending.pop(0)
+            payload = encode(chunk)
+            if self.max_bytes and len(chunk) > 1 and _size(payload) > self.max_bytes:
+                half = len(chunk) // 2
+                pending[:0] = [chunk[:half], chunk[half:]]
+                continue
+            batches.append((chunk, payload))
+        return batches
+
+    def _send(self, index, chunk, payload, request):
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                request(payload)
+                ok, error = True, None
+                break
+            except Exception as e:
+                if attempt > self.max_retries:
+                    ok, error = False, str(e)
+                    break
+                delay = self._backoff(attempt - 1)
+                logger.warning(f"Chunk {index} on '{self.table}' failed (attempt {attempt}): {e}; "
+                               f"retrying in {delay:.2f}s")
+                time.sleep(delay)
+        return {
+            'chunk': index,
+            'rows': len(chunk),
+            'bytes': _size(payload),
+            'attempts': attempt,
+            'seconds': round(time.perf_counter() - start, 4),
+            'ok': ok,
+            'error': error,
+        }
+
+    def _run(self, items, encode, request, action):
+        chunks = self._batches(items, encode)
+        if not chunks:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_in_flight, len(chunks))) as executor:
+            metrics = list(executor.map(lambda args: self._send(args[0], *args[1], request), enumerate(chunks)))
+
+        failed = [m for m in metrics if not m['ok']]
+        logger.info(f"{action} on '{self.table}': {len(items)} rows in {len(chunks)} chunks, "
+                    f"{sum(m['attempts'] for m in metrics) - len(chunks)} retries, {len(failed)} failed")
+        if failed:
+            raise BulkWriteError(f"{len(failed)} of {len(chunks)} chunks failed on '{self.table}': "
+                                 f"{failed[0]['error']}", metrics)
+        return metrics
+
+    def upsert(self, records, on_conflict=''):
+        """Upsert a list of record dicts and return the per-chunk metrics."""
+        return self._run(records, dumps, lambda payload: self._post_json(payload, on_conflict), 'Upsert')
+
+    def upsert_json(self, rows, on_conflict=''):
+        """Upsert rows pre-encoded by logic.serialization.to_json_rows and return the per-chunk metrics."""
+        return self._run(rows, json_array, lambda payload: self._post_json(payload, on_conflict), 'Upsert')
+
+    def delete_in(self, column, values):
+        """Delete the rows whose `column` is in `values` and return the per-chunk metrics."""
+        def request(chunk):
+            self.client.table(self.table).delete(returning='minimal').in_(column, chunk).execute()
+        return self._run(list(values), lambda chunk: chunk, request, 'Delete')
@@ -0,0 +1,69 @@
+import base64
+import logging
+
+import numpy as np
+import pandas as pd
+
+from logic.dataset_cache import LRUCache, dataset_version
+
+logger = logging.getLogger("Columnar")
+
+COLUMNAR_FORMAT = 'columnar-v1'
+# Decoded frames kept per process, keyed by dataset version
+DECODE_CACHE_SIZE = 8
+
+_decoded = LRUCache(DECODE_CACHE_SIZE)
+
+
+def encode_frame(df, dtype='float32', binary=True, version=None):
+    """Encode a date-indexed numeric frame as a compact columnar payload for dcc.Store.
+
+    The payload holds the date axis once ('index', ISO strings, ascending) and
+    one value array per column. With `binary` the values are base64-encoded
+    little-endian `dtype` arrays (NaN marks a missing value), otherwise plain
+    lists with None. 'version' is the dataset content hash (default: the hash
+    of `df`), which the decoder uses to reuse an already decoded frame.
+    """
+    df = df.sort_index()
+    version = dataset_version(df) if version is None else version
+    columns = {}
+    for col in df.columns:
+        values = df[col].to_numpy(dtype='float64', na_value=np.nan)
+        if binary:
+            data = base64.b64encode(values.astype(f'<{np.dtype(dtype).str[1:]}').tobytes()).decode('ascii')
+            columns[col] = {'dtype': np.dtype(dtype).name, 'data': data}
+        else:
+            columns[col] = {'dtype': 'float64', 'data': np.where(np.isnan(values), None, values).tolist()}
+    return {
+        'format': COLUMNAR_FORMAT,
+        'version': version,
+        'index': pd.DatetimeIndex(df.index).strftime('%Y-%m-%d').tolist(),
+        'columns': columns,
+    }
+
+
+def _decode_column(spec):
+    data = spec['data']
+    if isinstance(data, str):
+        return np.frombuffer(base64.b64decode(data), dtype=f"<{np.dtype(spec['dtype']).str[1:]}")
+    return np.array(data, dtype='float64')
+
+
+def decode_frame(payload):
+    """Rebuild the date-indexed frame from encode_frame() output, reusing a cached decode per version.
+
+    The returned frame is shared between callers and must not be modified.
+    """
+    if not payload:
+        return pd.DataFrame()
+    version = payload.get('version')
+    df = _decoded.get(version) if version is not None else None
+    if df is not None:
+        return df
+
+    index = pd.DatetimeIndex(pd.to_datetime(payload['index'], format='%Y-%m-%d'), name='Date')
+    df = pd.DataFrame({col: _decode_column(spec) for col, spec in payload['columns'].items()}, index=index)
+
+    if version is not None:
+        _decoded.put(version, df)
+    return df
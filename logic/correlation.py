@@ -0,0 +1,81 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from logic.dataset_cache import dataset_version, get_derived
+
+logger = logging.getLogger("Correlation")
+
+TARGET = 'ZAR_USD'
+MAX_LAG = 12
+
+
+def _pairwise_corr(A, B):
+    """Pearson correlation of every column of A with every column of B over their common non-missing rows.
+
+    Uses only matrix products of the zero-filled values and presence masks,
+    so all pairs come out of a handful of BLAS calls. Pairs with fewer than
+    three common rows or zero variance are NaN.
+    """
+    ma, mb = ~np.isnan(A), ~np.isnan(B)
+    a, b = np.where(ma, A, 0.0), np.where(mb, B, 0.0)
+    ma, mb = ma.astype('float64'), mb.astype('float64')
+
+    n = ma.T @ mb
+    sa, sb = a.T @ mb, ma.T @ b
+    saa, sbb = (a * a).T @ mb, ma.T @ (b * b)
+    sab = a.T @ b
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = n * sab - sa * sb
+        var = (n * saa - sa ** 2) * (n * sbb - sb ** 2)
+        corr = cov / np.sqrt(var)
+    corr[(n < 3) | ~(var > 0)] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+def _lag_stack(y, max_lag):
+    """Rows are y shifted by -max_lag..+max_lag; row for lag k holds y_{t+k} at position t."""
+    n = len(y)
+    lags = np.arange(-max_lag, max_lag + 1)
+    stacked = np.full((len(lags), n), np.nan)
+    for i, k in enumerate(lags):
+        if k >= 0:
+            stacked[i, :n - k] = y[k:]
+        else:
+            stacked[i, -k:] = y[:n + k]
+    return lags, stacked
+
+
+def correlation_analysis(df, target=TARGET, max_lag=MAX_LAG, changes=False):
+    """Correlation matrix of every column and cross-correlations of `target` with every other column.
+
+    With `changes` the month-on-month differences are correlated instead of
+    levels. In the lead/lag table, lag k is corr(x_t, target_{t+k}): positive
+    lags mean the predictor leads ZAR/USD by k months.
+
+    Returns {'matrix': DataFrame, 'lead_lag': DataFrame (lags x predictors)}.
+    """
+    data = df.astype('float64')
+    if changes:
+        data = data.diff()
+    X = data.to_numpy()
+    matrix = pd.DataFrame(_pairwise_corr(X, X), index=data.columns, columns=data.columns)
+
+    if target not in data.columns:
+        return {'matrix': matrix, 'lead_lag': pd.DataFrame()}
+    predictors = [c for c in data.columns if c != target]
+    lags, shifted = _lag_stack(data[target].to_numpy(), max_lag)
+    lead_lag = _pairwise_corr(shifted.T, data[predictors].to_numpy())
+    return {
+        'matrix': matrix,
+        'lead_lag': pd.DataFrame(lead_lag, index=pd.Index(lags, name='lag'), columns=predictors),
+    }
+
+
+def get_correlation_analysis(df, version=None, changes=False, max_lag=MAX_LAG):
+    """correlation_analysis() cached in the shared diskcache per dataset version."""
+    version = dataset_version(df) if version is None else version
+    return get_derived('correlation', version, lambda: correlation_analysis(df, max_lag=max_lag, changes=changes),
+                       'changes' if changes else 'levels', max_lag, '|'.join(map(str, df.columns)))
@@ -1,18 +1,30 @@
 import pandas as pd
 import numpy as np
-from fredapi import Fred
 import argparse
+import io
 import os
 import ssl
-import time
 import json
 import re
 import urllib.request
 import urllib.parse
 import logging
-import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from dotenv import load_dotenv
-from logic.supabase_client import supabase
+
+if __name__ == "__main__":
+    # Run as a script: read .env before the project modules below read their settings
+    load_dotenv()
+
+from logic.supabase_client import SupabaseNotConfigured, get_supabase
+from logic.rate_limiter import TokenBucket
+from logic.observation_store import ObservationStore
+from logic.bulk_writer import BulkWriter
+from logic.serialization import to_json_rows
+from logic.metrics import span
+from logic.panel import build_panel, series_metadata
+from logic.sources import SourceAdapter, STORE_SOURCE, fetch_all, register_source
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("DataFetcher")
@@ -23,22 +35,31 @@ ssl._create_default_https_context = ssl._create_unverified_context
 # Series Configuration
 # Unified names to be used throughout the app
 SERIES_CONFIG = {
-    'EPU(USA)': {'source': 'FRED', 'id': 'USEPUINDXM', 'label': 'Economic Policy Uncertainty Index for USA'},
-    'WUIZAF(SA)': {'source': 'FRED', 'id': 'WUIZAF', 'label': 'World Uncertainty Index for South Africa'},
-    '10_YEAR_BOND_RATES(USA)': {'source': 'FRED', 'id': 'GS10', 'label': '10-Year Treasury Constant Maturity Rate (USA)'},
-    '10_YEAR_BOND_RATES(SA)': {'source': 'FRED', 'id': 'IRLTLT01ZAM156N', 'label': '10-Year Bond Rate (South Africa)'},
-    'USA_CPI': {'source': 'FRED', 'id': 'CPALTT01USM659N', 'label': 'CPI for All Items for USA'},
-    'SA_CPI_FRED': {'source': 'FRED', 'id': 'CPALTT01ZAM659N', 'label': 'CPI for All Items for South Africa (FRED)'},
-    'VIX': {'source': 'FRED', 'id': 'VIXCLS', 'label': 'CBOE Volatility Index (VIX)'},
-    'GOLD_PRICE': {'source': 'WORLD_BANK', 'id': 'CMO-Historical-Data-Monthly.xlsx', 'label': 'World Bank Commodity Markets Monthly Gold Price'},
-    'BRENT_OIL_PRICE': {'source': 'FRED', 'id': 'POILBREUSDM', 'label': 'Global Price of Brent Crude'},
-    'US_CPI': {'source': 'FRED', 'id': 'CPIAUCSL', 'label': 'Consumer Price Index for All Urban Consumers (USA)'},
-    'SA_INFLATION': {'source': 'HARDCODED', 'id': 'SA_CPI_INDEX', 'label': 'South African Headline CPI Index'},
-    'ZAR_USD': {'source': 'FRED', 'id': 'DEXSFUS', 'label': 'South African Rand to U.S. Dollar Exchange Rate'}
+    'EPU(USA)': {'source': 'FRED', 'id': 'USEPUINDXM', 'label': 'Economic Policy Uncertainty Index for USA', 'frequency': 'monthly'},
+    'WUIZAF(SA)': {'source': 'FRED', 'id': 'WUIZAF', 'label': 'World Uncertainty Index for South Africa', 'frequency': 'quarterly'},
+    '10_YEAR_BOND_RATES(USA)': {'source': 'FRED', 'id': 'GS10', 'label': '10-Year Treasury Constant Maturity Rate (USA)', 'frequency': 'monthly'},
+    '10_YEAR_BOND_RATES(SA)': {'source': 'FRED', 'id': 'IRLTLT01ZAM156N', 'label': '10-Year Bond Rate (South Africa)', 'frequency': 'monthly'},
+    'USA_CPI': {'source': 'FRED', 'id': 'CPALTT01USM659N', 'label': 'CPI for All Items for USA', 'frequency': 'monthly', 'panel': False},
+    'SA_CPI_FRED': {'source': 'FRED', 'id': 'CPALTT01ZAM659N', 'label': 'CPI for All Items for South Africa (FRED)', 'frequency': 'monthly', 'panel': False},
+    'VIX': {'source': 'FRED', 'id': 'VIXCLS', 'label': 'CBOE Volatility Index (VIX)', 'frequency': 'daily'},
+    'GOLD_PRICE': {'source': 'WORLD_BANK', 'id': 'CMO-Historical-Data-Monthly.xlsx', 'label': 'World Bank Commodity Markets Monthly Gold Price', 'frequency': 'monthly'},
+    'BRENT_OIL_PRICE': {'source': 'FRED', 'id': 'POILBREUSDM', 'label': 'Global Price of Brent Crude', 'frequency': 'monthly'},
+    'US_CPI': {'source': 'FRED', 'id': 'CPIAUCSL', 'label': 'Consumer Price Index for All Urban Consumers (USA)', 'frequency': 'monthly'},
+    'SA_INFLATION': {'source': 'HARDCODED', 'id': 'SA_CPI_INDEX', 'label': 'South African Headline CPI Index', 'frequency': 'monthly'},
+    'ZAR_USD': {'source': 'FRED', 'id': 'DEXSFUS', 'label': 'South African Rand to U.S. Dollar Exchange Rate', 'frequency': 'daily'}
 }
 
-# Load environment variables explicitly for Render
-load_dotenv()
+# Optional per-series keys:
+#   'fill':  how periods without an observation are filled in the panels ('ffill' default, 'none', 'interpolate')
+#   'panel': False to fetch a series without keeping it in the processed panels
+PANEL_COLUMNS = [name for name, cfg in SERIES_CONFIG.items() if cfg.get('panel', True)]
+PANEL_FILL = {name: cfg.get('fill', 'ffill') for name, cfg in SERIES_CONFIG.items()}
+SERIES_METADATA = series_metadata(SERIES_CONFIG, PANEL_COLUMNS)
+# Series released monthly or less often, aligned by month in the daily panel
+MONTH_DATED_COLUMNS = [name for name in PANEL_COLUMNS if SERIES_CONFIG[name].get('frequency') != 'daily']
+
+# Also keep a business-day (float32) master panel next to the monthly one, for daily/weekly/quarterly views
+DAILY_PANEL = os.environ.get('DAILY_PANEL', '1') == '1'
 
 def get_api_keys():
     """Reads API keys from api_keys.txt."""
@@ -63,76 +84,186 @@ def get_api_keys():
         logger.error(f"Error reading api_keys.txt: {e}")
     return keys
 
-API_KEYS = get_api_keys()
-# Prioritize environment variables, then fallback to api_keys.txt or hardcoded defaults
-FRED_API_KEY = os.environ.get('FRED_API_KEY', os.environ.get('FRED_API', API_KEYS.get('FRED') or 'e9e60c2ca97eac250d9bdb7d22511d58'))
+class FredNotConfigured(RuntimeError):
+    """No FRED API key in FRED_API_KEY / FRED_API or api_keys.txt."""
+
+
+@lru_cache(maxsize=None)
+def get_fred_api_key():
+    """FRED API key, resolved on first use.
+
+    Raises FredNotConfigured when neither the environment nor api_keys.txt provides one.
+    """
+    # Prioritize environment variables, then fallback to api_keys.txt
+    api_key = os.environ.get('FRED_API_KEY', os.environ.get('FRED_API')) or get_api_keys().get('FRED')
+    if not api_key:
+        raise FredNotConfigured("FRED_API_KEY (or FRED in api_keys.txt) must be set to fetch FRED data.")
+    return api_key
+
+# Optional override of the FRED API root (e.g. a local fake server for benchmarks)
+FRED_API_URL = os.environ.get('FRED_API_URL')
+
+# Concurrency settings for FRED downloads. FRED allows 120 requests/minute,
+# so the default bucket sustains 2 requests/second with a burst large enough
+# to cover every configured series in one go.
+FRED_MAX_WORKERS = int(os.environ.get('FRED_MAX_WORKERS', 12))
+FRED_RATE_LIMIT = float(os.environ.get('FRED_RATE_LIMIT', 2.0))
+FRED_RATE_BURST = int(os.environ.get('FRED_RATE_BURST', 12))
+
+# Incremental refresh: only request observations after the last cached date,
+# re-reading a look-back window so that upstream revisions are picked up.
+FRED_INCREMENTAL = os.environ.get('FRED_INCREMENTAL', '1') == '1'
+FRED_REVISION_LOOKBACK_DAYS = int(os.environ.get('FRED_REVISION_LOOKBACK_DAYS', 90))
+
+# Page that links to the latest World Bank CMO historical data workbook
+WORLD_BANK_COMMODITY_PAGE_URL = os.environ.get(
+    'WORLD_BANK_COMMODITY_PAGE_URL', "https://www.worldbank.org/en/research/commodity-markets"
+)
+# Seconds a resolved workbook URL is trusted before the page is scraped again, in case
+# the World Bank publishes the workbook under a new URL while the old one still serves
+WORLD_BANK_URL_MAX_AGE = int(os.environ.get('WORLD_BANK_URL_MAX_AGE', 7 * 24 * 3600))
+# Columns of the Supabase 'data' table: one per panel series (add new series to the table too)
+SUPABASE_DATA_COLUMNS = ['Date'] + PANEL_COLUMNS
+# Table holding the daily master panel (same columns as 'data'), so web processes
+# reading a worker-published dataset get the daily views too. Nothing creates it
+# automatically: run the SQL from `python -m logic.data_fetcher --print-schema data_daily`
+# in the Supabase SQL editor (again whenever a series is added).
+SUPABASE_DAILY_TABLE = os.environ.get('SUPABASE_DAILY_TABLE', 'data_daily')
+# 'diff' writes only changed rows; 'replace' clears the table and rewrites everything
+SUPABASE_SYNC_MODE = os.environ.get('SUPABASE_SYNC_MODE', 'diff')
+# Bulk write settings shared by every Supabase upsert/delete
+SUPABASE_CHUNK_SIZE = int(os.environ.get('SUPABASE_CHUNK_SIZE', 500))
+SUPABASE_MAX_IN_FLIGHT = int(os.environ.get('SUPABASE_MAX_IN_FLIGHT', 4))
+SUPABASE_MAX_RETRIES = int(os.environ.get('SUPABASE_MAX_RETRIES', 4))
+# Upper bound on one request body; larger chunks are split (0 disables the limit)
+SUPABASE_MAX_PAYLOAD_BYTES = int(os.environ.get('SUPABASE_MAX_PAYLOAD_BYTES', 1_000_000))
+
+# How the CMO workbook is parsed: 'streaming' (openpyxl read-only, Gold column only) or 'pandas'
+WORLD_BANK_PARSER = os.environ.get('WORLD_BANK_PARSER', 'streaming')
 
 
 def _to_monthly(series):
     """Normalize any date-indexed series to month-end frequency."""
     if series.empty:
         return series
-    series = series.sort_index()
-    try:
-        monthly = series.resample('ME').last()
-    except ValueError:
-        monthly = series.resample('M').last()
+    name = series.name if series.name is not None else 0
+    monthly = build_panel(series.to_frame(name=name), [name], fill={name: 'none'})[name]
+    monthly.name, monthly.index.name = series.name, series.index.name
     return monthly.dropna()
 
-def fetch_fred_data(series_dict, api_key=None, start_date='2018-01-31', progress_callback=None):
-    """Fetches data from FRED for each series in the dictionary."""
+def fetch_fred_data(series_dict, api_key=None, start_date='2018-01-31', progress_callback=None,
+                    max_workers=None, rate_limiter=None, incremental=None, store=None,
+                    lookback_days=None):
+    """Fetches data from FRED for each series in the dictionary.
+
+    Series are downloaded concurrently on a thread pool of `max_workers`
+    threads, with `rate_limiter` (a TokenBucket) pacing the requests.
+    `progress_callback(percent, msg)` is called from the calling thread as
+    each series completes, so messages arrive in completion order.
+
+    In incremental mode observations are kept in an ObservationStore and only
+    the last `lookback_days` before the latest cached date are re-requested.
+    The number of rows downloaded per series is recorded in
+    `df.attrs['fetched_rows']`.
+    """
     if not api_key:
-        api_key = FRED_API_KEY
-    
+        try:
+            api_key = get_fred_api_key()
+        except FredNotConfigured as e:
+            logger.error(f"FRED client not initialized: {e}")
+            return pd.DataFrame()
+    if max_workers is None:
+        max_workers = FRED_MAX_WORKERS
+    if rate_limiter is None:
+        rate_limiter = TokenBucket(FRED_RATE_LIMIT, FRED_RATE_BURST)
+    if incremental is None:
+        incremental = FRED_INCREMENTAL
+    if lookback_days is None:
+        lookback_days = FRED_REVISION_LOOKBACK_DAYS
+    if incremental and store is None:
+        try:
+            store = ObservationStore()
+        except Exception as e:
+            logger.warning(f"Observation store unavailable, falling back to full refresh: {e}")
+            incremental = False
+
+    # Deferred: only processes that actually fetch from FRED import the client
+    from fredapi import Fred
+
     try:
         logger.info(f"Initializing Fred with API key (length: {len(api_key) if api_key else 0}).")
         fred = Fred(api_key=api_key)
+        if FRED_API_URL:
+            fred.root_url = FRED_API_URL
     except Exception as e:
         logger.error(f"Error initializing FRED with provided key: {e}")
         return pd.DataFrame()
 
-    df_list = []
+    def fetch_one(name, series_id):
+        observation_start = pd.Timestamp(start_date)
+        if incremental:
+            coverage = store.coverage(series_id)
+            if coverage and coverage[0] <= observation_start:
+                observation_start = max(observation_start, coverage[1] - pd.Timedelta(days=lookback_days))
+
+        rate_limiter.acquire()
+        logger.info(f"Fetching FRED series: {name} ({series_id}) starting from {observation_start:%Y-%m-%d}")
+        with span('fred_series', series=name):
+            s = fred.get_series(series_id, observation_start=observation_start.strftime('%Y-%m-%d'))
+        if not incremental:
+            return s.to_frame(name=name), len(s)
+
+        written = store.upsert(series_id, s, observation_start)
+        logger.info(f"Stored {written} new or revised observations for {name} ({series_id})")
+        return store.load(series_id, start_date).to_frame(name=name), len(s)
+
     total = len(series_dict)
-    for i, (name, series_id) in enumerate(series_dict.items()):
-        # Calculate percentage: i is current index, (i/total)*100 is starting, ((i+1)/total)*100 is finished
-        percent_start = int((i / total) * 100)
-        try:
-            if progress_callback:
-                progress_callback(percent_start, f"Fetching {name}...")
-            
-            logger.info(f"Fetching FRED series: {name} ({series_id}) starting from {start_date}")
-            s = fred.get_series(series_id, observation_start=start_date)
-            df = s.to_frame(name=name)
-            df_list.append(df)
-            
-            # Successfully fetched, report updated percentage
-            percent_done = int(((i + 1) / total) * 100)
-            if progress_callback:
-                progress_callback(percent_done, f"Fetched {name}")
-                
-            time.sleep(0.5) # Avoid rate limiting
-        except Exception as e:
-            logger.error(f"Error fetching {series_id} from FRED: {e}")
-            percent_err = int(((i + 1) / total) * 100)
-            if progress_callback:
-                progress_callback(percent_err, f"Error: {name}")
+    if progress_callback:
+        progress_callback(0, f"Fetching {total} series...")
+
+    frames = {}
+    fetched_rows = {}
+    done = 0
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            executor.submit(fetch_one, name, series_id): (name, series_id)
+            for name, series_id in series_dict.items()
+        }
+        for future in as_completed(futures):
+            name, series_id = futures[future]
+            done += 1
+            percent_done = int((done / total) * 100)
+            try:
+                frames[name], fetched_rows[name] = future.result()
+                if progress_callback:
+                    progress_callback(percent_done, f"Fetched {name}")
+            except Exception as e:
+                logger.error(f"Error fetching {series_id} from FRED: {e}")
+                if progress_callback:
+                    progress_callback(percent_done, f"Error: {name}")
     
     if progress_callback:
         progress_callback(100, "Processing data...")
     
+    # Keep the configured column order regardless of completion order
+    df_list = [frames[name] for name in series_dict if name in frames]
     if not df_list:
         return pd.DataFrame()
     
     combined_df = pd.concat(df_list, axis=1, sort=True)
+    combined_df.attrs['fetched_rows'] = fetched_rows
     return combined_df
 
 def _get_world_bank_gold_excel_url():
     """Scrape the World Bank commodity markets page for the latest historical data workbook URL."""
-    page_url = "https://www.worldbank.org/en/research/commodity-markets"
+    import requests
+
+    page_url = WORLD_BANK_COMMODITY_PAGE_URL
     logger.info("Fetching World Bank commodity markets page for latest gold workbook link.")
 
     try:
-        response = requests.get(page_url, timeout=30)
+        with span('world_bank_page'):
+            response = requests.get(page_url, timeout=30)
         response.raise_for_status()
         html_content = response.text
     except Exception as e:
@@ -161,18 +292,26 @@ def _get_world_bank_gold_excel_url():
     return live_url
 
 
-def fetch_world_bank_gold_data(start_date='2018-01-31', end_date=None):
-    """Fetch GOLD_PRICE from World Bank monthly commodity workbook (Monthly Prices > Gold)."""
-    if end_date is None:
-        end_date = pd.Timestamp.now().strftime('%Y-%m-%d')
+def _clean_world_bank_gold(dates, values):
+    """Turn raw CMO date labels (e.g. '2024M03') and gold prices into a month-end series."""
+    df_gold = pd.DataFrame({'Date': dates, 'Gold': values})
+    df_gold = df_gold.dropna(subset=['Gold'])
+    df_gold['Date'] = df_gold['Date'].astype(str).str.strip().str.replace('M', '-', regex=False)
+    df_gold['Gold'] = pd.to_numeric(df_gold['Gold'], errors='coerce')
+    df_gold['Date'] = pd.to_datetime(df_gold['Date'], errors='coerce')
+    df_gold = df_gold.dropna(subset=['Date', 'Gold']).sort_values('Date')
 
-    live_url = _get_world_bank_gold_excel_url()
-    if not live_url:
+    if df_gold.empty:
+        logger.warning("World Bank gold series is empty after cleaning.")
         return pd.Series(dtype='float64')
 
-    logger.info(f"Loading World Bank monthly prices workbook from {live_url}")
+    return _to_monthly(df_gold.set_index('Date')['Gold'])
+
+
+def _parse_world_bank_gold_workbook_pandas(source):
+    """Extract the Gold column by loading the whole "Monthly Prices" sheet with pandas."""
     try:
-        df = pd.read_excel(live_url, sheet_name="Monthly Prices", header=4)
+        df = pd.read_excel(source, sheet_name="Monthly Prices", header=4)
     except Exception as e:
         logger.error(f"Failed to parse World Bank monthly workbook: {e}")
         return pd.Series(dtype='float64')
@@ -193,22 +332,150 @@ def fetch_world_bank_gold_data(start_date='2018-01-31', end_date=None):
         logger.error("Gold column not found in World Bank monthly workbook.")
         return pd.Series(dtype='float64')
 
-    df_gold = df[['Date', gold_col]].copy()
     # Drop the first metadata/unit row and any trailing footnotes.
-    df_gold = df_gold.iloc[1:]
-    df_gold = df_gold.dropna(subset=[gold_col])
-    df_gold['Date'] = df_gold['Date'].astype(str).str.strip().str.replace('M', '-', regex=False)
-    df_gold[gold_col] = pd.to_numeric(df_gold[gold_col], errors='coerce')
-    df_gold['Date'] = pd.to_datetime(df_gold['Date'], errors='coerce')
-    df_gold = df_gold.dropna(subset=['Date', gold_col]).sort_values('Date')
+    df_gold = df[['Date', gold_col]].iloc[1:]
+    return _clean_world_bank_gold(df_gold['Date'], df_gold[gold_col])
 
-    if df_gold.empty:
-        logger.warning("World Bank gold series is empty after cleaning.")
+
+def _parse_world_bank_gold_workbook_streaming(source):
+    """Extract the Gold column by streaming the sheet with openpyxl in read-only mode.
+
+    Only the Date and Gold cells of each row are kept, so memory scales with
+    one column instead of the ~70 commodities in the sheet.
+    """
+    from openpyxl import load_workbook
+
+    try:
+        wb = load_workbook(source, read_only=True, data_only=True)
+    except Exception as e:
+        logger.error(f"Failed to open World Bank monthly workbook: {e}")
         return pd.Series(dtype='float64')
 
-    monthly_gold = df_gold.set_index('Date')[gold_col]
-    monthly_gold = _to_monthly(monthly_gold)
+    dates, values = [], []
+    try:
+        ws = wb["Monthly Prices"]
+        gold_idx = header_row = None
+        # The header row sits a few rows below the sheet title.
+        for row_number, header in enumerate(ws.iter_rows(max_row=10, values_only=True), start=1):
+            labels = [str(cell).strip().lower() if cell is not None else '' for cell in header]
+            if 'gold' in labels:
+                gold_idx, header_row = labels.index('gold'), row_number
+                break
+        if gold_idx is None:
+            logger.error("Gold column not found in World Bank monthly workbook.")
+            return pd.Series(dtype='float64')
+
+        # Start below the unit row and stop reading cells after the Gold column.
+        for row in ws.iter_rows(min_row=header_row + 2, max_col=gold_idx + 1, values_only=True):
+            if len(row) <= gold_idx or row[gold_idx] is None:
+                continue
+            dates.append(row[0])
+            values.append(row[gold_idx])
+    except Exception as e:
+        logger.error(f"Failed to parse World Bank monthly workbook: {e}")
+        return pd.Series(dtype='float64')
+    finally:
+        wb.close()
+
+    return _clean_world_bank_gold(dates, values)
+
+
+def _parse_world_bank_gold_workbook(source, parser=None):
+    """Extract the monthly Gold column from a CMO workbook (path, URL or file-like)."""
+    parser = parser or WORLD_BANK_PARSER
+    with span('world_bank_parse'):
+        if parser == 'pandas':
+            return _parse_world_bank_gold_workbook_pandas(source)
+        return _parse_world_bank_gold_workbook_streaming(source)
+
+
+def _download_world_bank_workbook(url, cached):
+    """GET the workbook, sending the cached validators so an unchanged file returns 304."""
+    import requests
+
+    headers = {}
+    if cached and cached.get('url') == url:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+    with span('world_bank_download'):
+        response = requests.get(url, headers=headers, timeout=60)
+    if response.status_code != 304:
+        response.raise_for_status()
+    return response
+
+
+def fetch_world_bank_gold_data(start_date='2018-01-31', end_date=None, store=None):
+    """Fetch GOLD_PRICE from World Bank monthly commodity workbook (Monthly Prices > Gold).
+
+    The resolved workbook URL, its ETag/Last-Modified headers and the extracted
+    gold series are kept in the ObservationStore. Later calls revalidate with a
+    conditional GET, so an unchanged workbook (HTTP 304) is neither downloaded
+    nor parsed. The commodity-markets page is scraped again when the cached
+    URL stops working or was resolved more than WORLD_BANK_URL_MAX_AGE
+    seconds ago.
+    """
+    if end_date is None:
+        end_date = pd.Timestamp.now().strftime('%Y-%m-%d')
+
+    source_id = SERIES_CONFIG['GOLD_PRICE']['id']
+    if store is None:
+        try:
+            store = ObservationStore()
+        except Exception as e:
+            logger.warning(f"Observation store unavailable, World Bank workbook will not be cached: {e}")
+
+    cached = store.get_download(source_id) if store else None
+    if cached and not store.coverage(source_id):
+        # Validators without data are useless; force a full download.
+        cached = None
+
+    live_url = None
+    if cached:
+        age = pd.Timestamp.now(tz='UTC') - cached['checked_at']
+        if age <= pd.Timedelta(seconds=WORLD_BANK_URL_MAX_AGE):
+            live_url = cached['url']
+        else:
+            logger.info(f"World Bank workbook URL resolved {age} ago; resolving the link again.")
+    # When the link was last resolved; a reused URL keeps it so the link ages
+    resolved_at = cached['checked_at'] if live_url else None
+    response = None
+    if live_url:
+        try:
+            response = _download_world_bank_workbook(live_url, cached)
+        except Exception as e:
+            logger.warning(f"Cached World Bank workbook URL failed ({e}); resolving the link again.")
+            live_url = resolved_at = None
+
+    if not live_url:
+        live_url = _get_world_bank_gold_excel_url()
+        if not live_url:
+            return pd.Series(dtype='float64')
+        try:
+            response = _download_world_bank_workbook(live_url, cached)
+        except Exception as e:
+            logger.error(f"Failed to download World Bank monthly workbook: {e}")
+            return pd.Series(dtype='float64')
+
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if response.status_code == 304:
+        logger.info("World Bank workbook unchanged (HTTP 304); using cached GOLD_PRICE series.")
+        monthly_gold = store.load(source_id)
+        store.set_download(source_id, live_url, etag or cached.get('etag'),
+                           last_modified or cached.get('last_modified'), checked_at=resolved_at)
+    else:
+        logger.info(f"Loading World Bank monthly prices workbook from {live_url}")
+        monthly_gold = _parse_world_bank_gold_workbook(io.BytesIO(response.content))
+        if monthly_gold.empty:
+            return pd.Series(dtype='float64')
+        if store:
+            store.upsert(source_id, monthly_gold, monthly_gold.index.min())
+            store.set_download(source_id, live_url, etag, last_modified, checked_at=resolved_at)
+
     monthly_gold = monthly_gold.loc[start_date:end_date]
+    monthly_gold.index.name = 'Date'
     monthly_gold.name = 'GOLD_PRICE'
 
     logger.info(f"Fetched {len(monthly_gold)} monthly GOLD_PRICE observations from World Bank.")
@@ -260,7 +527,13 @@ def fetch_yahoo_gold_data(ticker='GLD', start_date='2018-01-31', end_date=None):
     return fetch_world_bank_gold_data(start_date=start_date, end_date=end_date)
 
 def process_data(final_df, start_date='2018-01-31', end_date=None):
-    """Processes the raw data (sorting, resampling, filling, etc.)."""
+    """Processes the raw data into the monthly panel.
+
+    Every PANEL_COLUMNS series is aligned onto month-end dates in one pass
+    (last observation of each month), filled per its SERIES_CONFIG 'fill'
+    policy, cut to [start_date, end_date] and restricted to months where
+    ZAR_USD (our target) is known.
+    """
     
     # If end_date is not provided, use the end of the previous month
     if end_date is None:
@@ -269,198 +542,353 @@ def process_data(final_df, start_date='2018-01-31', end_date=None):
         end_of_prev_month = (now.replace(day=1) - pd.Timedelta(days=1))
         end_date = end_of_prev_month.strftime('%Y-%m-%d')
     
-    # Sort index
-    final_df = final_df.sort_index()
-    
-    # Resample to monthly (End of Month) and take the last value
-    # Older pandas used 'M', newer use 'ME'
+    return build_panel(final_df, PANEL_COLUMNS, fill=PANEL_FILL, start_date=start_date, end_date=end_date,
+                       required=['ZAR_USD'])
+
+
+def process_daily_data(final_df, start_date='2018-01-31', end_date=None):
+    """Processes the raw data into the business-day master panel (float32).
+
+    Same series and fill policies as process_data, but every business day is
+    kept, so daily series such as VIX and ZAR_USD retain all observations.
+    Monthly and quarterly series are dated differently by their sources (FRED
+    on the 1st, World Bank and SA CPI at month end), so each observation is
+    taken to apply from the last business day of its month and held until the
+    next one, exactly as in the monthly panel. Starts at the first business
+    day with a ZAR_USD value.
+    """
+    return build_panel(final_df, PANEL_COLUMNS, fill=PANEL_FILL, start_date=start_date, end_date=end_date,
+                       required=['ZAR_USD'], freq='B', dtype='float32', month_dated=MONTH_DATED_COLUMNS)
+
+def _fetch_supabase_rows(client, columns, page_size=1000, table='data'):
+    """Read the given columns of every row in `table`, paging past the PostgREST row limit."""
+    rows = []
+    select = ','.join(f'"{c}"' if not c.isidentifier() else c for c in columns)
+    offset = 0
+    while True:
+        resp = client.table(table).select(select).order('Date').range(offset, offset + page_size - 1).execute()
+        page = resp.data or []
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        offset += page_size
+
+
+def load_from_supabase(columns=None, client=None, table='data'):
+    """Read a stored table ('data' by default) back as a Date-indexed DataFrame (paged, only the requested columns)."""
     try:
-        final_df_monthly = final_df.resample('ME').last()
-    except ValueError:
-        final_df_monthly = final_df.resample('M').last()
-    
-    # Forward fill missing values
-    final_df_monthly = final_df_monthly.ffill()
-    
-    # Filter by date range if provided
-    final_df_monthly = final_df_monthly.loc[start_date:end_date]
-    
-    # Build explicit inflation columns:
-    # US_CPI is already in final_df from FRED
-    
-    # Keep only requested columns in the specified order
-    columns_to_keep = [
-        'EPU(USA)', 
-        'WUIZAF(SA)', 
-        '10_YEAR_BOND_RATES(USA)', 
-        '10_YEAR_BOND_RATES(SA)', 
-        'VIX', 
-        'GOLD_PRICE', 
-        'BRENT_OIL_PRICE', 
-        'US_CPI',
-        'SA_INFLATION',
-        'ZAR_USD'
-    ]
-    
-    # Check if all columns exist (in case some failed to fetch)
-    existing_columns = [col for col in columns_to_keep if col in final_df_monthly.columns]
-    final_df_monthly = final_df_monthly[existing_columns]
-    
-    # Remove rows with NaN in ZAR_USD (our target)
-    if 'ZAR_USD' in final_df_monthly.columns:
-        final_df_monthly = final_df_monthly.dropna(subset=['ZAR_USD'])
-    
-    final_df_monthly.index.name = 'Date'
-    return final_df_monthly
+        client = client or get_supabase()
+    except SupabaseNotConfigured as e:
+        logger.error(f"Supabase client not initialized: {e}")
+        return pd.DataFrame()
+
+    columns = ['Date'] + [c for c in (columns or SUPABASE_DATA_COLUMNS) if c != 'Date']
+    try:
+        rows = _fetch_supabase_rows(client, columns, table=table)
+    except Exception as e:
+        logger.error(f"Error reading from Supabase: {e}")
+        return pd.DataFrame()
+    if not rows:
+        return pd.DataFrame()
+
+    df = pd.DataFrame(rows, columns=columns)
+    df['Date'] = pd.to_datetime(df['Date'].astype(str).str[:10])
+    df = df.set_index('Date').sort_index().apply(pd.to_numeric, errors='coerce')
+    logger.info(f"Loaded {len(df)} rows from Supabase '{table}' table.")
+    return df
+
+
+def _diff_against_supabase(local_df, remote_rows):
+    """Compare local rows with the stored ones.
+
+    Returns the local rows that are new or changed and the stored Date values
+    that no longer exist locally. Both frames are keyed by 'YYYY-MM-DD'.
+    """
+    local = local_df.set_index('Date')
+    if not remote_rows:
+        return local_df, []
+
+    remote = pd.DataFrame(remote_rows)
+    remote_dates = remote['Date'].astype(str)
+    remote.index = remote_dates.str[:10]
+    remote = remote.reindex(columns=local.columns)
+    remote = remote.apply(pd.to_numeric, errors='coerce')
+
+    removed = remote_dates[~remote.index.isin(local.index)].tolist()
+    common = local.index.intersection(remote.index)
+
+    ours = local.loc[common].apply(pd.to_numeric, errors='coerce').to_numpy(dtype='float64')
+    theirs = remote.loc[common].to_numpy(dtype='float64')
+    changed = ~np.isclose(ours, theirs, rtol=0, atol=1e-9, equal_nan=True).all(axis=1)
+
+    to_write = local.index.difference(remote.index).union(common[changed])
+    return local_df[local_df['Date'].isin(to_write)], removed
+
+
+def _bulk_writer(client, table='data'):
+    """Build the shared chunked writer for a Supabase table ('data' by default)."""
+    return BulkWriter(client, table, chunk_size=SUPABASE_CHUNK_SIZE, max_in_flight=SUPABASE_MAX_IN_FLIGHT,
+                      max_retries=SUPABASE_MAX_RETRIES, max_bytes=SUPABASE_MAX_PAYLOAD_BYTES)
+
 
-def save_to_supabase(df):
-    """Saves the processed DataFrame to the Supabase 'data' table."""
+def _sync_to_supabase(client, local_df, table='data'):
+    """Write only new/changed rows and delete rows that disappeared. Returns row counts."""
+    with span('supabase_read'):
+        remote_rows = _fetch_supabase_rows(client, list(local_df.columns), table=table)
+    to_write, removed = _diff_against_supabase(local_df, remote_rows)
+    remote_dates = {str(row.get('Date'))[:10] for row in remote_rows}
+    inserted = int((~to_write['Date'].isin(remote_dates)).sum())
+    stats = {'inserted': inserted, 'updated': len(to_write) - inserted, 'deleted': len(removed)}
+
+    writer = _bulk_writer(client, table)
+    with span('supabase_upsert'):
+        stats['chunks'] = writer.upsert_json(to_json_rows(to_write))
+    with span('supabase_delete'):
+        stats['chunks'] += writer.delete_in('Date', removed)
+    stats['rows_written'] = stats['inserted'] + stats['updated'] + stats['deleted']
+    return stats
+
+
+def _prepare_supabase_frame(df):
+    """Shape a processed DataFrame into the 'data' table layout (Date as 'YYYY-MM-DD', known columns only)."""
+    df_to_save = df.reset_index()
+    # Map app-level inflation keys to the current Supabase column names.
+    df_to_save = df_to_save.rename(columns={'usa_inflation': 'US_CPI'})
+    df_to_save['Date'] = pd.to_datetime(df_to_save['Date']).dt.strftime('%Y-%m-%d')
+    # float32 columns (the daily panel) become the shortest decimal that round-trips in float32,
+    # instead of the widened float64 with its representation noise (18.1234 rather than 18.12339973449707)
+    narrow = df_to_save.columns[df_to_save.dtypes == 'float32']
+    if len(narrow):
+        df_to_save[narrow] = df_to_save[narrow].astype(str).astype('float64')
+    columns = [c for c in SUPABASE_DATA_COLUMNS if c in df_to_save.columns]
+    return df_to_save[columns]
+
+
+def supabase_table_schema(table='data'):
+    """SQL creating a panel table (`data` or SUPABASE_DAILY_TABLE) with one column per SUPABASE_DATA_COLUMNS entry."""
+    columns = ['    "Date" date PRIMARY KEY'] + [f'    "{name}" double precision' for name in PANEL_COLUMNS]
+    return f'CREATE TABLE IF NOT EXISTS public."{table}" (\n' + ',\n'.join(columns) + '\n);'
+
+
+def save_to_supabase(df, mode=None, client=None, table='data'):
+    """Saves the processed DataFrame to a Supabase table ('data' by default).
+
+    In 'diff' mode (the default, see SUPABASE_SYNC_MODE) the stored rows are
+    read back and only inserted, changed and removed dates are written, so the
+    table is never empty while syncing. 'replace' clears the table and
+    upserts every row. Rows are serialized column-wise to JSON and written
+    through BulkWriter; the returned dict holds the rows written and
+    per-chunk metrics.
+    """
     if df.empty:
         logger.warning("No data to save.")
         return
-    
-    # Reset index to make Date a column
-    df_to_save = df.reset_index()
-    
-    # Convert Date to string (ISO format) for JSON serialization
-    df_to_save['Date'] = df_to_save['Date'].dt.strftime('%Y-%m-%d')
-    
-    # Replace NaNs with None
-    df_to_save = df_to_save.where(pd.notnull(df_to_save), None)
-    records = df_to_save.to_dict('records')
-    
-    for record in records:
-        for key, value in record.items():
-            if pd.isna(value):
-                record[key] = None
-
-        # Map app-level inflation keys to the current Supabase column names.
-        if 'usa_inflation' in record:
-            record['US_CPI'] = record.pop('usa_inflation')
-    
-    logger.info(f"Saving {len(records)} records to Supabase 'data' table...")
-    
-    if not supabase:
-        logger.error("Supabase client not initialized.")
+    mode = mode or SUPABASE_SYNC_MODE
+    try:
+        client = client or get_supabase()
+    except SupabaseNotConfigured as e:
+        logger.error(f"Supabase client not initialized: {e}")
         return None
+
+    df_to_save = _prepare_supabase_frame(df)
+    logger.info(f"Saving {len(df_to_save)} records to Supabase '{table}' table...")
         
     try:
-        valid_columns = {
-            'Date', 'EPU(USA)', 'WUIZAF(SA)', '10_YEAR_BOND_RATES(USA)', 
-            '10_YEAR_BOND_RATES(SA)', 'VIX', 
-            'GOLD_PRICE', 'BRENT_OIL_PRICE', 'US_CPI', 'SA_INFLATION', 'ZAR_USD'
-        }
-        
-        filtered_records = []
-        for record in records:
-            filtered_record = {k: v for k, v in record.items() if k in valid_columns}
-            filtered_records.append(filtered_record)
+        if mode == 'diff':
+            stats = _sync_to_supabase(client, df_to_save, table)
+            logger.info(
+                f"Synced Supabase: {stats['inserted']} inserted, {stats['updated']} updated, "
+                f"{stats['deleted']} deleted ({stats['rows_written']} rows written)."
+            )
+            return stats
 
         logger.info("Clearing existing data in Supabase...")
-        supabase.table('data').delete().gte('Date', '1900-01-01').execute()
+        with span('supabase_delete'):
+            client.table(table).delete().gte('Date', '1900-01-01').execute()
 
-        response = supabase.table('data').upsert(filtered_records).execute()
+        with span('supabase_upsert'):
+            chunks = _bulk_writer(client, table).upsert_json(to_json_rows(df_to_save))
         logger.info("Successfully saved data to Supabase.")
-        return response
+        return {'rows_written': len(df_to_save), 'chunks': chunks}
     except Exception as e:
         logger.error(f"Error saving to Supabase: {e}")
         return None
 
 
-def replace_gold_price_column_in_supabase(gold_series):
+def replace_gold_price_column_in_supabase(gold_series, client=None):
     """Upsert only Date + GOLD_PRICE into Supabase, replacing GOLD_PRICE for existing dates."""
     if gold_series is None or gold_series.empty:
         logger.warning("No GOLD_PRICE series provided for Supabase replacement.")
         return None
 
-    if not supabase:
-        logger.error("Supabase client not initialized.")
+    try:
+        client = client or get_supabase()
+    except SupabaseNotConfigured as e:
+        logger.error(f"Supabase client not initialized: {e}")
         return None
 
     gold_df = gold_series.dropna().to_frame(name='GOLD_PRICE').reset_index()
     gold_df.rename(columns={gold_df.columns[0]: 'Date'}, inplace=True)
     gold_df['Date'] = pd.to_datetime(gold_df['Date'], errors='coerce')
-    gold_df['DateKey'] = gold_df['Date'].dt.strftime('%Y-%m-%d')
-    gold_df['Date'] = gold_df['Date'].dt.strftime('%Y-%m-%dT00:00:00+00:00')
     gold_df['GOLD_PRICE'] = pd.to_numeric(gold_df['GOLD_PRICE'], errors='coerce')
-    gold_df = gold_df.dropna(subset=['Date', 'DateKey', 'GOLD_PRICE'])
+    gold_df = gold_df.dropna(subset=['Date', 'GOLD_PRICE'])
 
-    records = gold_df.to_dict('records')
-    if not records:
+    if gold_df.empty:
         logger.warning("No valid GOLD_PRICE records to upsert.")
         return None
 
     # Keep updates scoped to rows that already exist in the data table.
     try:
-        existing_resp = supabase.table('data').select('Date').gte('Date', '1900-01-01').execute()
-        existing_rows = existing_resp.data or []
-        existing_dates = {
-            str(row.get('Date'))[:10]
-            for row in existing_rows
-            if row.get('Date')
-        }
-        if existing_dates:
-            records = [row for row in records if row['DateKey'] in existing_dates]
+        existing_dates = pd.Series([str(row.get('Date'))[:10] for row in _fetch_supabase_rows(client, ['Date'])])
+        if not existing_dates.empty:
+            gold_df = gold_df[gold_df['Date'].dt.strftime('%Y-%m-%d').isin(existing_dates)]
     except Exception as e:
         logger.warning(f"Could not prefetch existing dates for GOLD_PRICE replacement: {e}")
 
-    if not records:
+    if gold_df.empty:
         logger.warning("No matching Supabase dates found for GOLD_PRICE replacement.")
         return None
 
-    for row in records:
-        row.pop('DateKey', None)
-
-    logger.info(f"Replacing GOLD_PRICE in Supabase for {len(records)} dates.")
+    logger.info(f"Replacing GOLD_PRICE in Supabase for {len(gold_df)} dates.")
     try:
-        chunk_size = 500
-        for i in range(0, len(records), chunk_size):
-            chunk = records[i:i + chunk_size]
-            supabase.table('data').upsert(chunk).execute()
+        rows = to_json_rows(gold_df, columns=['Date', 'GOLD_PRICE'], date_format='%Y-%m-%dT00:00:00+00:00')
+        with span('supabase_upsert'):
+            chunks = _bulk_writer(client).upsert_json(rows)
         logger.info("Successfully replaced GOLD_PRICE column in Supabase.")
-        return {"updated_rows": len(records)}
+        return {"updated_rows": len(gold_df), "chunks": chunks}
     except Exception as e:
         logger.error(f"Error replacing GOLD_PRICE in Supabase: {e}")
         return None
 
-def fetch_and_save_data():
-    """Main function to run the fetch, process, and save workflow."""
-    logger.info("Starting main data fetch and save workflow.")
-    
-    # Prepare FRED series dictionary
-    fred_series = {name: cfg['id'] for name, cfg in SERIES_CONFIG.items() if cfg['source'] == 'FRED'}
-    
-    logger.info(f"Fetching {len(fred_series)} series from FRED.")
-    raw_df = fetch_fred_data(fred_series)
-
-    # Fetch GOLD_PRICE from World Bank monthly commodity data.
-    wb_gold = fetch_world_bank_gold_data(start_date='2018-01-31')
-    if not wb_gold.empty:
-        # Use concat instead of assignment to allow the index to expand to the latest available data.
-        raw_df = pd.concat([raw_df, wb_gold.to_frame(name='GOLD_PRICE')], axis=1)
-    else:
-        logger.warning("GOLD_PRICE could not be loaded from World Bank.")
+def load_cached_fred_data(series_dict, start_date='2018-01-31', store=None):
+    """Build the same frame as fetch_fred_data from the ObservationStore only, without calling FRED."""
+    store = store or ObservationStore()
+    df_list = []
+    for name, series_id in series_dict.items():
+        s = store.load(series_id, start_date)
+        if s.empty:
+            logger.warning(f"No cached observations for {name} ({series_id}).")
+            continue
+        df_list.append(s.to_frame(name=name))
+    if not df_list:
+        return pd.DataFrame()
+    return pd.concat(df_list, axis=1, sort=True)
+
+
+@register_source('FRED')
+class FredSource(SourceAdapter):
+    """FRED series by id, through the rate-limited, incremental fetch_fred_data."""
+
+    def fetch_sync(self, series, since, progress=None):
+        def forward(percent, msg):
+            if progress and msg.startswith(('Fetched ', 'Error: ')):
+                progress(msg)
+        return fetch_fred_data({name: cfg['id'] for name, cfg in series.items()}, start_date=since,
+                               progress_callback=forward)
+
+
+@register_source('WORLD_BANK')
+class WorldBankSource(SourceAdapter):
+    """Columns of the World Bank CMO monthly workbook (only Gold is parsed)."""
+
+    def fetch_sync(self, series, since, progress=None):
+        frames = []
+        for name, cfg in series.items():
+            if cfg['id'] != SERIES_CONFIG['GOLD_PRICE']['id']:
+                logger.error(f"Unsupported World Bank series {name} ({cfg['id']}).")
+                continue
+            gold = fetch_world_bank_gold_data(start_date=since)
+            if gold.empty:
+                logger.warning("GOLD_PRICE could not be loaded from World Bank.")
+                continue
+            frames.append(gold.to_frame(name=name))
+            if progress:
+                progress(f"Fetched {name}")
+        return pd.concat(frames, axis=1) if frames else pd.DataFrame()
+
+
+@register_source('HARDCODED')
+class HardcodedSource(SourceAdapter):
+    """Series maintained in this module (SA headline CPI)."""
+
+    local = True
+
+    def fetch_sync(self, series, since, progress=None):
+        cpi = fetch_sa_inflation_hardcoded().loc[since:, 'SA_INFLATION']
+        return pd.DataFrame({name: cpi for name, cfg in series.items() if cfg['id'] == 'SA_CPI_INDEX'})
+
+
+@register_source(STORE_SOURCE)
+class StoreSource(SourceAdapter):
+    """Previously downloaded observations from the local ObservationStore, without calling upstream."""
+
+    def fetch_sync(self, series, since, progress=None):
+        return load_cached_fred_data({name: cfg['id'] for name, cfg in series.items()}, start_date=since)
+
+
+def build_dataset(progress_callback=None, refresh=None):
+    """Fetch every configured series and return the processed panel, the raw World Bank gold series
+    and the daily master panel (None when DAILY_PANEL is off).
+
+    All sources are fetched concurrently through their registered adapters
+    (see logic.sources). `refresh` optionally names the series to fetch from
+    upstream; the others are read from the local ObservationStore (used by
+    the scheduled worker). The per-source timings are in
+    `processed.attrs['source_timings']`, and the series that came back from
+    upstream in `processed.attrs['refreshed']`.
+    """
+    logger.info(f"Fetching {len(SERIES_CONFIG)} series.")
+    raw_df = fetch_all(SERIES_CONFIG, since='2018-01-31', refresh=refresh, progress_callback=progress_callback)
+    wb_gold = raw_df['GOLD_PRICE'].dropna() if 'GOLD_PRICE' in raw_df.columns else pd.Series(dtype='float64')
 
-    # Fetch SA_INFLATION (Hardcoded)
-    sa_inflation = fetch_sa_inflation_hardcoded()
-    raw_df = pd.concat([raw_df, sa_inflation], axis=1)
-    
     if raw_df.empty:
-        logger.error("Failed to fetch any data from FRED.")
-        return
-    
+        logger.error("Failed to fetch any data.")
+        return pd.DataFrame(), wb_gold, None
+
+    if progress_callback:
+        progress_callback(100, "Processing data...")
     logger.info("Processing data.")
-    processed_df = process_data(raw_df)
+    with span('process_data'):
+        processed_df = process_data(raw_df, start_date='2018-01-31')
+    processed_df.attrs['source_timings'] = raw_df.attrs.get('source_timings', {})
+    processed_df.attrs['refreshed'] = raw_df.attrs.get('refreshed', [])
+    daily_df = None
+    if DAILY_PANEL:
+        with span('process_daily_data'):
+            daily_df = process_daily_data(raw_df, start_date='2018-01-31')
     
     logger.info(f"Processed data with {len(processed_df.columns)} factors.")
     logger.info(f"Columns included: {processed_df.columns.tolist()}")
+    return processed_df, wb_gold, daily_df
+
+
+def fetch_and_save_data(progress_callback=None, refresh=None):
+    """Main function to run the fetch, process, and save workflow.
+
+    Returns a dict with the processed frame ('data'), the World Bank gold
+    series ('gold'), the daily master panel ('daily', saved to
+    SUPABASE_DAILY_TABLE), the Supabase save result ('save', None on failure),
+    the seconds spent per source ('source_timings') and the names of the
+    series that came back from upstream ('refreshed'), or None when nothing
+    could be fetched.
+    """
+    logger.info("Starting main data fetch and save workflow.")
+    processed_df, wb_gold, daily_df = build_dataset(progress_callback=progress_callback, refresh=refresh)
+    if processed_df.empty:
+        logger.error("No processed data to save.")
+        return None
     
     logger.info("Saving to Supabase.")
     save_resp = save_to_supabase(processed_df)
+    if daily_df is not None:
+        save_to_supabase(daily_df, table=SUPABASE_DAILY_TABLE)
 
     # Explicitly replace only GOLD_PRICE in Supabase with the latest World Bank series.
-    replace_gold_price_column_in_supabase(wb_gold)
-    return save_resp
+    if refresh is None or 'GOLD_PRICE' in refresh:
+        replace_gold_price_column_in_supabase(wb_gold)
+    return {'data': processed_df, 'gold': wb_gold, 'daily': daily_df, 'save': save_resp,
+            'source_timings': processed_df.attrs.get('source_timings', {}),
+            'refreshed': processed_df.attrs.get('refreshed', [])}
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Data fetch and Supabase sync")
@@ -474,9 +902,16 @@ if __name__ == "__main__":
         default="2018-01-31",
         help="Start date for gold replacement mode (YYYY-MM-DD)."
     )
+    parser.add_argument(
+        "--print-schema",
+        metavar="TABLE",
+        help="Print the SQL creating a panel table (e.g. data_daily) and exit."
+    )
     args = parser.parse_args()
 
-    if args.replace_gold_only:
+    if args.print_schema:
+        print(supabase_table_schema(args.print_schema))
+    elif args.replace_gold_only:
         gold_series = fetch_world_bank_gold_data(start_date=args.start_date)
         replace_gold_price_column_in_supabase(gold_series)
     else:
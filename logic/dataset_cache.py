@@ -0,0 +1,175 @@
+import hashlib
+import os
+import threading
+import time
+import logging
+from collections import OrderedDict
+
+import diskcache
+import pandas as pd
+
+from logic.features import compute_features
+
+logger = logging.getLogger("DatasetCache")
+
+# Shared on-disk cache. Every gunicorn worker and background-callback process
+# opens the same directory, so entries and locks are visible across processes.
+CACHE_DIR = os.environ.get('CACHE_DIR', './.cache')
+
+# How long a processed dataset is served before the next request refreshes it
+DATASET_CACHE_TTL = int(os.environ.get('DATASET_CACHE_TTL', 15 * 60))
+# Upper bound on a refresh; a crashed refresher releases the lock after this
+DATASET_REFRESH_TIMEOUT = int(os.environ.get('DATASET_REFRESH_TIMEOUT', 10 * 60))
+
+# When a separate refresh worker owns upstream fetching, web requests only read
+# what it published (Supabase) instead of calling FRED / World Bank themselves.
+# Enable it together with the worker process (the Procfile runs both).
+REFRESH_WORKER_ENABLED = os.environ.get('REFRESH_WORKER_ENABLED', '0') == '1'
+
+DATASET_KEY = 'dataset:processed'
+# How long results derived from a dataset version (correlations, views, backtests) are kept
+DERIVED_CACHE_TTL = int(os.environ.get('DERIVED_CACHE_TTL', 7 * 24 * 3600))
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """The shared diskcache, opened on first use so that importing a module writes nothing."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = diskcache.Cache(CACHE_DIR)
+    return _cache
+
+
+def __getattr__(name):
+    # `dataset_cache.cache` stays available, opened on first access
+    if name == 'cache':
+        return get_cache()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def dataset_version(df):
+    """Content hash of a DataFrame, used to key anything derived from it."""
+    if df is None or df.empty:
+        return None
+    digest = hashlib.sha1(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    digest.update('|'.join(map(str, df.columns)).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def get_derived(kind, version, compute, *parts, refresh=False):
+    """Result derived from dataset `version`, from the shared cache or computed by `compute()` and stored.
+
+    The key is '<kind>:<version>:<parts...>', so anything computed for one
+    dataset version is shared by every process until it expires. `refresh`
+    recomputes and replaces a stored result.
+    """
+    key = ':'.join([kind, str(version), *map(str, parts)])
+    value = None if refresh else get_cache().get(key)
+    if value is None:
+        value = compute()
+        get_cache().set(key, value, expire=DERIVED_CACHE_TTL)
+    return value
+
+
+class LRUCache:
+    """Small per-process least-recently-used map for values that are costly to rebuild."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """The value under `key` (now the most recently used), or None."""
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """Store `value` under `key`, evicting the least recently used entries beyond maxsize."""
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+def get_cached_dataset(max_age=None):
+    """Return the cached entry if it is younger than `max_age` seconds (default: the TTL), else None."""
+    max_age = DATASET_CACHE_TTL if max_age is None else max_age
+    entry = get_cache().get(DATASET_KEY)
+    if entry is None:
+        return None
+    if max_age is not None and time.time() - entry['fetched_at'] > max_age:
+        return None
+    return entry
+
+
+def store_dataset(df, fetched_at=None, **extra):
+    """Publish a processed DataFrame as the current dataset and return the cache entry.
+
+    Derived features are computed and stored alongside it.
+    """
+    fetched_at = time.time() if fetched_at is None else fetched_at
+    entry = {'data': df, 'features': compute_features(df), 'version': dataset_version(df), 'fetched_at': fetched_at, **extra}
+    # No expiry: a stale entry is still the last known good dataset.
+    get_cache().set(DATASET_KEY, entry)
+    return entry
+
+
+def get_or_refresh_dataset(refresh, progress_callback=None, force=False):
+    """Return a fresh dataset entry, running `refresh(progress_callback)` at most once at a time.
+
+    `refresh` must return a dict with the processed frame under 'data' (other
+    keys are stored alongside it) or None on failure. Concurrent callers
+    across threads and processes wait on the same diskcache lock; whoever gets
+    it after a refresh finds the new entry and returns it without calling
+    upstream again. Returns (entry, refreshed) or (None, False).
+    """
+    if not force:
+        entry = get_cached_dataset()
+        if entry is not None:
+            return entry, False
+
+    started = time.time()
+    with diskcache.Lock(get_cache(), f'{DATASET_KEY}:lock', expire=DATASET_REFRESH_TIMEOUT):
+        entry = get_cache().get(DATASET_KEY)
+        # Someone else refreshed while we were waiting for the lock.
+        if entry is not None and (entry['fetched_at'] >= started or (not force and get_cached_dataset())):
+            logger.info("Dataset refreshed by a concurrent request; reusing it.")
+            return entry, False
+
+        logger.info("Refreshing dataset from upstream sources.")
+        result = refresh(progress_callback)
+        if not result or result.get('data') is None or result['data'].empty:
+            return None, False
+        data = result.pop('data')
+        return store_dataset(data, **result), True
+
+
+def load_latest_dataset(loader):
+    """Return the last known dataset without touching upstream sources.
+
+    Serves the cached entry regardless of age; on a cold cache it calls
+    `loader()` (e.g. a Supabase read) and keeps the result as a snapshot.
+    Snapshots are stored as already expired, so the next explicit refresh
+    still goes upstream. Returns None if nothing is available.
+    """
+    entry = get_cache().get(DATASET_KEY)
+    if entry is not None:
+        return entry
+    df = loader()
+    if df is None or df.empty:
+        return None
+    return store_dataset(df, fetched_at=0, source='snapshot')
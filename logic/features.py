@@ -0,0 +1,78 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("Features")
+
+# Derived series computed from the processed monthly panel.
+#   log_return: log(x_t / x_{t-1})
+#   yoy:        % change over 12 months
+#   lag:        x_{t-periods}
+#   rolling_z:  (x_t - rolling mean) / rolling std over `window` months
+#   spread:     source - minus
+FEATURE_CONFIG = {
+    'ZAR_USD_LOG_RETURN': {'transform': 'log_return', 'source': 'ZAR_USD', 'label': 'ZAR/USD monthly log return'},
+    'US_CPI_YOY': {'transform': 'yoy', 'source': 'US_CPI', 'label': 'US CPI year-on-year change (%)'},
+    'SA_INFLATION_YOY': {'transform': 'yoy', 'source': 'SA_INFLATION', 'label': 'SA CPI year-on-year change (%)'},
+    'VIX_LAG1': {'transform': 'lag', 'source': 'VIX', 'periods': 1, 'label': 'VIX lagged 1 month'},
+    'VIX_LAG3': {'transform': 'lag', 'source': 'VIX', 'periods': 3, 'label': 'VIX lagged 3 months'},
+    'ZAR_USD_Z12': {'transform': 'rolling_z', 'source': 'ZAR_USD', 'window': 12, 'label': 'ZAR/USD 12-month z-score'},
+    'VIX_Z12': {'transform': 'rolling_z', 'source': 'VIX', 'window': 12, 'label': 'VIX 12-month z-score'},
+    'GOLD_PRICE_Z12': {'transform': 'rolling_z', 'source': 'GOLD_PRICE', 'window': 12, 'label': 'Gold price 12-month z-score'},
+    'BRENT_OIL_PRICE_Z12': {'transform': 'rolling_z', 'source': 'BRENT_OIL_PRICE', 'window': 12, 'label': 'Brent crude 12-month z-score'},
+    'BOND_SPREAD_SA_USA': {'transform': 'spread', 'source': '10_YEAR_BOND_RATES(SA)', 'minus': '10_YEAR_BOND_RATES(USA)',
+                           'label': '10-year bond spread, SA minus USA (pp)'},
+}
+
+
+def _active(columns, config):
+    """Configured features whose source columns are all present, in declaration order."""
+    return [name for name, spec in config.items()
+            if spec['source'] in columns and spec.get('minus', spec['source']) in columns]
+
+
+def compute_features(panel, config=None):
+    """Compute every configured feature for `panel` and return them as a DataFrame on the same index.
+
+    Features sharing a transform are computed together on one 2-D array.
+    Features whose source columns are missing from the panel are skipped.
+    """
+    config = FEATURE_CONFIG if config is None else config
+    columns = {}
+    groups = {}
+    for name in _active(panel.columns, config):
+        groups.setdefault(config[name]['transform'], []).append((name, config[name]))
+
+    for transform, items in groups.items():
+        names = [name for name, _ in items]
+        values = panel[[spec['source'] for _, spec in items]].to_numpy(dtype='float64')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if transform == 'log_return':
+                result = np.full_like(values, np.nan)
+                result[1:] = np.log(values[1:] / values[:-1])
+            elif transform == 'yoy':
+                result = np.full_like(values, np.nan)
+                result[12:] = (values[12:] / values[:-12] - 1) * 100
+            elif transform == 'lag':
+                result = np.full_like(values, np.nan)
+                for i, (_, spec) in enumerate(items):
+                    p = spec['periods']
+                    result[p:, i] = values[:len(values) - p, i]
+            elif transform == 'rolling_z':
+                frame = pd.DataFrame(values)
+                result = np.full_like(values, np.nan)
+                for window in sorted({spec['window'] for _, spec in items}):
+                    idx = [i for i, (_, spec) in enumerate(items) if spec['window'] == window]
+                    rolling = frame[idx].rolling(window, min_periods=window)
+                    result[:, idx] = ((frame[idx] - rolling.mean()) / rolling.std()).to_numpy()
+            elif transform == 'spread':
+                result = values - panel[[spec['minus'] for _, spec in items]].to_numpy(dtype='float64')
+            else:
+                raise ValueError(f"Unknown feature transform '{transform}'.")
+        result[~np.isfinite(result)] = np.nan
+        columns.update(zip(names, result.T))
+
+    ordered = [name for name in config if name in columns]
+    return pd.DataFrame({name: columns[name] for name in ordered}, index=panel.index)
+
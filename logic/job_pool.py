@@ -0,0 +1,145 @@
+"""Background callbacks on a pool of pre-warmed worker processes.
+
+Dash's DiskcacheManager starts a fresh spawned interpreter for every
+background job, which has to import Dash, pandas, plotly and the app before
+it can report progress. WarmPoolManager keeps the same diskcache result and
+progress backend but runs jobs on a long-lived pool whose workers import the
+app once at start-up. Job state lives in the shared diskcache so any web
+process can answer a poll for a job another process submitted.
+"""
+import atexit
+import importlib
+import logging
+import os
+import threading
+import time
+import uuid
+
+import multiprocess
+from dash import DiskcacheManager
+
+from logic.metrics import flush as flush_metrics, observe
+
+logger = logging.getLogger("JobPool")
+
+# Worker processes per web process (0 falls back to one spawned process per job)
+BACKGROUND_WORKERS = int(os.environ.get('BACKGROUND_WORKERS', 2))
+# Modules every worker imports before taking jobs
+BACKGROUND_PRELOAD = [m for m in os.environ.get('BACKGROUND_PRELOAD', 'app').split(',') if m]
+# A job whose worker died is reported as finished after this many seconds
+BACKGROUND_JOB_TIMEOUT = int(os.environ.get('BACKGROUND_JOB_TIMEOUT', 15 * 60))
+
+JOB_KEY = 'jobpool:job:{}'
+
+# Per-worker count of running jobs shared with the parent, set by _warm_worker
+_running = None
+
+
+def _warm_worker(running, preload):
+    """Pool initializer: import the app once so jobs start without import cost."""
+    global _running
+    _running = running
+    for module in preload:
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            logger.warning(f"Could not preload {module} in background worker: {e}")
+
+
+def _run_job(job_id, submitted, handle, job_fn, key, progress_key, args, context):
+    state_key = JOB_KEY.format(job_id)
+    if handle.get(state_key) != 'queued':
+        # Cancelled while waiting in the queue
+        return
+    handle.set(state_key, 'running', expire=BACKGROUND_JOB_TIMEOUT)
+    observe('background_job_wait_seconds', time.time() - submitted)
+    with _running.get_lock():
+        _running.value += 1
+    start = time.perf_counter()
+    try:
+        job_fn(key, progress_key, args, context)
+    finally:
+        with _running.get_lock():
+            _running.value -= 1
+        handle.delete(state_key)
+        observe('background_job_seconds', time.perf_counter() - start)
+        flush_metrics()
+
+
+class WarmPoolManager(DiskcacheManager):
+    """DiskcacheManager that runs jobs on pre-warmed pool workers instead of one new process each.
+
+    Job handles are ids rather than pids: cancelling a queued job drops it,
+    while a job that is already running finishes in its worker (which is
+    reused) and its result is discarded.
+    """
+
+    def __init__(self, cache, workers=None, preload=None, **kwargs):
+        super().__init__(cache, **kwargs)
+        self.workers = BACKGROUND_WORKERS if workers is None else workers
+        self.preload = BACKGROUND_PRELOAD if preload is None else preload
+        self._pool = None
+        self._running = None
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._finished = 0
+
+    def start(self):
+        """Start the pool (idempotent); workers warm up in the background."""
+        with self._lock:
+            if self._pool is not None:
+                return
+            ctx = multiprocess.get_context('spawn')
+            self._running = ctx.Value('i', 0)
+            self._pool = ctx.Pool(self.workers, initializer=_warm_worker, initargs=(self._running, self.preload))
+            atexit.register(self._pool.terminate)
+        logger.info(f"Started {self.workers} background workers preloading {self.preload}.")
+
+    def call_job_fn(self, key, job_fn, args, context):
+        self.start()
+        job_id = uuid.uuid4().hex
+        self.handle.set(JOB_KEY.format(job_id), 'queued', expire=BACKGROUND_JOB_TIMEOUT)
+        with self._lock:
+            self._submitted += 1
+        self._pool.apply_async(
+            _run_job,
+            (job_id, time.time(), self.handle, job_fn, key, self._make_progress_key(key), args, context),
+            callback=self._job_done,
+            error_callback=self._job_failed,
+        )
+        return job_id
+
+    def _job_done(self, _):
+        with self._lock:
+            self._finished += 1
+
+    def _job_failed(self, error):
+        logger.error(f"Background job failed outside the callback: {error}")
+        self._job_done(None)
+
+    def job_running(self, job):
+        return self.handle.get(JOB_KEY.format(job)) in ('queued', 'running')
+
+    def terminate_job(self, job):
+        if job is None:
+            return
+        state_key = JOB_KEY.format(job)
+        with self.handle.transact():
+            if self.handle.get(state_key) in ('queued', 'running'):
+                self.handle.set(state_key, 'cancelled', expire=BACKGROUND_JOB_TIMEOUT)
+
+    def terminate_unhealthy_job(self, job):
+        # Workers are supervised by the pool; there is no per-job process to reap
+        return False
+
+    def stats(self):
+        """Queue depth and utilisation of this process's pool."""
+        running = self._running.value if self._running is not None else 0
+        with self._lock:
+            pending = self._submitted - self._finished
+        return {
+            'workers': self.workers,
+            'running': running,
+            'queued': max(pending - running, 0),
+            'utilisation': running / self.workers if self.workers else 0.0,
+        }
@@ -0,0 +1,124 @@
+"""Timing spans aggregated into Prometheus-style histograms, plus point-in-time gauges.
+
+Refreshes run in background-callback processes and the refresh worker, and
+the web app may run several gunicorn workers, so each process accumulates
+observations locally and periodically adds them to one aggregate in the
+shared diskcache. render_prometheus() reads that aggregate for /metrics.
+"""
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from logic.dataset_cache import get_cache
+
+logger = logging.getLogger("Metrics")
+
+METRICS_KEY = 'metrics:histograms'
+# Seconds between flushes of a process's pending observations to the shared cache
+METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 5))
+# Upper bounds (seconds) of the histogram buckets; +Inf is implied
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+HELP = {
+    'refresh_stage_seconds': 'Duration of each stage of the dataset refresh pipeline.',
+    'dash_callback_seconds': 'Server-side latency of Dash callback requests, by output.',
+    'background_job_wait_seconds': 'Time background callback jobs spent queued before a worker took them.',
+    'background_job_seconds': 'Run time of background callback jobs on the worker pool.',
+}
+
+# Gauges read when /metrics is rendered, in the serving process: {name: (help, fn)}
+_gauges = {}
+
+# Observations not yet added to the shared aggregate: {(name, labels): [bucket counts..., count, sum]}
+_pending = {}
+_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def _empty():
+    return [0] * len(BUCKETS) + [0, 0.0]
+
+
+def observe(name, seconds, **labels):
+    """Record one duration for histogram `name` with the given labels."""
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        hist = _pending.setdefault(key, _empty())
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                hist[i] += 1
+        hist[-2] += 1
+        hist[-1] += seconds
+    if time.monotonic() - _last_flush >= METRICS_FLUSH_INTERVAL:
+        flush()
+
+
+@contextmanager
+def span(stage, **labels):
+    """Time the enclosed block as one refresh pipeline stage (also recorded when it raises)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe('refresh_stage_seconds', time.perf_counter() - start, stage=stage, **labels)
+
+
+def flush():
+    """Add this process's pending observations to the shared aggregate."""
+    global _pending, _last_flush
+    with _lock:
+        pending, _pending = _pending, {}
+        _last_flush = time.monotonic()
+    if not pending:
+        return
+    try:
+        with get_cache().transact():
+            totals = get_cache().get(METRICS_KEY, {})
+            for key, hist in pending.items():
+                totals[key] = [a + b for a, b in zip(totals.get(key, _empty()), hist)]
+            get_cache().set(METRICS_KEY, totals)
+    except Exception as e:
+        logger.warning(f"Could not flush {len(pending)} metric series: {e}")
+
+
+def register_gauge(name, help_text, fn):
+    """Expose the current value of `fn()` as gauge `name` on /metrics."""
+    _gauges[name] = (help_text, fn)
+
+
+def _format_labels(labels, **extra):
+    items = list(labels) + list(extra.items())
+    if not items:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in items)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(items, escaped)) + '}'
+
+
+def render_prometheus():
+    """All histograms in the Prometheus text exposition format."""
+    flush()
+    totals = get_cache().get(METRICS_KEY, {})
+    lines = []
+    for name in sorted({name for name, _ in totals}):
+        lines.append(f'# HELP {name} {HELP.get(name, name)}')
+        lines.append(f'# TYPE {name} histogram')
+        for (metric, labels), hist in sorted(totals.items()):
+            if metric != name:
+                continue
+            for bound, count in zip(BUCKETS, hist):
+                lines.append(f'{name}_bucket{_format_labels(labels, le=bound)} {count}')
+            lines.append(f'{name}_bucket{_format_labels(labels, le="+Inf")} {hist[-2]}')
+            lines.append(f'{name}_count{_format_labels(labels)} {hist[-2]}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {hist[-1]:.6f}')
+    for name, (help_text, fn) in sorted(_gauges.items()):
+        try:
+            value = float(fn())
+        except Exception as e:
+            logger.warning(f"Could not read gauge {name}: {e}")
+            continue
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} gauge')
+        lines.append(f'{name} {value:g}')
+    return '\n'.join(lines) + '\n'
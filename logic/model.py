@@ -0,0 +1,147 @@
+import logging
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+logger = logging.getLogger("Model")
+
+TARGET = 'ZAR_USD'
+
+
+def _design(df, target, predictors, lag=0):
+    """Complete rows of `df` as (dates, X with a leading intercept column, y), predictors lagged `lag` rows.
+
+    Predictors are centered and scaled over the whole sample only so the
+    cumulative sums below stay well conditioned; fits standardize again inside
+    each window (see _window_scaling), so this does not leak later data.
+    """
+    data = df[[target] + predictors]
+    if lag:
+        data = data[[target]].join(data[predictors].shift(lag))
+    data = data.dropna()
+    y = data[target].to_numpy(dtype='float64')
+    X = data[predictors].to_numpy(dtype='float64')
+    std = X.std(axis=0)
+    std[std == 0] = 1.0
+    X = (X - X.mean(axis=0)) / std
+    return data.index, np.column_stack([np.ones(len(X)), X]), y
+
+
+def _window_scaling(xtx, n_obs):
+    """Per-window maps T with [1, Z] = [1, X] @ T, Z being X standardized by that window's mean and std.
+
+    The means and variances come from the intercept row and diagonal of each
+    window's X'X, so no window is revisited.
+    """
+    mean = xtx[:, 0, 1:] / n_obs[:, None]
+    var = np.einsum('wii->wi', xtx)[:, 1:] / n_obs[:, None] - mean ** 2
+    std = np.sqrt(np.maximum(var, 0.0))
+    # A predictor constant over the window is only centered
+    std[std <= 1e-12] = 1.0
+    k = xtx.shape[1]
+    T = np.zeros_like(xtx)
+    T[:, 0, 0] = 1.0
+    T[:, 0, 1:] = -mean / std
+    T[:, np.arange(1, k), np.arange(1, k)] = 1.0 / std
+    return T
+
+
+def _normal_equations(X, y, window, expanding):
+    """X'X, X'y and y'y of every window ending at rows window-1 .. n-1, computed as stacked arrays.
+
+    Rolling windows are strided views of X multiplied in one batched matmul;
+    expanding windows are running sums of the per-row outer products.
+    """
+    if expanding:
+        xtx = np.cumsum(X[:, :, None] * X[:, None, :], axis=0)[window - 1:]
+        xty = np.cumsum(X * y[:, None], axis=0)[window - 1:]
+        yy = np.cumsum(y * y)[window - 1:]
+    else:
+        Xw = sliding_window_view(X, window, axis=0)  # (windows, k, window)
+        yw = sliding_window_view(y, window)          # (windows, window)
+        xtx = Xw @ Xw.transpose(0, 2, 1)
+        xty = (Xw @ yw[..., None])[..., 0]
+        yy = np.einsum('wi,wi->w', yw, yw)
+    return xtx, xty, yy
+
+
+def rolling_regression(df, target=TARGET, predictors=None, window=36, expanding=False,
+                       method='ols', alpha=1.0, lag=0):
+    """Fit OLS or ridge regressions of `target` on `predictors` over every rolling or expanding window.
+
+    All windows are solved together: the normal equations X'X and X'y of each
+    window are built as stacked arrays and solved as one batch. Predictors are
+    standardized with each window's own mean and std, so neither the fit nor
+    the ridge penalty sees later data. Each window's fit is then used to
+    predict the next observation of the target from that row's predictors,
+    scaled with the window's statistics. Predictors are lagged by `lag`
+    periods first: with lag 0 the prediction uses same-period predictor values
+    (a nowcast), with lag >= 1 only values known before the period (a forecast).
+
+    Returns a dict with
+      'coefficients': window-end date x [Intercept, predictors...] (per window std. dev. of each predictor),
+      'window_stats': n_obs, in-sample r2 and resid_std per window,
+      'forecasts':    actual, forecast and error for each next period,
+      'summary':      windows, rmse, mae, mean_r2,
+    or None when there are not enough complete rows for one window.
+    """
+    if method not in ('ols', 'ridge'):
+        raise ValueError(f"Unknown regression method '{method}' (expected 'ols' or 'ridge').")
+    if predictors is None:
+        predictors = [c for c in df.columns if c != target]
+
+    dates, X, y = _design(df, target, list(predictors), lag)
+    n, k = X.shape
+    window = max(int(window), k + 1)
+    if n < window:
+        logger.warning(f"Not enough complete rows ({n}) for a {window}-period window.")
+        return None
+
+    ends = np.arange(window, n + 1)
+    starts = np.zeros_like(ends) if expanding else ends - window
+    n_obs = ends - starts
+
+    xtx, xty, yy = _normal_equations(X, y, window, expanding)
+    # Re-express each window's equations in its own standardized predictors
+    T = _window_scaling(xtx, n_obs)
+    xtx = T.transpose(0, 2, 1) @ xtx @ T
+    xty = np.einsum('wji,wj->wi', T, xty)
+
+    if method == 'ridge':
+        # The intercept is not penalized
+        penalty = np.diag(np.r_[0.0, np.full(k - 1, float(alpha))])
+        beta = np.linalg.solve(xtx + penalty, xty[..., None])[..., 0]
+    else:
+        try:
+            beta = np.linalg.solve(xtx, xty[..., None])[..., 0]
+        except np.linalg.LinAlgError:
+            # Some window has a constant predictor (singular X'X): minimum-norm solution instead
+            beta = np.einsum('wij,wj->wi', np.linalg.pinv(xtx), xty)
+
+    rss = yy - 2 * np.einsum('wi,wi->w', beta, xty) + np.einsum('wi,wij,wj->w', beta, xtx, beta, optimize=True)
+    rss = np.maximum(rss, 0.0)
+    tss = yy - xty[:, 0] ** 2 / n_obs
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r2 = np.where(tss > 0, 1 - rss / tss, np.nan)
+        resid_std = np.sqrt(rss / np.maximum(n_obs - k, 1))
+
+    # Window ending at row t predicts row t + 1, standardized with the window's statistics
+    next_rows = np.einsum('wj,wji->wi', X[ends[:-1]], T[:-1])
+    forecast = np.einsum('wi,wi->w', beta[:-1], next_rows)
+    actual = y[ends[:-1]]
+    error = actual - forecast
+
+    window_dates = dates[ends - 1]
+    return {
+        'coefficients': pd.DataFrame(beta, index=window_dates, columns=['Intercept'] + list(predictors)),
+        'window_stats': pd.DataFrame({'n_obs': n_obs, 'r2': r2, 'resid_std': resid_std}, index=window_dates),
+        'forecasts': pd.DataFrame({'actual': actual, 'forecast': forecast, 'error': error},
+                                  index=dates[ends[:-1]]),
+        'summary': {
+            'windows': len(ends),
+            'rmse': float(np.sqrt(np.mean(error ** 2))) if len(error) else float('nan'),
+            'mae': float(np.mean(np.abs(error))) if len(error) else float('nan'),
+            'mean_r2': float(np.nanmean(r2)) if np.isfinite(r2).any() else float('nan'),
+        },
+    }
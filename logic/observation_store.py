@@ -0,0 +1,125 @@
+import os
+import sqlite3
+import logging
+from contextlib import closing
+
+import pandas as pd
+
+logger = logging.getLogger("ObservationStore")
+
+# Default on-disk location of the per-series observation cache
+OBSERVATION_STORE_PATH = os.environ.get('OBSERVATION_STORE_PATH', os.path.join('.cache', 'observations.sqlite'))
+
+
+class ObservationStore:
+    """SQLite-backed store of raw observations keyed by upstream series id.
+
+    Each series keeps the earliest date it has been fetched from, so callers
+    can tell whether the cached history covers a requested start date, and
+    the date/value pairs themselves. File downloads (such as the World Bank
+    workbook) can also record their HTTP validators for conditional requests.
+    Connections are opened per call, so a single store can be shared by the
+    FRED fetch thread pool.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or OBSERVATION_STORE_PATH
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS series ("
+                "series_id TEXT PRIMARY KEY, observation_start TEXT NOT NULL, updated_at TEXT NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS observations ("
+                "series_id TEXT NOT NULL, date TEXT NOT NULL, value REAL, "
+                "PRIMARY KEY (series_id, date)) WITHOUT ROWID"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS downloads ("
+                "source_id TEXT PRIMARY KEY, url TEXT, etag TEXT, last_modified TEXT, checked_at TEXT NOT NULL)"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def coverage(self, series_id):
+        """Return (observation_start, last_date) for a cached series, or None if it is not cached."""
+        with closing(self._connect()) as conn:
+            meta = conn.execute(
+                "SELECT observation_start FROM series WHERE series_id = ?", (series_id,)
+            ).fetchone()
+            if meta is None:
+                return None
+            last = conn.execute(
+                "SELECT MAX(date) FROM observations WHERE series_id = ?", (series_id,)
+            ).fetchone()[0]
+        if last is None:
+            return None
+        return pd.Timestamp(meta[0]), pd.Timestamp(last)
+
+    def upsert(self, series_id, series, observation_start):
+        """Write a date-indexed series and return the number of rows inserted or changed."""
+        dates = pd.to_datetime(series.index).strftime('%Y-%m-%d')
+        values = pd.to_numeric(series, errors='coerce').astype('float64')
+        rows = [
+            (series_id, d, None if pd.isna(v) else float(v))
+            for d, v in zip(dates, values.to_numpy())
+        ]
+        start = pd.Timestamp(observation_start).strftime('%Y-%m-%d')
+        now = pd.Timestamp.now(tz='UTC').isoformat()
+
+        with closing(self._connect()) as conn, conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT INTO observations (series_id, date, value) VALUES (?, ?, ?) "
+                "ON CONFLICT (series_id, date) DO UPDATE SET value = excluded.value "
+                "WHERE observations.value IS NOT excluded.value",
+                rows
+            )
+            written = conn.total_changes - before
+            conn.execute(
+                "INSERT INTO series (series_id, observation_start, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (series_id) DO UPDATE SET updated_at = excluded.updated_at, "
+                "observation_start = MIN(series.observation_start, excluded.observation_start)",
+                (series_id, start, now)
+            )
+        return written
+
+    def load(self, series_id, start_date=None):
+        """Return the cached observations for a series as a float Series indexed by date."""
+        query = "SELECT date, value FROM observations WHERE series_id = ?"
+        params = [series_id]
+        if start_date is not None:
+            query += " AND date >= ?"
+            params.append(pd.Timestamp(start_date).strftime('%Y-%m-%d'))
+        query += " ORDER BY date"
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query, params).fetchall()
+        if not rows:
+            return pd.Series(dtype='float64')
+        dates, values = zip(*rows)
+        return pd.Series(values, index=pd.DatetimeIndex(dates), dtype='float64')
+
+    def get_download(self, source_id):
+        """Return the cached url, etag, last_modified and checked_at (UTC) of a download, or None."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT url, etag, last_modified, checked_at FROM downloads WHERE source_id = ?", (source_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'url': row[0], 'etag': row[1], 'last_modified': row[2], 'checked_at': pd.Timestamp(row[3])}
+
+    def set_download(self, source_id, url, etag=None, last_modified=None, checked_at=None):
+        """Record the resolved URL and HTTP validators of a download, checked at `checked_at` (default now)."""
+        checked_at = (pd.Timestamp.now(tz='UTC') if checked_at is None else pd.Timestamp(checked_at)).isoformat()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO downloads (source_id, url, etag, last_modified, checked_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (source_id) DO UPDATE SET url = excluded.url, etag = excluded.etag, "
+                "last_modified = excluded.last_modified, checked_at = excluded.checked_at",
+                (source_id, url, etag, last_modified, checked_at)
+            )
@@ -0,0 +1,229 @@
+"""Monthly and daily panel construction from raw, irregularly dated series.
+
+All series are aligned in one pass onto pre-sized NumPy arrays indexed by
+period ordinal (months: year * 12 + month - 1; business days: business days
+since 1970-01-01): the last valid observation of each period wins, then each
+column is filled according to its policy. The steps are plain functions so
+callers can compose them (see build_panel).
+
+The daily (business-day) panel is the master copy kept in float32; weekly,
+monthly and quarterly views of it are aggregated on demand and cached per
+dataset version (see get_view).
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+
+from logic.dataset_cache import get_derived
+
+logger = logging.getLogger("Panel")
+
+# Per-series fill policies for months without an observation
+#   ffill:       carry the last observation forward (default)
+#   none:        leave the month missing
+#   interpolate: linear between the surrounding observations (interior gaps only)
+FILL_POLICIES = ('ffill', 'none', 'interpolate')
+
+# On-demand views of the daily panel: resample rule per frequency, and the aggregations offered
+VIEW_FREQUENCIES = {'D': None, 'W': 'W-FRI', 'M': 'ME', 'Q': 'QE'}
+VIEW_AGGREGATIONS = ('last', 'mean', 'max')
+
+_EPOCH = np.datetime64('1970-01-01', 'D')
+
+
+def month_ordinals(index):
+    """Month ordinal (year * 12 + month - 1) of every timestamp in `index`."""
+    months = pd.DatetimeIndex(index).to_numpy().astype('datetime64[M]').astype('int64')
+    # datetime64[M] counts months from 1970-01
+    return months + 1970 * 12
+
+
+def month_end_index(first, last, unit='ns'):
+    """Month-end DatetimeIndex named 'Date' for ordinals first..last inclusive."""
+    months = (np.arange(first, last + 1) - 1970 * 12).astype('datetime64[M]')
+    ends = (months + 1).astype('datetime64[D]') - 1
+    return pd.DatetimeIndex(ends, name='Date').as_unit(unit)
+
+
+def business_day_ordinals(index):
+    """Business-day ordinal of every timestamp in `index`; weekend dates roll back to Friday."""
+    days = pd.DatetimeIndex(index).to_numpy().astype('datetime64[D]')
+    return np.busday_count(_EPOCH, days + 1).astype('int64') - 1
+
+
+def month_end_dates(index):
+    """Last calendar day of the month of every timestamp in `index`."""
+    months = pd.DatetimeIndex(index).to_numpy().astype('datetime64[M]')
+    return pd.DatetimeIndex((months + 1).astype('datetime64[D]') - 1)
+
+
+def business_day_index(first, last, unit='ns'):
+    """Business-day DatetimeIndex named 'Date' for ordinals first..last inclusive."""
+    days = np.busday_offset(_EPOCH, np.arange(first, last + 1), roll='forward')
+    return pd.DatetimeIndex(days, name='Date').as_unit(unit)
+
+
+# Period kinds build_panel aligns onto: (ordinals of dates, index of ordinals)
+PERIODS = {
+    'M': (month_ordinals, month_end_index),
+    'B': (business_day_ordinals, business_day_index),
+}
+
+
+def align_periods(values, ordinals, first, n_periods):
+    """Last non-missing value of each column per period, as an (n_periods, columns) array.
+
+    `values` is a rows x columns float array whose rows are in date order and
+    `ordinals` the period ordinal of each row. Periods without a value are NaN.
+    """
+    out = np.full((n_periods, values.shape[1]), np.nan)
+    if not len(values):
+        return out
+    # Running index of the last valid row of each column (-1 before the first)
+    latest = np.where(~np.isnan(values), np.arange(len(values))[:, None], -1)
+    np.maximum.accumulate(latest, axis=0, out=latest)
+    # The last row of each period that has rows; its running index is the period's pick
+    # when that row falls in the same period
+    period_ends = np.flatnonzero(np.diff(ordinals, append=ordinals[-1] + 1))
+    periods = ordinals[period_ends]
+    pick = latest[period_ends]
+    found = (pick >= 0) & (ordinals[np.maximum(pick, 0)] == periods[:, None])
+    block = np.take_along_axis(values, np.maximum(pick, 0), axis=0)
+    out[periods - first] = np.where(found, block, np.nan)
+    return out
+
+
+def ffill(block):
+    """Forward-fill every column of a 2-D array down the rows."""
+    n = block.shape[0]
+    positions = np.where(~np.isnan(block), np.arange(n)[:, None], 0)
+    np.maximum.accumulate(positions, axis=0, out=positions)
+    return np.take_along_axis(block, positions, axis=0)
+
+
+def interpolate(block):
+    """Linearly interpolate interior gaps of every column; leading and trailing gaps stay missing."""
+    out = block.copy()
+    steps = np.arange(block.shape[0])
+    for j in range(block.shape[1]):
+        valid = ~np.isnan(block[:, j])
+        if valid.sum() < 2:
+            continue
+        known = steps[valid]
+        inside = slice(known[0], known[-1] + 1)
+        out[inside, j] = np.interp(steps[inside], known, block[valid, j])
+    return out
+
+
+def apply_fill(panel, policies):
+    """Fill each column of a monthly array with its policy ('ffill', 'none' or 'interpolate')."""
+    policies = np.asarray(policies)
+    unknown = set(policies) - set(FILL_POLICIES)
+    if unknown:
+        raise ValueError(f"Unknown fill policies {sorted(unknown)} (expected one of {FILL_POLICIES}).")
+    for policy, fill in (('ffill', ffill), ('interpolate', interpolate)):
+        cols = np.flatnonzero(policies == policy)
+        if len(cols):
+            panel[:, cols] = fill(panel[:, cols])
+    return panel
+
+
+def build_panel(raw, columns, fill=None, start_date=None, end_date=None, required=(), freq='M',
+                dtype='float64', month_dated=()):
+    """Align the `columns` of the date-indexed frame `raw` into one panel of `freq` periods.
+
+    `freq` is 'M' (month-end dates) or 'B' (business days). Each period takes
+    the last valid observation of each series, gaps are filled per `fill`
+    ({column: policy}, default 'ffill') before the panel is cut to
+    [start_date, end_date], and periods missing any `required` column are
+    dropped. Columns absent from `raw` are skipped; values are `dtype`.
+
+    Observations of `month_dated` columns (monthly or coarser series, whose
+    sources date them anywhere in the month) count from the end of their
+    month, or from the last date in `raw` during the current month. With 'B'
+    every such series then changes on the same day, and the month-end rows
+    match the 'M' panel.
+    """
+    fill = fill or {}
+    to_ordinals, to_index = PERIODS[freq]
+    columns = [c for c in columns if c in raw.columns]
+    if raw.empty or not columns:
+        return pd.DataFrame(columns=columns, index=pd.DatetimeIndex([], name='Date'), dtype=dtype)
+
+    dates = pd.DatetimeIndex(raw.index)
+    # One float copy of the whole frame; selecting columns first would copy block by block
+    positions = raw.columns.get_indexer(columns)
+    values = raw.to_numpy(dtype='float64', na_value=np.nan)[:, positions]
+    ordinals = to_ordinals(dates)
+    if not dates.is_monotonic_increasing:
+        order = np.argsort(dates.to_numpy(), kind='stable')
+        dates, values, ordinals = dates[order], values[order], ordinals[order]
+    first, last = int(ordinals[0]), int(ordinals[-1])
+
+    by_month = np.isin(columns, list(month_dated))
+    panel = np.empty((last - first + 1, len(columns)))
+    panel[:, ~by_month] = align_periods(values[:, ~by_month], ordinals, first, last - first + 1)
+    if by_month.any():
+        # Month-end periods, but no later than the last date in `raw` (the current month so far)
+        month_end = np.minimum(to_ordinals(month_end_dates(dates)), last)
+        panel[:, by_month] = align_periods(values[:, by_month], month_end, first, last - first + 1)
+    panel = apply_fill(panel, [fill.get(c, 'ffill') for c in columns])
+
+    # Cut to the requested periods only after filling, so earlier observations carry in
+    # (a period is in range when its date is)
+    lo, hi = first, last
+    if start_date is not None:
+        start = pd.Timestamp(start_date)
+        period = int(to_ordinals([start])[0])
+        lo = max(lo, period if to_index(period, period)[0] >= start else period + 1)
+    if end_date is not None:
+        end = pd.Timestamp(end_date)
+        period = int(to_ordinals([end])[0])
+        hi = min(hi, period if to_index(period, period)[0] <= end else period - 1)
+    unit = dates.unit
+    if hi < lo:
+        return pd.DataFrame(columns=columns, index=to_index(0, -1, unit), dtype=dtype)
+    panel = panel[lo - first:hi - first + 1]
+    index = to_index(lo, hi, unit)
+
+    keep = [columns.index(c) for c in required if c in columns]
+    if keep:
+        rows = ~np.isnan(panel[:, keep]).any(axis=1)
+        panel, index = panel[rows], index[rows]
+    return pd.DataFrame(panel.astype(dtype, copy=False), index=index, columns=columns)
+
+
+def series_metadata(config, columns=None):
+    """Per-series descriptors (source, frequency, fill policy) with categorical columns, indexed by name."""
+    columns = list(config) if columns is None else [c for c in columns if c in config]
+    meta = pd.DataFrame({
+        'label': [config[c].get('label', c) for c in columns],
+        'source': [config[c]['source'] for c in columns],
+        'frequency': [config[c].get('frequency', 'monthly') for c in columns],
+        'fill': [config[c].get('fill', 'ffill') for c in columns],
+    }, index=pd.Index(columns, name='series'))
+    for col in ('source', 'frequency', 'fill'):
+        meta[col] = meta[col].astype('category')
+    return meta
+
+
+def aggregate(daily, freq='M', how='last'):
+    """View of a daily panel at `freq` ('D', 'W', 'M' or 'Q'), each period reduced with `how`."""
+    if freq not in VIEW_FREQUENCIES:
+        raise ValueError(f"Unknown frequency {freq!r} (expected one of {tuple(VIEW_FREQUENCIES)}).")
+    if how not in VIEW_AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation {how!r} (expected one of {VIEW_AGGREGATIONS}).")
+    rule = VIEW_FREQUENCIES[freq]
+    if rule is None or daily.empty:
+        return daily
+    view = daily.resample(rule).agg(how).dropna(how='all')
+    view.index.name = 'Date'
+    return view.astype(daily.dtypes.to_dict(), copy=False)
+
+
+def get_view(daily, freq='M', how='last', version=None):
+    """aggregate() cached in the shared diskcache per dataset version (uncached without one)."""
+    if version is None or VIEW_FREQUENCIES.get(freq) is None:
+        return aggregate(daily, freq, how)
+    return get_derived('panel_view', version, lambda: aggregate(daily, freq, how), freq, how)
@@ -0,0 +1,156 @@
+"""Coalesced progress reporting for background callbacks, with a server-sent-events channel.
+
+ThrottledProgress wraps any progress sink so that at most one update per
+PROGRESS_MIN_INTERVAL is written; updates in between are coalesced and only
+the latest is delivered when the interval ends. With PROGRESS_TRANSPORT=sse
+the updates go to a per-fetch channel in the shared diskcache that
+/progress/<channel> streams to the browser as they change, instead of going
+through the background callback manager's polled progress key.
+"""
+import json
+import os
+import re
+import threading
+import time
+
+from logic.dataset_cache import DATASET_REFRESH_TIMEOUT, get_cache
+
+# 'poll': progress outputs of the background callback; 'sse': pushed over /progress/<channel>
+PROGRESS_TRANSPORT = os.environ.get('PROGRESS_TRANSPORT', 'poll')
+# Minimum seconds between two progress writes
+PROGRESS_MIN_INTERVAL = float(os.environ.get('PROGRESS_MIN_INTERVAL', 0.25))
+# How often an open event stream checks its channel right after a new value; the
+# interval doubles while the value stays the same, up to PROGRESS_SSE_MAX_POLL
+PROGRESS_SSE_POLL = float(os.environ.get('PROGRESS_SSE_POLL', 0.5))
+PROGRESS_SSE_MAX_POLL = float(os.environ.get('PROGRESS_SSE_MAX_POLL', 4.0))
+# Event streams one web process serves at once, so they cannot take every request
+# thread (gunicorn.conf.py runs 8 per worker); further requests are refused
+PROGRESS_SSE_MAX_STREAMS = int(os.environ.get('PROGRESS_SSE_MAX_STREAMS', 4))
+# Comment lines sent on an idle stream so proxies keep it open
+PROGRESS_SSE_KEEPALIVE = 15
+
+PROGRESS_KEY = 'progress:{}'
+CHANNEL_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+
+class ThrottledProgress:
+    """Progress sink wrapper writing at most once per `interval`; the latest value wins.
+
+    Calls inside the interval only replace the pending value, which a timer
+    delivers when the interval ends. `final=True` writes immediately and
+    drops anything pending. `writes` counts the values actually delivered.
+    """
+
+    def __init__(self, emit, interval=None):
+        self._emit = emit
+        self.interval = PROGRESS_MIN_INTERVAL if interval is None else interval
+        self._lock = threading.Lock()
+        self._pending = None
+        self._timer = None
+        self._last = float('-inf')
+        self.writes = 0
+
+    def __call__(self, value, final=False):
+        with self._lock:
+            elapsed = time.monotonic() - self._last
+            if final or elapsed >= self.interval:
+                self._cancel()
+                self._write(value)
+                return
+            self._pending = value
+            if self._timer is None:
+                self._timer = threading.Timer(self.interval - elapsed, self._flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _write(self, value):
+        # Under the lock, so a timer flush can never overtake a later final value
+        self._pending = None
+        self._last = time.monotonic()
+        self.writes += 1
+        self._emit(value)
+
+    def _cancel(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _flush(self):
+        with self._lock:
+            self._timer = None
+            if self._pending is not None:
+                self._write(self._pending)
+
+    def close(self):
+        """Deliver any pending value now."""
+        with self._lock:
+            self._cancel()
+            if self._pending is not None:
+                self._write(self._pending)
+
+
+def valid_channel(channel):
+    """Whether `channel` is a well-formed channel id (a uuid4 hex string)."""
+    return bool(channel) and bool(CHANNEL_PATTERN.match(channel))
+
+
+def publish(channel, value, done=False):
+    """Make `value` the current progress of `channel`; `done` ends the stream."""
+    key = PROGRESS_KEY.format(channel)
+    seq = (get_cache().get(key) or {}).get('seq', 0) + 1
+    get_cache().set(key, {'seq': seq, 'value': list(value), 'done': done}, expire=DATASET_REFRESH_TIMEOUT)
+
+
+def stream(channel, timeout=None):
+    """Server-sent events for `channel`: one 'data:' event per new value, ending after the done event."""
+    key = PROGRESS_KEY.format(channel)
+    deadline = time.monotonic() + (DATASET_REFRESH_TIMEOUT if timeout is None else timeout)
+    seen = 0
+    last_sent = time.monotonic()
+    delay = PROGRESS_SSE_POLL
+    yield 'retry: 1000\n\n'
+    while time.monotonic() < deadline:
+        state = get_cache().get(key)
+        if state is not None and state['seq'] != seen:
+            seen = state['seq']
+            last_sent = time.monotonic()
+            delay = PROGRESS_SSE_POLL
+            yield f"data: {json.dumps({'value': state['value'], 'done': state['done']})}\n\n"
+            if state['done']:
+                return
+        else:
+            if time.monotonic() - last_sent >= PROGRESS_SSE_KEEPALIVE:
+                last_sent = time.monotonic()
+                yield ': keepalive\n\n'
+            delay = min(delay * 2, PROGRESS_SSE_MAX_POLL)
+        time.sleep(delay)
+
+
+_stream_slots = threading.BoundedSemaphore(PROGRESS_SSE_MAX_STREAMS)
+
+
+class EventStream:
+    """stream() events for one response, holding a stream slot until the response is closed."""
+
+    def __init__(self, channel, timeout=None):
+        self._events = stream(channel, timeout)
+        self._lock = threading.Lock()
+        self._open = True
+
+    def __iter__(self):
+        return self._events
+
+    def close(self):
+        with self._lock:
+            if not self._open:
+                return
+            self._open = False
+        self._events.close()
+        _stream_slots.release()
+
+
+def open_stream(channel, timeout=None):
+    """An EventStream for `channel`, or None when PROGRESS_SSE_MAX_STREAMS are already open in this process."""
+    if not _stream_slots.acquire(blocking=False):
+        return None
+    return EventStream(channel, timeout)
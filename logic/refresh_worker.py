@@ -0,0 +1,110 @@
+"""Scheduled refresh worker.
+
+Runs the fetch/process/save workflow outside the Dash request path, fetching
+each series on a cadence matched to its release frequency, and publishes the
+result to Supabase (and the local dataset cache) so web workers only read.
+
+Run with `python -m logic.refresh_worker` (see the `worker` entry in the
+Procfile), or `python -m logic.refresh_worker --once` for a single pass.
+Wherever the worker runs, the web processes need REFRESH_WORKER_ENABLED=1
+(the Procfile sets it) so they read its output instead of fetching upstream.
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+from dotenv import load_dotenv
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Before any project import: logic modules read their settings from the environment at import time
+load_dotenv()
+
+from logic.data_fetcher import SERIES_CONFIG, fetch_and_save_data
+from logic.dataset_cache import store_dataset
+from logic.metrics import flush as flush_metrics
+
+logger = logging.getLogger("RefreshWorker")
+
+# Seconds between upstream checks for each release frequency
+REFRESH_INTERVALS = {
+    'daily': int(os.environ.get('REFRESH_INTERVAL_DAILY', 4 * 3600)),
+    'weekly': int(os.environ.get('REFRESH_INTERVAL_WEEKLY', 24 * 3600)),
+    'monthly': int(os.environ.get('REFRESH_INTERVAL_MONTHLY', 24 * 3600)),
+    'quarterly': int(os.environ.get('REFRESH_INTERVAL_QUARTERLY', 7 * 24 * 3600)),
+}
+# Retry delay for series whose fetch failed
+REFRESH_RETRY_DELAY = int(os.environ.get('REFRESH_RETRY_DELAY', 15 * 60))
+
+
+def _interval(name):
+    return REFRESH_INTERVALS.get(SERIES_CONFIG[name].get('frequency', 'monthly'), REFRESH_INTERVALS['monthly'])
+
+
+def due_series(last_refreshed, now=None):
+    """Names of upstream series whose refresh interval has elapsed."""
+    now = time.time() if now is None else now
+    return {
+        name for name, cfg in SERIES_CONFIG.items()
+        if cfg['source'] != 'HARDCODED' and now - last_refreshed.get(name, 0) >= _interval(name)
+    }
+
+
+def run_once(refresh=None):
+    """Refresh the given series (all when None), save to Supabase and publish to the dataset cache.
+
+    Returns the names of the series that came back from upstream (empty when
+    nothing could be fetched).
+    """
+    try:
+        result = fetch_and_save_data(refresh=refresh)
+        if not result:
+            return set()
+        store_dataset(result['data'], daily=result['daily'], save=result['save'],
+                      source_timings=result['source_timings'], source='worker')
+        logger.info(f"Published dataset with {len(result['data'])} rows.")
+        return set(result['refreshed'])
+    finally:
+        flush_metrics()
+
+
+def run_forever():
+    """Loop forever, refreshing due series and sleeping until the next one is due.
+
+    A series whose fetch failed is due again after REFRESH_RETRY_DELAY rather
+    than a full interval.
+    """
+    last_refreshed = {}
+    while True:
+        now = time.time()
+        due = due_series(last_refreshed, now)
+        if due:
+            logger.info(f"Refreshing {len(due)} due series: {sorted(due)}")
+            try:
+                refreshed = run_once(refresh=due) & due
+            except Exception as e:
+                logger.error(f"Refresh pass failed: {e}")
+                refreshed = set()
+            last_refreshed.update({name: now for name in refreshed})
+            failed = due - refreshed
+            if failed:
+                logger.warning(f"{len(failed)} series not refreshed, retrying in {REFRESH_RETRY_DELAY}s: "
+                               f"{sorted(failed)}")
+                last_refreshed.update({name: now + REFRESH_RETRY_DELAY - _interval(name) for name in failed})
+
+        next_due = min(last_refreshed.get(name, 0) + _interval(name) for name in SERIES_CONFIG
+                       if SERIES_CONFIG[name]['source'] != 'HARDCODED')
+        time.sleep(max(1.0, next_due - time.time()))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scheduled data refresh worker")
+    parser.add_argument("--once", action="store_true", help="Refresh every series once and exit.")
+    args = parser.parse_args()
+
+    if args.once:
+        sys.exit(0 if run_once() else 1)
+    run_forever()
@@ -0,0 +1,105 @@
+import json
+import re
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
+# Characters that force a string value through the per-value JSON encoder
+_NEEDS_ESCAPE = re.compile(r'["\\\x00-\x1f]')
+
+
+def dumps(obj):
+    """Encode an object to JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def _split_array(encoded):
+    """Split an encoded flat JSON array of numbers/nulls into one literal per element."""
+    body = encoded[1:-1]
+    return body.split(b',') if body else []
+
+
+def _quote_strings(values, present):
+    """Quote a list of strings that need no escaping, in one join/split instead of per value."""
+    joined = ('"' + '"\x00"'.join(values) + '"').encode('utf-8')
+    literals = np.array(joined.split(b'\x00'), dtype=object)
+    literals[~present] = b'null'
+    return literals
+
+
+def _column_to_json(series, date_format):
+    """Encode a whole column to JSON value literals (one bytes object per row), with null for missing values."""
+    present = series.notna().to_numpy()
+
+    if pd.api.types.is_datetime64_any_dtype(series):
+        text = series.dt.strftime(date_format).fillna('').tolist()
+        return _quote_strings(text, present)
+
+    if pd.api.types.is_bool_dtype(series):
+        literals = np.where(series.fillna(False).to_numpy(dtype=bool), b'true', b'false').astype(object)
+        literals[~present] = b'null'
+        return literals
+
+    if pd.api.types.is_integer_dtype(series):
+        values = np.ascontiguousarray(series.to_numpy(dtype='int64', na_value=0))
+        literals = np.array(_split_array(dumps(values) if orjson is not None else dumps(values.tolist())),
+                            dtype=object)
+        literals[~present] = b'null'
+        return literals
+
+    if pd.api.types.is_numeric_dtype(series):
+        # Columns of a 2-D block come back as strided views; orjson needs C-contiguous input
+        values = np.ascontiguousarray(series.to_numpy(dtype='float64', na_value=np.nan))
+        if orjson is not None:
+            # orjson writes NaN/inf as null and floats with the shortest round-trip repr
+            encoded = orjson.dumps(values, option=orjson.OPT_SERIALIZE_NUMPY)
+        else:
+            cleaned = np.where(np.isfinite(values), values, None).tolist()
+            encoded = json.dumps(cleaned, separators=(',', ':')).encode('utf-8')
+        return np.array(_split_array(encoded), dtype=object)
+
+    text = series.astype(str).where(present, '').tolist()
+    if not _NEEDS_ESCAPE.search(''.join(text)):
+        return _quote_strings(text, present)
+    literals = np.array([dumps(v) for v in series.where(present, None).tolist()], dtype=object)
+    return literals
+
+
+def to_json_rows(df, columns=None, date_format='%Y-%m-%d'):
+    """Encode `df` as JSON objects, working column by column.
+
+    Column selection, NaN/NaT -> null and date formatting all happen on whole
+    columns. The result is an (n_rows, n_pieces) object array of byte pieces
+    that concatenate to one '{...},' fragment per row; slice it by rows to
+    chunk a payload and pass the slice to json_array().
+    """
+    columns = [c for c in (columns or df.columns) if c in df.columns]
+    if df.empty or not columns:
+        return np.empty((0, 0), dtype=object)
+
+    pieces = np.empty((len(df), 2 * len(columns) + 1), dtype=object)
+    for i, col in enumerate(columns):
+        key = json.dumps(str(col)).encode('utf-8') + b':'
+        pieces[:, 2 * i] = (b'{' if i == 0 else b',') + key
+        pieces[:, 2 * i + 1] = _column_to_json(df[col], date_format)
+    pieces[:, -1] = b'},'
+    return pieces
+
+
+def json_array(rows):
+    """Join row pieces from to_json_rows() into a JSON array body (bytes)."""
+    if len(rows) == 0:
+        return b'[]'
+    return b'[' + b''.join(rows.ravel())[:-1] + b']'
+
+
+def frame_to_json(df, columns=None, date_format='%Y-%m-%d'):
+    """Encode a DataFrame as a JSON array of records (bytes)."""
+    return json_array(to_json_rows(df, columns=columns, date_format=date_format))
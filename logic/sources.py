@@ -0,0 +1,138 @@
+"""Registry of data-source adapters and the orchestrator that runs them concurrently.
+
+Each value of SERIES_CONFIG[...]['source'] names an adapter registered with
+@register_source. An adapter implements one coroutine,
+
+    async fetch(series, since, progress=None) -> DataFrame
+
+where `series` maps unified series names to their SERIES_CONFIG entries and
+the returned frame has one column per fetched series, named by those keys.
+`progress(msg)`, if given, may be called once per completed series.
+fetch_all() groups the configured series by source, runs every adapter at
+once and merges their frames with a single concat, so a refresh takes as
+long as the slowest source rather than the sum of all of them.
+"""
+import asyncio
+import logging
+import threading
+import time
+
+import pandas as pd
+
+from logic.metrics import observe
+
+logger = logging.getLogger("Sources")
+
+# Pseudo-source serving series from the local ObservationStore instead of upstream
+STORE_SOURCE = 'STORE'
+
+SOURCE_ADAPTERS = {}
+
+
+def register_source(name):
+    """Class decorator registering an adapter class under a SERIES_CONFIG source name."""
+    def decorator(cls):
+        SOURCE_ADAPTERS[name] = cls
+        return cls
+    return decorator
+
+
+class SourceAdapter:
+    """Base class for adapters. Blocking clients implement fetch_sync() and run on a worker thread."""
+
+    # Adapters without upstream I/O (e.g. hardcoded series) are never redirected to the store
+    local = False
+
+    async def fetch(self, series, since, progress=None):
+        return await asyncio.to_thread(self.fetch_sync, series, since, progress)
+
+    def fetch_sync(self, series, since, progress=None):
+        raise NotImplementedError
+
+
+def _group_by_source(series_config, refresh):
+    """{source: {name: cfg}}, routing series outside `refresh` to the store."""
+    groups = {}
+    for name, cfg in series_config.items():
+        source = cfg['source']
+        adapter = SOURCE_ADAPTERS.get(source)
+        if adapter is None:
+            logger.error(f"No adapter registered for source '{source}' (series {name}); skipping it.")
+            continue
+        if refresh is not None and name not in refresh and not adapter.local:
+            source = STORE_SOURCE
+        groups.setdefault(source, {})[name] = cfg
+    return groups
+
+
+async def _run_sources(groups, since, progress_callback):
+    total = sum(len(series) for series in groups.values())
+    completed = {source: 0 for source in groups}
+    lock = threading.Lock()
+
+    def report(source, msg, finished=False):
+        # Called from adapter threads as series complete and once per source at the end
+        if not progress_callback:
+            return
+        with lock:
+            completed[source] = len(groups[source]) if finished else min(completed[source] + 1,
+                                                                          len(groups[source]))
+            percent = int(sum(completed.values()) / total * 100)
+        progress_callback(percent, msg)
+
+    async def run(source, series):
+        start = time.perf_counter()
+        try:
+            frame = await SOURCE_ADAPTERS[source]().fetch(series, since,
+                                                          progress=lambda msg: report(source, msg))
+        except Exception as e:
+            logger.error(f"Error fetching {len(series)} series from {source}: {e}")
+            frame = pd.DataFrame()
+        elapsed = time.perf_counter() - start
+        observe('refresh_stage_seconds', elapsed, stage='source', source=source)
+        report(source, f"{source}: {frame.shape[1]} of {len(series)} series in {elapsed:.1f}s", finished=True)
+        return frame, elapsed
+
+    results = await asyncio.gather(*(run(source, series) for source, series in groups.items()))
+    return dict(zip(groups, results))
+
+
+def fetch_all(series_config, since='2018-01-31', refresh=None, progress_callback=None):
+    """Fetch every series in `series_config` through its source adapter, all sources concurrently.
+
+    `refresh` optionally names the series to fetch from upstream; the others
+    are read from the local ObservationStore. Returns the raw frame with the
+    columns in configuration order; `attrs['source_timings']` holds the
+    seconds spent per source and `attrs['refreshed']` the names of the series
+    that came back from their source. Series whose source failed are read from
+    the ObservationStore instead, so the panel keeps their last known values.
+    """
+    groups = _group_by_source(series_config, refresh)
+    if progress_callback:
+        progress_callback(0, f"Fetching {sum(map(len, groups.values()))} series from {len(groups)} sources...")
+    start = time.perf_counter()
+    results = asyncio.run(_run_sources(groups, since, progress_callback))
+
+    timings = {source: round(elapsed, 3) for source, (_, elapsed) in results.items()}
+    logger.info(f"Fetched {len(groups)} sources in {time.perf_counter() - start:.2f}s "
+                f"({', '.join(f'{s} {t:.2f}s' for s, t in timings.items())}).")
+
+    frames = [frame for frame, _ in results.values() if not frame.empty]
+    refreshed = sorted({name for source, (frame, _) in results.items() if source != STORE_SOURCE
+                        for name in frame.columns if frame[name].notna().any()})
+    failed = {name: cfg for source, series in groups.items() if source != STORE_SOURCE
+              for name, cfg in series.items() if name not in refreshed and not SOURCE_ADAPTERS[source].local}
+    if failed and STORE_SOURCE in SOURCE_ADAPTERS:
+        logger.warning(f"Using stored observations for {len(failed)} series that failed upstream: {sorted(failed)}")
+        try:
+            frames.append(SOURCE_ADAPTERS[STORE_SOURCE]().fetch_sync(failed, since))
+        except Exception as e:
+            logger.error(f"Error reading stored observations: {e}")
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+    raw_df = pd.concat(frames, axis=1, sort=True)
+    raw_df = raw_df[[name for name in series_config if name in raw_df.columns]]
+    raw_df.attrs['source_timings'] = timings
+    raw_df.attrs['refreshed'] = refreshed
+    return raw_df
@@ -1,19 +1,53 @@
 import os
-from supabase import create_client, Client
-from dotenv import load_dotenv
+import threading
 
-load_dotenv()
+# SUPABASE_URL and SUPABASE_KEY (or KEY) must be set in the environment or .env
 
-# SUPABASE_URL and SUPABASE_KEY are expected in environment variables
-# Fallbacks for local development if needed, though they should be in .env or system env
-url: str = os.environ.get("SUPABASE_URL", "https://nugwzktxrbpaynkwussb.supabase.co")
-key: str = os.environ.get("SUPABASE_KEY", os.environ.get("KEY", "sb_secret_8swIxMG-TASuT3XT4i3zGA_kIpOuiHk"))
+_client = None
+_initialized = False
+_lock = threading.Lock()
 
-if not url or not key:
-    print("--- Warning: SUPABASE_URL or SUPABASE_KEY not found in environment variables ---")
-else:
-    # Print partially for debugging on Render
-    masked_key = key[:10] + "..." + key[-5:] if key else "None"
-    print(f"--- Supabase Client: Initializing with URL {url} and Key {masked_key} ---")
 
-supabase: Client = create_client(url, key) if url and key else None
+class SupabaseNotConfigured(RuntimeError):
+    """SUPABASE_URL / SUPABASE_KEY are missing, so there is no project to connect to."""
+
+
+def get_supabase():
+    """Return the shared Supabase client, creating it on first use.
+
+    The supabase package and its HTTP stack are only imported here, so
+    processes that never talk to Supabase do not pay for them at boot.
+    Raises SupabaseNotConfigured when the credentials are not set.
+    """
+    global _client, _initialized
+    if _initialized:
+        return _client
+    with _lock:
+        if not _initialized:
+            url = os.environ.get("SUPABASE_URL")
+            key = os.environ.get("SUPABASE_KEY", os.environ.get("KEY"))
+            if not url or not key:
+                raise SupabaseNotConfigured("SUPABASE_URL and SUPABASE_KEY must be set to use Supabase.")
+            from supabase import create_client
+
+            # Print partially for debugging on Render
+            masked_key = key[:10] + "..." + key[-5:]
+            print(f"--- Supabase Client: Initializing with URL {url} and Key {masked_key} ---")
+            _client = create_client(url, key)
+            _initialized = True
+    return _client
+
+
+def set_supabase(client):
+    """Use `client` as the shared client instead of one built from the environment (e.g. a local fake)."""
+    global _client, _initialized
+    with _lock:
+        _client = client
+        _initialized = True
+
+
+def __getattr__(name):
+    # Backwards compatible `from logic.supabase_client import supabase` (creates the client)
+    if name == 'supabase':
+        return get_supabase()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
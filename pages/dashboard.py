@@ -1,15 +1,46 @@
 import dash
-from dash import html, dcc, callback, Input, Output, State
+from dash import html, dcc, callback, Input, Output, State, ClientsideFunction
 import dash_bootstrap_components as dbc
-from logic.data_fetcher import fetch_fred_data, fetch_world_bank_gold_data, fetch_sa_inflation_hardcoded, process_data, save_to_supabase, replace_gold_price_column_in_supabase, FRED_API_KEY, SERIES_CONFIG
+from logic.data_fetcher import (fetch_and_save_data, load_from_supabase, SERIES_CONFIG, SERIES_METADATA, DAILY_PANEL,
+                                SUPABASE_DAILY_TABLE)
+from logic.dataset_cache import (get_or_refresh_dataset, get_cached_dataset, get_derived, load_latest_dataset, LRUCache,
+                                 REFRESH_WORKER_ENABLED)
+from logic.columnar import encode_frame, decode_frame
+from logic.model import rolling_regression
+from logic.backtest import run_backtest
+from logic.features import FEATURE_CONFIG, compute_features
+from logic.correlation import get_correlation_analysis
+from logic.metrics import span, flush as flush_metrics
+from logic.progress import PROGRESS_TRANSPORT, ThrottledProgress, publish as publish_progress
+from logic.panel import VIEW_AGGREGATIONS, get_view
+from functools import lru_cache
+import copy
+import os
+import time
+import uuid
+import numpy as np
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
 
 dash.register_page(__name__, path='/dashboard')
 
+# Render predictor switches and theme changes in the browser instead of via server callbacks
+CLIENTSIDE_RENDERING = os.environ.get('CLIENTSIDE_RENDERING', '1') == '1'
+
+# Built figures kept per process, keyed by (dataset version, predictor, theme)
+FIGURE_CACHE_SIZE = int(os.environ.get('FIGURE_CACHE_SIZE', 64))
+_figure_cache = LRUCache(FIGURE_CACHE_SIZE)
+
+# Rows per page of the observations table, and formatted tables kept per process (by dataset version)
+TABLE_PAGE_SIZE = int(os.environ.get('TABLE_PAGE_SIZE', 25))
+TABLE_CACHE_SIZE = 4
+_table_cache = LRUCache(TABLE_CACHE_SIZE)
+
+# Chart frequencies, derived on demand from the daily master panel ('M' + 'last' is the monthly panel itself)
+CHART_FREQUENCIES = {'D': 'Daily', 'W': 'Weekly', 'M': 'Monthly', 'Q': 'Quarterly'}
+
 
 def sidebar(active_tab):
     def link(id_, label, icon, tab_name):
@@ -38,6 +69,8 @@ def data_tab_content():
         html.P("Fetch and analyse economic indicators to understand their impact on the ZAR/USD exchange rate. "
                "Visualise trends, compare predictors, and manage historical data from multiple sources.",
                style={'color': 'var(--text-secondary)', 'marginBottom': '2rem', 'fontSize': '0.95rem'}),
+        # Fires load_latest_data whenever the Data tab is rendered
+        dcc.Store(id='data-load-trigger', data=0),
         html.Button('Fetch Data', id='fetch-data-btn', n_clicks=0, className='login-button'),
         
         # Progress Bar
@@ -79,7 +112,29 @@ def data_tab_content():
                 dcc.Store(id='predictor-dropdown-options-store'),
                 dcc.Store(id='custom-dropdown-state', data=False)
             ]),
-            dcc.Graph(id='zar-graph', className='dashboard-card')
+            html.Div(className='api-key-input', children=[
+                dcc.RadioItems(id='chart-frequency', value='M', inline=True, className='model-radio',
+                               options=[{'label': label, 'value': freq} for freq, label in CHART_FREQUENCIES.items()]),
+                dcc.RadioItems(id='chart-aggregation', value='last', inline=True, className='model-radio',
+                               options=[{'label': how.capitalize(), 'value': how} for how in VIEW_AGGREGATIONS]),
+                html.Div(id='chart-frequency-note', style={'color': 'var(--text-secondary)', 'fontSize': '0.85rem'})
+            ]),
+            # Payload of the selected frequency's view; empty for the monthly panel in fetched-data
+            dcc.Store(id='chart-data'),
+            # Predictors only the monthly panel carries (derived features): other views are disabled for them
+            dcc.Store(id='monthly-only-predictors', data=list(FEATURE_CONFIG)),
+            # Per-theme base layouts for the clientside figure builder
+            dcc.Store(id='figure-layouts', data=_figure_layouts() if CLIENTSIDE_RENDERING else None),
+            dcc.Graph(id='zar-graph', className='dashboard-card'),
+
+            html.H3('Correlation', className='section-title', style={'marginTop': '2rem'}),
+            html.Div(className='api-key-input', children=[
+                dcc.RadioItems(id='correlation-mode', value='levels', inline=True, className='model-radio',
+                               options=[{'label': 'Levels', 'value': 'levels'},
+                                        {'label': 'Monthly changes', 'value': 'changes'}]),
+            ]),
+            dcc.Graph(id='correlation-matrix-graph', className='dashboard-card'),
+            dcc.Graph(id='lead-lag-graph', className='dashboard-card', style={'marginTop': '1.5rem'})
         ]),
         
         html.Div(id='data-table-container', className='data-table-container', style={'marginTop': '1.5rem'})
@@ -92,7 +147,43 @@ def model_tab_content():
         html.P("Predict ZAR/USD trends using machine learning and statistical models. "
                "Leverage historical data to generate insights into future exchange rate movements.",
                style={'color': 'var(--text-secondary)', 'marginBottom': '2rem', 'fontSize': '0.95rem'}),
-        html.Div('Model functionality coming soon.')
+        html.Div(className='model-controls', children=[
+            html.Div(className='api-key-input', children=[
+                html.Label('Window'),
+                dcc.RadioItems(id='model-window-type', value='rolling', inline=True, className='model-radio',
+                               options=[{'label': 'Rolling', 'value': 'rolling'},
+                                        {'label': 'Expanding', 'value': 'expanding'}]),
+            ]),
+            html.Div(className='api-key-input', children=[
+                html.Label('Window length (months)'),
+                dcc.Input(id='model-window', type='number', value=36, min=12, step=1, debounce=True,
+                          className='model-input'),
+            ]),
+            html.Div(className='api-key-input', children=[
+                html.Label('Regression'),
+                dcc.RadioItems(id='model-method', value='ols', inline=True, className='model-radio',
+                               options=[{'label': 'OLS', 'value': 'ols'}, {'label': 'Ridge', 'value': 'ridge'}]),
+            ]),
+            html.Div(className='api-key-input', children=[
+                html.Label('Ridge penalty'),
+                dcc.Input(id='model-alpha', type='number', value=1.0, min=0, step=0.1, debounce=True,
+                          className='model-input'),
+            ]),
+            html.Div(className='api-key-input', children=[
+                html.Label('Predictors'),
+                dcc.Checklist(id='model-features', value=[], className='model-radio',
+                              options=[{'label': 'Include derived features', 'value': 'features'}]),
+            ]),
+        ]),
+        html.Div(id='model-summary', style={'marginTop': '1rem'}),
+        dcc.Graph(id='model-forecast-graph', className='dashboard-card'),
+        dcc.Graph(id='model-coef-graph', className='dashboard-card', style={'marginTop': '1.5rem'}),
+
+        html.H3('Backtest', className='section-title', style={'marginTop': '2rem'}),
+        html.P("Walk-forward comparison of model, window and predictor-lag configurations on one-step-ahead forecasts.",
+               style={'color': 'var(--text-secondary)', 'fontSize': '0.95rem'}),
+        html.Button('Run backtest', id='backtest-btn', n_clicks=0, className='login-button'),
+        dcc.Loading(html.Div(id='backtest-results', className='data-table-container', style={'marginTop': '1.5rem'}))
     ])
 
 
@@ -104,6 +195,9 @@ def layout():
         dcc.Store(id='dashboard-tab', data=active_tab, storage_type='session'),
         dcc.Store(id='fetched-data', storage_type='memory'),
         dcc.Store(id='fetch-trigger', data=0, storage_type='memory'),
+        dcc.Store(id='progress-channel', storage_type='memory'),
+        # Channel the browser's progress EventSource follows (PROGRESS_TRANSPORT=sse)
+        dcc.Store(id='progress-stream', storage_type='memory'),
         sidebar(active_tab),
         html.Div(className='content-area', children=[
             html.Div(id='content-body', children=[data_tab_content()])
@@ -178,15 +272,170 @@ def perform_signout(signout_clicks):
 @callback(
     Output('fetch-trigger', 'data'),
     Output('data-error', 'children', allow_duplicate=True),
+    Output('progress-channel', 'data'),
     Input('fetch-data-btn', 'n_clicks'),
     State('fetch-trigger', 'data'),
     prevent_initial_call=True
 )
 def validate_keys(n_clicks, current_trigger):
     if not n_clicks:
-        return dash.no_update, dash.no_update
+        return dash.no_update, dash.no_update, dash.no_update
     
-    return (current_trigger or 0) + 1, ""
+    # Each fetch reports to its own progress channel (used when PROGRESS_TRANSPORT=sse)
+    return (current_trigger or 0) + 1, "", uuid.uuid4().hex
+
+
+def format_table(processed):
+    """Format a processed frame for display, one whole column at a time.
+
+    Returns a dict of column name -> list of display strings, newest first:
+    dates as YYYY-MM-DD and numbers rounded to 4 decimals ('-' when missing).
+    """
+    df = processed.sort_index(ascending=False)
+    table = {'Date': pd.DatetimeIndex(df.index).strftime('%Y-%m-%d').tolist()}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_numeric_dtype(series):
+            values = series.to_numpy(dtype='float64', na_value=np.nan)
+            text = np.array(list(map('{:.4f}'.format, values.tolist())), dtype=object)
+            text[np.isnan(values)] = '-'
+            table[col] = text.tolist()
+        else:
+            table[col] = series.astype(str).where(series.notna(), '-').tolist()
+    return table
+
+
+def _panel(entry):
+    """Processed frame of a dataset entry joined with its derived features."""
+    features = entry.get('features')
+    if features is None:
+        features = compute_features(entry['data'])
+    return entry['data'].join(features)
+
+
+def _raw_columns(df):
+    return [c for c in df.columns if c not in FEATURE_CONFIG]
+
+
+def _dataset_for(data):
+    """Panel (series + features) behind a store payload: the full-precision copy in the
+    shared dataset cache when it holds that version, else the (float32) payload itself."""
+    entry = get_cached_dataset(max_age=float('inf'))
+    if entry is not None and entry['version'] == data.get('version'):
+        return _panel(entry)
+    return decode_frame(data)
+
+
+def _cached_table(data, processed=None):
+    """Formatted table for a store payload, cached per dataset version."""
+    version = data['version']
+    table = _table_cache.get(version)
+    if table is not None:
+        return table
+    processed = _dataset_for(data) if processed is None else processed
+    table = format_table(processed[_raw_columns(processed)])
+    _table_cache.put(version, table)
+    return table
+
+
+def render_table_page(table, page):
+    """Build the html.Table for one page of a formatted table, plus the pager label."""
+    n_rows = len(table['Date'])
+    n_pages = max(1, -(-n_rows // TABLE_PAGE_SIZE))
+    page = min(max(0, page), n_pages - 1)
+    start, stop = page * TABLE_PAGE_SIZE, min(n_rows, (page + 1) * TABLE_PAGE_SIZE)
+
+    columns = list(table)
+    header = html.Thead(html.Tr([html.Th(col) for col in columns]))
+    cells = zip(*(table[col][start:stop] for col in columns))
+    body_rows = [html.Tr([html.Td(val) for val in row]) for row in cells]
+    label = f"Rows {start + 1}-{stop} of {n_rows}" if n_rows else "No rows"
+    return html.Table(className='custom-table', children=[header, html.Tbody(body_rows)]), page, label
+
+
+def render_dataset(entry, msg):
+    """Build the fetch_data/load_latest_data outputs (store data, message, table, dropdown) for a dataset entry."""
+    panel = _panel(entry)
+    # The store gets a compact columnar payload (shared date axis + float32 arrays)
+    # of the series and their derived features, tagged with the dataset version
+    payload = encode_frame(panel, version=entry['version'])
+    table, page, label = render_table_page(_cached_table(payload, panel), 0)
+    table_view = html.Div(children=[
+        dcc.Store(id='table-page', data=page),
+        html.Div(id='table-page-body', children=table),
+        html.Div(className='table-pager', children=[
+            html.Button('Newer', id='table-prev-btn', n_clicks=0, className='table-pager-button'),
+            html.Span(id='table-page-label', className='table-pager-label', children=label),
+            html.Button('Older', id='table-next-btn', n_clicks=0, className='table-pager-button'),
+        ])
+    ])
+
+    # Get predictors (all columns except Date and ZAR_USD), then the derived features
+    predictors = [c for c in panel.columns if c not in ['Date', 'ZAR_USD']]
+    
+    # Use labels from SERIES_CONFIG / FEATURE_CONFIG for the options
+    dropdown_options = [
+        {'label': SERIES_CONFIG.get(p, FEATURE_CONFIG.get(p, {})).get('label', p), 'value': p} 
+        for p in predictors
+    ]
+    default_predictor = predictors[0] if predictors else None
+
+    return payload, msg, table_view, dropdown_options, default_predictor, {'marginTop': '2rem', 'display': 'block'}
+
+
+# Fast path on page load: show the last stored dataset without calling upstream
+@callback(
+    Output('fetched-data', 'data', allow_duplicate=True),
+    Output('data-error', 'children', allow_duplicate=True),
+    Output('data-table-container', 'children', allow_duplicate=True),
+    Output('predictor-dropdown-options-store', 'data', allow_duplicate=True),
+    Output('predictor-dropdown-value', 'data', allow_duplicate=True),
+    Output('visualization-container', 'style', allow_duplicate=True),
+    Input('data-load-trigger', 'data'),
+    prevent_initial_call='initial_duplicate'
+)
+def load_latest_data(_):
+    try:
+        entry = load_latest_dataset(load_from_supabase)
+    except Exception as e:
+        print(f"DEBUG Error in load_latest_data: {str(e)}")
+        entry = None
+    if entry is None:
+        return dash.no_update, "No stored data yet. Click 'Fetch Data' to load it from the sources.", dash.no_update, dash.no_update, dash.no_update, dash.no_update
+
+    if entry['fetched_at']:
+        stamp = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['fetched_at']))
+        msg = f"Showing stored data (refreshed {stamp}). Click 'Fetch Data' to update from the sources."
+    else:
+        msg = "Showing stored data. Click 'Fetch Data' to update from the sources."
+    return render_dataset(entry, msg)
+
+
+# Server-side paging of the observations table: only one page of cells is ever built
+@callback(
+    Output('table-page-body', 'children'),
+    Output('table-page', 'data'),
+    Output('table-page-label', 'children'),
+    Input('table-prev-btn', 'n_clicks'),
+    Input('table-next-btn', 'n_clicks'),
+    State('table-page', 'data'),
+    State('fetched-data', 'data'),
+    prevent_initial_call=True
+)
+def page_table(prev_clicks, next_clicks, page, data):
+    if not data:
+        return dash.no_update, dash.no_update, dash.no_update
+    step = -1 if dash.callback_context.triggered_id == 'table-prev-btn' else 1
+
+    return render_table_page(_cached_table(data), (page or 0) + step)
+
+
+def _read_published_dataset(progress_callback=None):
+    """Refresh function for worker mode: read the dataset the refresh worker last saved to Supabase."""
+    if progress_callback:
+        progress_callback(50, 'Loading data published by the refresh worker...')
+    df = load_from_supabase()
+    return {'data': df, 'source': 'supabase'} if df is not None else None
 
 
 # Fetch data using hardcoded API keys
@@ -198,6 +447,7 @@ def validate_keys(n_clicks, current_trigger):
     Output('predictor-dropdown-value', 'data'),
     Output('visualization-container', 'style'),
     Input('fetch-trigger', 'data'),
+    State('progress-channel', 'data'),
     background=True,
     running=[
         (Output('fetch-data-btn', 'disabled'), True, False),
@@ -212,117 +462,61 @@ def validate_keys(n_clicks, current_trigger):
     ],
     prevent_initial_call=True
 )
-def fetch_data(set_progress, trigger_value):
+def fetch_data(set_progress, trigger_value, channel):
     if trigger_value:
         print(f"DEBUG: fetch_data background callback started. trigger_value={trigger_value}")
-        set_progress((0, '0%', 'Starting data fetch...'))
+        # Coalesced progress, pushed over /progress/<channel> or through the polled progress outputs
+        sse = PROGRESS_TRANSPORT == 'sse' and channel
+        report = ThrottledProgress((lambda value: publish_progress(channel, value)) if sse else set_progress)
+        report((0, '0%', 'Starting data fetch...'), final=True)
         
         try:
-            # Use unified configuration from data_fetcher
-            fred_series = {name: cfg['id'] for name, cfg in SERIES_CONFIG.items() if cfg['source'] == 'FRED'}
-            
             def update_progress(percent, status_msg):
                 print(f"DEBUG: Progress update: {percent}% - {status_msg}")
-                set_progress((percent, f'{percent}%', f'Processing: {percent}% - {status_msg}'))
-            
-            print("DEBUG: Calling fetch_fred_data...")
-            raw = fetch_fred_data(fred_series, api_key=FRED_API_KEY, progress_callback=update_progress)
-
-            # Fetch GOLD_PRICE from World Bank monthly commodity data.
-            wb_gold = fetch_world_bank_gold_data(start_date='2018-01-31')
-            if not wb_gold.empty:
-                # Use concat instead of assignment to allow the index to expand to the latest available data.
-                raw = pd.concat([raw, wb_gold.to_frame(name='GOLD_PRICE')], axis=1)
+                report((percent, f'{percent}%', f'Processing: {percent}% - {status_msg}'))
             
-            # Fetch SA_INFLATION (Hardcoded)
-            sa_inflation = fetch_sa_inflation_hardcoded()
-            raw = pd.concat([raw, sa_inflation], axis=1)
+            # Served from the shared server-side cache while it is fresh; otherwise one
+            # request refreshes from upstream (and saves to Supabase) while the others wait.
+            # With a refresh worker deployed, the refresh is just a read of what it published.
+            print("DEBUG: Loading dataset (cached or refreshed)...")
+            refresh = _read_published_dataset if REFRESH_WORKER_ENABLED else fetch_and_save_data
+            with span('dataset_load'):
+                entry, refreshed = get_or_refresh_dataset(refresh, progress_callback=update_progress)
             
-            if raw.empty:
-                print("DEBUG: raw_df is empty")
+            if entry is None:
+                print("DEBUG: dataset is empty")
                 return dash.no_update, 'Failed to fetch data. Please check your API keys and try again.', dash.no_update, dash.no_update, dash.no_update, dash.no_update
             
-            print(f"DEBUG: Successfully fetched raw data with {len(raw)} rows. Processing...")
-            set_progress((95, '95%', 'Processing and saving data...'))
-            processed = process_data(raw, start_date='2018-01-31')
-            
-            if processed.empty:
-                print("DEBUG: processed_df is empty")
-                return dash.no_update, 'No data available in the requested date range.', dash.no_update, dash.no_update, dash.no_update, dash.no_update
-
-            # Save to Supabase (All data since 2018-01-31)
-            supabase_msg = ""
-            try:
-                print("DEBUG: Attempting to save to Supabase...")
-                save_to_supabase(processed)
-                replace_gold_price_column_in_supabase(wb_gold)
-                print("DEBUG: Save to Supabase successful")
-            except Exception as e:
-                # Non-fatal: show message but still display data
-                print(f"DEBUG Warning: Could not save to Supabase: {e}")
-                supabase_msg = f" (Warning: Could not save to Supabase: {e})"
-
-            # Prepare for display
-            print("DEBUG: Preparing data for display...")
-            df_all = processed.reset_index()
-            df_all['Date'] = pd.to_datetime(df_all['Date']).dt.strftime('%Y-%m-%d')
-            # Sort descending by date for display
-            df_all = df_all.sort_values('Date', ascending=False)
-            
-            # Limit to 10 most recent observations for the table
-            df_table = df_all.head(10)
-
-            columns = ['Date'] + [c for c in df_table.columns if c != 'Date']
-
-            header = html.Thead(html.Tr([html.Th(col) for col in columns]))
-            body_rows = []
-            for _, row in df_table.iterrows():
-                tds = []
-                for col in columns:
-                    val = row[col]
-                    if col == 'Date':
-                        tds.append(html.Td(val))
-                    elif pd.isna(val):
-                        tds.append(html.Td('-'))
-                    else:
-                        try:
-                            # Round to 4 decimals for display
-                            formatted_val = f"{float(val):.4f}"
-                            tds.append(html.Td(formatted_val))
-                        except (ValueError, TypeError):
-                            tds.append(html.Td(val))
-                body_rows.append(html.Tr(tds))
-            table = html.Table(className='custom-table', children=[header, html.Tbody(body_rows)])
-
-            # Get predictors (all columns except Date and ZAR_USD)
-            predictors = [c for c in df_all.columns if c not in ['Date', 'ZAR_USD']]
-            
-            # Use labels from SERIES_CONFIG for the options
-            dropdown_options = [
-                {'label': SERIES_CONFIG.get(p, {}).get('label', p), 'value': p} 
-                for p in predictors
-            ]
-            default_predictor = predictors[0] if predictors else None
-
-            msg = f"Data successfully loaded!{supabase_msg} showing 10 most recent observations."
+            # Non-fatal: show message but still display data
+            supabase_msg = " (Warning: Could not save to Supabase)" if refreshed and 'save' in entry and entry['save'] is None else ""
+            if refreshed:
+                source_msg = ""
+            else:
+                age_minutes = int((time.time() - entry['fetched_at']) // 60)
+                source_msg = f" (cached, refreshed {age_minutes} min ago)"
+            print(f"DEBUG: Dataset ready with {len(entry['data'])} rows (refreshed={refreshed}).")
+
+            msg = f"Data successfully loaded{source_msg}!{supabase_msg} showing the most recent observations first."
+            with span('render_dataset'):
+                result = render_dataset(entry, msg)
             
             print("DEBUG: Background fetch_data complete. Returning results.")
-            set_progress((100, '100%', 'Complete!'))
-            return df_all.to_dict('records'), msg, table, dropdown_options, default_predictor, {'marginTop': '2rem', 'display': 'block'}
+            report((100, '100%', 'Complete!'), final=True)
+            return result
         except Exception as e:
             print(f"DEBUG Error in fetch_data: {str(e)}")
             import traceback
             traceback.print_exc()
             return dash.no_update, f'Error: {str(e)}', dash.no_update, dash.no_update, dash.no_update, dash.no_update
+        finally:
+            report.close()
+            if sse:
+                publish_progress(channel, (100, '100%', 'Complete!'), done=True)
+            # Background callbacks run in short-lived processes
+            flush_metrics()
     return dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update
 
 
-@callback(
-    Output('custom-dropdown-options-list', 'children'),
-    Output('custom-dropdown-selected-label', 'children'),
-    Input('predictor-dropdown-options-store', 'data'),
-    Input('predictor-dropdown-value', 'data')
-)
 def render_custom_dropdown(options, selected_value):
     if not options:
         return [html.Div('No predictors available', className='custom-dropdown-empty')], 'Select a factor...'
@@ -349,11 +543,6 @@ def render_custom_dropdown(options, selected_value):
     return option_elements, selected_label
 
 
-@callback(
-    Output('predictor-dropdown-value', 'data', allow_duplicate=True),
-    Input({'type': 'predictor-option', 'index': dash.ALL}, 'n_clicks'),
-    prevent_initial_call=True
-)
 def select_custom_dropdown_option(_):
     trigger_id = dash.callback_context.triggered_id
     if isinstance(trigger_id, dict) and trigger_id.get('type') == 'predictor-option':
@@ -361,18 +550,6 @@ def select_custom_dropdown_option(_):
     return dash.no_update
 
 
-@callback(
-    Output('custom-dropdown-state', 'data'),
-    Output('custom-dropdown-menu', 'style'),
-    Output('custom-dropdown-arrow', 'style'),
-    Output('custom-dropdown-backdrop', 'style'),
-    Input('custom-dropdown-control', 'n_clicks'),
-    Input('custom-dropdown-backdrop', 'n_clicks'),
-    Input({'type': 'predictor-option', 'index': dash.ALL}, 'n_clicks'),
-    Input('predictor-dropdown-value', 'data'),
-    State('custom-dropdown-state', 'data'),
-    prevent_initial_call=True
-)
 def toggle_custom_dropdown(control_clicks, backdrop_clicks, option_clicks, selected_value, is_open):
     trigger_id = dash.callback_context.triggered_id
     if trigger_id == 'custom-dropdown-control':
@@ -390,34 +567,11 @@ def toggle_custom_dropdown(control_clicks, backdrop_clicks, option_clicks, selec
     return next_state, menu_style, arrow_style, backdrop_style
 
 
-@callback(
-    Output('zar-graph', 'figure'),
-    Input('predictor-dropdown-value', 'data'),
-    Input('fetched-data', 'data'),
-    State('theme-store', 'data')
-)
-def update_graph(predictor, data, theme):
-    if not data or not predictor:
-        return go.Figure()
-    
-    df = pd.DataFrame(data)
-    df['Date'] = pd.to_datetime(df['Date'])
-    df = df.sort_values('Date')
-    
+@lru_cache(maxsize=None)
+def _figure_layout(theme):
+    """Layout shared by every ZAR/USD vs predictor figure for a theme (secondary axis title left blank)."""
     fig = make_subplots(specs=[[{"secondary_y": True}]])
     
-    # Primary axis: ZAR/USD
-    fig.add_trace(
-        go.Scatter(x=df['Date'], y=df['ZAR_USD'], name='ZAR/USD', line=dict(color='#38bdf8', width=2)),
-        secondary_y=False
-    )
-    
-    # Secondary axis: Selected Predictor
-    fig.add_trace(
-        go.Scatter(x=df['Date'], y=df[predictor], name=predictor, line=dict(color='#8b5cf6', width=2)),
-        secondary_y=True
-    )
-    
     template = 'plotly_dark' if theme == 'dark' else 'plotly_white'
     hover_bgcolor = "rgba(15, 23, 42, 0.9)" if theme == 'dark' else "rgba(255, 255, 255, 0.9)"
     hover_font_color = "#f8fafc" if theme == 'dark' else "#0f172a"
@@ -440,6 +594,339 @@ def update_graph(predictor, data, theme):
     )
     
     fig.update_yaxes(title_text="ZAR/USD", secondary_y=False)
-    fig.update_yaxes(title_text=predictor, secondary_y=True)
+    return fig.to_plotly_json()['layout']
+
+
+def _figure_layouts():
+    return {theme: _figure_layout(theme) for theme in ('dark', 'light')}
+
+
+def _build_figure(df, predictor, theme):
+    """Build the ZAR/USD vs predictor figure as a plain (JSON-ready) dict."""
+    layout = copy.deepcopy(_figure_layout(theme))
+    layout['yaxis2']['title'] = {'text': predictor}
+    
+    data = [
+        # Primary axis: ZAR/USD
+        go.Scatter(x=df.index, y=df['ZAR_USD'], name='ZAR/USD', line=dict(color='#38bdf8', width=2),
+                   xaxis='x', yaxis='y').to_plotly_json(),
+        # Secondary axis: Selected Predictor
+        go.Scatter(x=df.index, y=df[predictor], name=predictor, line=dict(color='#8b5cf6', width=2),
+                   xaxis='x', yaxis='y2').to_plotly_json(),
+    ]
+    return {'data': data, 'layout': layout}
+
+
+def get_figure(data, predictor, theme):
+    """Return the figure for a store payload, memoized per (dataset version, predictor, theme)."""
+    key = (data.get('version'), predictor, theme)
+    figure = _figure_cache.get(key)
+    if figure is not None:
+        return figure
+
+    # Decoded once per dataset version and shared across predictor/theme changes
+    df = decode_frame(data)
+    if predictor not in df.columns or 'ZAR_USD' not in df.columns:
+        return None
+    figure = _build_figure(df, predictor, theme)
+    if key[0] is not None:
+        _figure_cache.put(key, figure)
+    return figure
+
+
+@callback(
+    Output('chart-data', 'data'),
+    Output('chart-frequency-note', 'children'),
+    Input('fetched-data', 'data'),
+    Input('chart-frequency', 'value'),
+    Input('chart-aggregation', 'value')
+)
+def select_chart_frequency(data, freq, how):
+    """Aggregated view of the daily master panel for the chart, cached per (dataset version, frequency, aggregation)."""
+    if not data or (freq == 'M' and how == 'last'):
+        return None, ''
+    entry = get_cached_dataset(max_age=float('inf'))
+    daily = _daily_panel(entry) if entry is not None and entry['version'] == data.get('version') else None
+    if daily is None:
+        return None, "Daily data is not available for this dataset; showing monthly values. Fetch Data to rebuild it."
+
+    if freq == 'D':
+        how = 'last'
+    view = get_view(daily, freq, how, version=data['version'])
+    payload = encode_frame(view, version=f"{data['version']}:{freq}:{how}")
+    observed_daily = SERIES_METADATA.index[SERIES_METADATA['frequency'] == 'daily'].tolist()
+    note = (f"{CHART_FREQUENCIES[freq]} view ({len(view)} periods). Observed daily: {', '.join(observed_daily)}; "
+            "other series hold their last release. Derived features are monthly only.")
+    return payload, note
+
+
+def _load_published_daily():
+    daily = load_from_supabase(table=SUPABASE_DAILY_TABLE)
+    return daily.astype('float32') if not daily.empty else None
+
+
+def _daily_panel(entry):
+    """Daily master panel of a dataset entry, or None.
+
+    Entries read from Supabase (refresh worker mode, snapshots) carry none;
+    their panel is the one the refresher published to SUPABASE_DAILY_TABLE,
+    read once per dataset version.
+    """
+    daily = entry.get('daily')
+    if daily is None and DAILY_PANEL:
+        daily = get_derived('daily_panel', entry['version'], _load_published_daily)
+    return daily if daily is not None and not daily.empty else None
+
+
+def lock_chart_frequency(predictor, monthly_only, frequency_options, aggregation_options):
+    """Only the monthly 'last' view carries derived features: disable the other choices while one is selected."""
+    locked = bool(predictor) and predictor in (monthly_only or [])
+
+    def lock(options, keep):
+        return [{**option, 'disabled': locked and option['value'] != keep} for option in options]
+
+    if locked:
+        return lock(frequency_options, 'M'), 'M', lock(aggregation_options, 'last'), 'last'
+    return lock(frequency_options, 'M'), dash.no_update, lock(aggregation_options, 'last'), dash.no_update
+
+
+def update_graph(predictor, data, view, theme):
+    data = view or data
+    if not data or not predictor:
+        return go.Figure()
     
+    figure = get_figure(data, predictor, theme)
+    return figure if figure is not None else go.Figure()
+
+
+# Predictor and theme interactions. In clientside mode the browser rebuilds the
+# dropdown and the figure from the data already in `fetched-data`
+# (assets/dashboard_clientside.js), so they never round-trip to the server.
+def _register(function_name, func, *dependencies, **kwargs):
+    if CLIENTSIDE_RENDERING:
+        dash.clientside_callback(ClientsideFunction(namespace='dashboard', function_name=function_name),
+                                 *dependencies, **kwargs)
+    else:
+        callback(*dependencies, **kwargs)(func)
+
+
+_register(
+    'lockChartFrequency', lock_chart_frequency,
+    Output('chart-frequency', 'options'),
+    Output('chart-frequency', 'value'),
+    Output('chart-aggregation', 'options'),
+    Output('chart-aggregation', 'value'),
+    Input('predictor-dropdown-value', 'data'),
+    State('monthly-only-predictors', 'data'),
+    State('chart-frequency', 'options'),
+    State('chart-aggregation', 'options')
+)
+
+_register(
+    'renderDropdown', render_custom_dropdown,
+    Output('custom-dropdown-options-list', 'children'),
+    Output('custom-dropdown-selected-label', 'children'),
+    Input('predictor-dropdown-options-store', 'data'),
+    Input('predictor-dropdown-value', 'data')
+)
+
+_register(
+    'selectOption', select_custom_dropdown_option,
+    Output('predictor-dropdown-value', 'data', allow_duplicate=True),
+    Input({'type': 'predictor-option', 'index': dash.ALL}, 'n_clicks'),
+    prevent_initial_call=True
+)
+
+_register(
+    'toggleDropdown', toggle_custom_dropdown,
+    Output('custom-dropdown-state', 'data'),
+    Output('custom-dropdown-menu', 'style'),
+    Output('custom-dropdown-arrow', 'style'),
+    Output('custom-dropdown-backdrop', 'style'),
+    Input('custom-dropdown-control', 'n_clicks'),
+    Input('custom-dropdown-backdrop', 'n_clicks'),
+    Input({'type': 'predictor-option', 'index': dash.ALL}, 'n_clicks'),
+    Input('predictor-dropdown-value', 'data'),
+    State('custom-dropdown-state', 'data'),
+    prevent_initial_call=True
+)
+
+if CLIENTSIDE_RENDERING:
+    # The theme is an Input here: restyling is free in the browser
+    dash.clientside_callback(
+        ClientsideFunction(namespace='dashboard', function_name='renderGraph'),
+        Output('zar-graph', 'figure'),
+        Input('predictor-dropdown-value', 'data'),
+        Input('fetched-data', 'data'),
+        Input('chart-data', 'data'),
+        Input('theme-store', 'data'),
+        State('figure-layouts', 'data')
+    )
+else:
+    callback(
+        Output('zar-graph', 'figure'),
+        Input('predictor-dropdown-value', 'data'),
+        Input('fetched-data', 'data'),
+        Input('chart-data', 'data'),
+        State('theme-store', 'data')
+    )(update_graph)
+
+if PROGRESS_TRANSPORT == 'sse':
+    # Opens an EventSource on /progress/<channel> that updates the progress bar directly
+    dash.clientside_callback(
+        ClientsideFunction(namespace='dashboard', function_name='followProgress'),
+        Output('progress-stream', 'data'),
+        Input('progress-channel', 'data'),
+        prevent_initial_call=True
+    )
+
+
+def _model_figure(traces, theme, yaxis_title):
+    fig = go.Figure(traces)
+    fig.update_layout(
+        template='plotly_dark' if theme == 'dark' else 'plotly_white',
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=40, r=40, t=40, b=40),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        hovermode="x unified",
+        yaxis_title=yaxis_title
+    )
     return fig
+
+
+def _model_summary(result):
+    summary = result['summary']
+    last = result['window_stats'].iloc[-1]
+    rows = [
+        ('Windows fitted', f"{summary['windows']}"),
+        ('Forecast RMSE', f"{summary['rmse']:.4f}"),
+        ('Forecast MAE', f"{summary['mae']:.4f}"),
+        ('Mean in-sample R²', f"{summary['mean_r2']:.3f}"),
+        ('Latest window R²', f"{last['r2']:.3f}"),
+        ('Latest residual std', f"{last['resid_std']:.4f}"),
+    ]
+    return html.Table(className='custom-table', style={'marginBottom': '1.5rem'}, children=[
+        html.Tbody([html.Tr([html.Td(label), html.Td(value)]) for label, value in rows])
+    ])
+
+
+# Model tab: rolling/expanding regressions of ZAR/USD on every predictor
+@callback(
+    Output('model-forecast-graph', 'figure'),
+    Output('model-coef-graph', 'figure'),
+    Output('model-summary', 'children'),
+    Input('model-window-type', 'value'),
+    Input('model-window', 'value'),
+    Input('model-method', 'value'),
+    Input('model-alpha', 'value'),
+    Input('model-features', 'value'),
+    State('fetched-data', 'data'),
+    State('theme-store', 'data')
+)
+def update_model(window_type, window, method, alpha, use_features, data, theme):
+    if not data:
+        return go.Figure(), go.Figure(), "Load data on the Data tab first."
+
+    panel = _dataset_for(data)
+    columns = _raw_columns(panel)
+    if use_features:
+        # Features derived from ZAR/USD itself would leak the target
+        columns += [c for c in panel.columns if c in FEATURE_CONFIG and FEATURE_CONFIG[c]['source'] != 'ZAR_USD']
+    df = panel[columns]
+    try:
+        # Predictors lagged one month, so each forecast only uses values published before its month
+        result = rolling_regression(df, window=window or 36, expanding=window_type == 'expanding',
+                                    method=method, alpha=alpha if alpha is not None else 1.0, lag=1)
+    except Exception as e:
+        print(f"DEBUG Error in update_model: {str(e)}")
+        return go.Figure(), go.Figure(), f"Error: {str(e)}"
+    if result is None:
+        return go.Figure(), go.Figure(), "Not enough observations for the selected window."
+
+    forecasts = result['forecasts']
+    forecast_fig = _model_figure([
+        go.Scatter(x=forecasts.index, y=forecasts['actual'], name='ZAR/USD', line=dict(color='#38bdf8', width=2)),
+        go.Scatter(x=forecasts.index, y=forecasts['forecast'], name='Forecast (predictors lagged 1 month)',
+                   line=dict(color='#8b5cf6', width=2, dash='dot')),
+    ], theme, 'ZAR/USD')
+
+    coefficients = result['coefficients'].drop(columns='Intercept')
+    coef_fig = _model_figure([
+        go.Scatter(x=coefficients.index, y=coefficients[col],
+                   name=SERIES_CONFIG.get(col, FEATURE_CONFIG.get(col, {})).get('label', col))
+        for col in coefficients.columns
+    ], theme, 'Coefficient (per std. dev.)')
+    return forecast_fig, coef_fig, _model_summary(result)
+
+
+# Scoring can take a while (and may start a process pool), so it runs as a background job
+@callback(
+    Output('backtest-results', 'children'),
+    Input('backtest-btn', 'n_clicks'),
+    State('fetched-data', 'data'),
+    background=True,
+    running=[(Output('backtest-btn', 'disabled'), True, False)],
+    prevent_initial_call=True
+)
+def run_model_backtest(n_clicks, data):
+    if not data:
+        return html.Div("Load data on the Data tab first.", className='login-error')
+    try:
+        panel = _dataset_for(data)
+        results = run_backtest(panel[_raw_columns(panel)])
+    except Exception as e:
+        print(f"DEBUG Error in run_model_backtest: {str(e)}")
+        return html.Div(f"Error: {str(e)}", className='login-error')
+
+    results = results.assign(
+        method=results['method'].str.upper(),
+        window=np.where(results['expanding'], 'expanding from ' + results['window'].astype(str),
+                        'rolling ' + results['window'].astype(str)),
+        rmse=results['rmse'].map('{:.4f}'.format),
+        mae=results['mae'].map('{:.4f}'.format),
+        directional_accuracy=(results['directional_accuracy'] * 100).map('{:.1f}%'.format),
+    )
+    columns = {'method': 'Model', 'window': 'Window', 'lag': 'Lag (months)', 'forecasts': 'Forecasts',
+               'rmse': 'RMSE', 'mae': 'MAE', 'directional_accuracy': 'Direction hit rate'}
+    header = html.Thead(html.Tr([html.Th(label) for label in columns.values()]))
+    body = html.Tbody([html.Tr([html.Td(val) for val in row])
+                       for row in results[list(columns)].itertuples(index=False)])
+    return html.Table(className='custom-table', children=[header, body])
+
+
+def _heatmap(z, x, y, theme, title, xaxis_title=None):
+    fig = go.Figure(go.Heatmap(z=z, x=x, y=y, zmin=-1, zmax=1, colorscale='RdBu', reversescale=True,
+                               hovertemplate='%{y} / %{x}: %{z:.2f}<extra></extra>'))
+    fig.update_layout(
+        template='plotly_dark' if theme == 'dark' else 'plotly_white',
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=40, r=40, t=60, b=40),
+        title=title,
+        xaxis_title=xaxis_title
+    )
+    return fig
+
+
+# Correlation matrix and ZAR/USD lead/lag cross-correlations, cached per dataset version
+@callback(
+    Output('correlation-matrix-graph', 'figure'),
+    Output('lead-lag-graph', 'figure'),
+    Input('fetched-data', 'data'),
+    Input('correlation-mode', 'value'),
+    State('theme-store', 'data')
+)
+def update_correlation(data, mode, theme):
+    if not data:
+        return go.Figure(), go.Figure()
+    panel = _dataset_for(data)
+    panel = panel[_raw_columns(panel)]
+    result = get_correlation_analysis(panel, version=data['version'], changes=mode == 'changes')
+
+    matrix = result['matrix']
+    matrix_fig = _heatmap(matrix.to_numpy(), list(matrix.columns), list(matrix.index), theme, 'Correlation matrix')
+    lead_lag = result['lead_lag']
+    lead_lag_fig = _heatmap(lead_lag.to_numpy().T, list(lead_lag.index), list(lead_lag.columns), theme,
+                            'Correlation with ZAR/USD by lag (positive: predictor leads)', 'Lag (months)')
+    return matrix_fig, lead_lag_fig
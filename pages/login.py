@@ -1,6 +1,6 @@
 import dash
 from dash import html, dcc, callback, Input, Output, State
-from logic.supabase_client import supabase
+from logic.supabase_client import SupabaseNotConfigured, get_supabase
 
 dash.register_page(__name__, path='/')
 
@@ -43,8 +43,10 @@ def login_auth(n_clicks, username, password):
         if not username or not password:
             return None, "Please enter both username and password", dash.no_update
 
-        if not supabase:
-            return None, "System error: Supabase connection not established."
+        try:
+            supabase = get_supabase()
+        except SupabaseNotConfigured:
+            return None, "System error: Supabase connection not established.", dash.no_update
 
         try:
             # Check credentials in Supabase
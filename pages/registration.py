@@ -27,7 +27,7 @@ def layout():
     ], className='login-container')
 
 
-from logic.supabase_client import supabase
+from logic.supabase_client import SupabaseNotConfigured, get_supabase
 
 @callback(
     Output('register-output', 'children'),
@@ -42,7 +42,9 @@ def register_user(n_clicks, username, password):
         if not username or not password:
             return "Please enter both username and password", {}
 
-        if not supabase:
+        try:
+            supabase = get_supabase()
+        except SupabaseNotConfigured:
             return "System error: Supabase connection not established.", {}
 
         try:
@@ -0,0 +1,10 @@
+import os
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Keep the shared diskcache out of the repository's .cache
+os.environ.setdefault('CACHE_DIR', tempfile.mkdtemp())
@@ -0,0 +1,103 @@
+"""BulkWriter against the local PostgREST stand-in: chunking, payload size, retries and permanent failures."""
+import pandas as pd
+import pytest
+
+from bench.fake_servers import FakePostgrestServer
+from logic.bulk_writer import BulkWriter, BulkWriteError
+from logic.serialization import to_json_rows
+
+ROWS = 2000
+
+
+def make_records(rows):
+    dates = pd.date_range('1900-01-01', periods=rows, freq='D').strftime('%Y-%m-%d')
+    return [{'Date': d, 'ZAR_USD': 15.0 + i % 100 / 10, 'VIX': 20.0, 'GOLD_PRICE': None}
+            for i, d in enumerate(dates)]
+
+
+@pytest.fixture
+def records():
+    return make_records(ROWS)
+
+
+def test_upsert_writes_every_row_in_chunks(records):
+    with FakePostgrestServer() as server:
+        metrics = BulkWriter(server.client(), 'data', chunk_size=500, max_in_flight=4).upsert(records)
+        assert len(server.rows) == ROWS
+        assert server.rows_written == ROWS
+    assert [m['chunk'] for m in metrics] == [0, 1, 2, 3]
+    assert all(m['ok'] and m['attempts'] == 1 and m['rows'] == 500 for m in metrics)
+
+
+def test_upsert_json_writes_every_row(records):
+    df = pd.DataFrame(records)
+    with FakePostgrestServer() as server:
+        BulkWriter(server.client(), 'data', chunk_size=300).upsert_json(to_json_rows(df))
+        assert sorted(server.rows) == sorted(df['Date'])
+
+
+def test_bytes_metric_matches_the_request_bodies(records):
+    df = pd.DataFrame(records)
+    with FakePostgrestServer() as server:
+        metrics = BulkWriter(server.client(), 'data', chunk_size=500).upsert_json(to_json_rows(df))
+        assert sorted(m['bytes'] for m in metrics) == sorted(server.payload_sizes)
+    assert sum(m['bytes'] for m in metrics) == server.bytes_received
+
+
+@pytest.mark.parametrize('max_bytes', [20_000, 5_000])
+def test_chunks_are_split_at_the_byte_limit(records, max_bytes):
+    df = pd.DataFrame(records)
+    with FakePostgrestServer() as server:
+        writer = BulkWriter(server.client(), 'data', chunk_size=500, max_bytes=max_bytes)
+        metrics = writer.upsert_json(to_json_rows(df))
+        assert len(server.rows) == ROWS
+        assert max(server.payload_sizes) <= max_bytes
+    # Unlimited, the 500-row chunks would be well above either limit
+    assert len(metrics) > ROWS // 500
+    assert sum(m['rows'] for m in metrics) == ROWS
+    assert all(m['bytes'] <= max_bytes for m in metrics)
+
+
+def test_a_single_row_above_the_byte_limit_is_still_sent(records):
+    with FakePostgrestServer() as server:
+        metrics = BulkWriter(server.client(), 'data', chunk_size=500, max_bytes=10).upsert(records[:3])
+        assert len(server.rows) == 3
+    assert [m['rows'] for m in metrics] == [1, 1, 1]
+
+
+def test_empty_upsert_sends_nothing():
+    with FakePostgrestServer() as server:
+        assert BulkWriter(server.client(), 'data').upsert([]) == []
+        assert server.requests == 0
+
+
+def test_transient_failures_are_retried(records):
+    # Every third request fails once; each chunk succeeds on a retry
+    with FakePostgrestServer(fail_every=3) as server:
+        writer = BulkWriter(server.client(), 'data', chunk_size=500, base_delay=0.01)
+        metrics = writer.upsert(records)
+        assert len(server.rows) == ROWS
+    assert sum(m['attempts'] - 1 for m in metrics) > 0
+    assert all(m['ok'] for m in metrics)
+
+
+def test_permanent_failures_raise_with_the_failed_chunks(records):
+    with FakePostgrestServer(fail_every=1) as server:
+        writer = BulkWriter(server.client(), 'data', chunk_size=500, max_retries=2, base_delay=0.01)
+        with pytest.raises(BulkWriteError, match="4 of 4 chunks failed on 'data'") as raised:
+            writer.upsert(records)
+        assert server.rows == {}
+        assert server.requests == 4 * 3
+    metrics = raised.value.metrics
+    assert [m['chunk'] for m in metrics if not m['ok']] == [0, 1, 2, 3]
+    assert all(m['attempts'] == 3 and 'HTTP 503' in m['error'] for m in metrics)
+
+
+def test_delete_in_removes_only_the_listed_dates(records):
+    with FakePostgrestServer() as server:
+        writer = BulkWriter(server.client(), 'data', chunk_size=500)
+        writer.upsert(records)
+        doomed = [r['Date'] for r in records[:250]]
+        writer.delete_in('Date', doomed)
+        assert len(server.rows) == ROWS - 250
+        assert not set(doomed) & set(server.rows)
@@ -0,0 +1,29 @@
+"""FRED API key resolution: environment first, then api_keys.txt, never a built-in key."""
+import pytest
+
+from logic import data_fetcher
+
+
+@pytest.fixture
+def no_fred_key(monkeypatch):
+    monkeypatch.delenv('FRED_API_KEY', raising=False)
+    monkeypatch.delenv('FRED_API', raising=False)
+    monkeypatch.setattr(data_fetcher, 'get_api_keys', lambda: {})
+    data_fetcher.get_fred_api_key.cache_clear()
+    yield
+    data_fetcher.get_fred_api_key.cache_clear()
+
+
+def test_environment_key_is_used(no_fred_key, monkeypatch):
+    monkeypatch.setenv('FRED_API_KEY', 'from-env')
+    assert data_fetcher.get_fred_api_key() == 'from-env'
+
+
+def test_missing_key_raises(no_fred_key):
+    with pytest.raises(data_fetcher.FredNotConfigured, match="FRED_API_KEY"):
+        data_fetcher.get_fred_api_key()
+
+
+def test_fetch_without_a_key_returns_an_empty_frame(no_fred_key):
+    df = data_fetcher.fetch_fred_data({'VIX': 'VIXCLS'}, incremental=False)
+    assert df.empty
@@ -0,0 +1,41 @@
+"""Progress event streams: delivery, and the per-process cap on open streams."""
+import threading
+import uuid
+
+import pytest
+
+from logic import progress
+
+
+@pytest.fixture
+def slots(monkeypatch):
+    monkeypatch.setattr(progress, '_stream_slots', threading.BoundedSemaphore(2))
+
+
+def test_stream_delivers_values_until_done():
+    channel = uuid.uuid4().hex
+    progress.publish(channel, (50, '50%', 'Halfway'))
+    progress.publish(channel, (100, '100%', 'Complete!'), done=True)
+    events = list(progress.stream(channel, timeout=5))
+    assert events[0].startswith('retry:')
+    assert events[-1] == 'data: {"value": [100, "100%", "Complete!"], "done": true}\n\n'
+
+
+def test_streams_beyond_the_cap_are_refused(slots):
+    first, second = progress.open_stream(uuid.uuid4().hex), progress.open_stream(uuid.uuid4().hex)
+    assert first is not None and second is not None
+    assert progress.open_stream(uuid.uuid4().hex) is None
+    first.close()
+    first.close()
+    third = progress.open_stream(uuid.uuid4().hex)
+    assert third is not None
+    assert progress.open_stream(uuid.uuid4().hex) is None
+    second.close()
+    third.close()
+
+
+def test_unstarted_stream_releases_its_slot(slots):
+    for _ in range(5):
+        events = progress.open_stream(uuid.uuid4().hex)
+        assert events is not None
+        events.close()
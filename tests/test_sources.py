@@ -0,0 +1,50 @@
+"""fetch_all: which series count as refreshed, and the store fallback for series whose source failed."""
+import pandas as pd
+import pytest
+
+from logic import sources
+from logic.sources import STORE_SOURCE, SourceAdapter, fetch_all
+
+DATES = pd.date_range('2020-01-31', periods=3, freq='ME')
+
+
+class WorkingSource(SourceAdapter):
+    def fetch_sync(self, series, since, progress=None):
+        return pd.DataFrame({name: [1.0, 2.0, 3.0] for name in series}, index=DATES)
+
+
+class FailingSource(SourceAdapter):
+    def fetch_sync(self, series, since, progress=None):
+        raise ConnectionError("upstream down")
+
+
+class StoredSource(SourceAdapter):
+    def fetch_sync(self, series, since, progress=None):
+        return pd.DataFrame({name: [9.0, 9.0, 9.0] for name in series}, index=DATES)
+
+
+@pytest.fixture
+def adapters(monkeypatch):
+    monkeypatch.setitem(sources.SOURCE_ADAPTERS, 'TEST_OK', WorkingSource)
+    monkeypatch.setitem(sources.SOURCE_ADAPTERS, 'TEST_DOWN', FailingSource)
+    monkeypatch.setitem(sources.SOURCE_ADAPTERS, STORE_SOURCE, StoredSource)
+
+
+CONFIG = {'A': {'source': 'TEST_OK'}, 'B': {'source': 'TEST_DOWN'}, 'C': {'source': 'TEST_OK'}}
+
+
+def test_only_series_that_came_back_are_refreshed(adapters):
+    raw = fetch_all(CONFIG, since='2020-01-01')
+    assert raw.attrs['refreshed'] == ['A', 'C']
+
+
+def test_failed_series_fall_back_to_stored_observations(adapters):
+    raw = fetch_all(CONFIG, since='2020-01-01')
+    assert list(raw.columns) == ['A', 'B', 'C']
+    assert raw['B'].tolist() == [9.0, 9.0, 9.0]
+
+
+def test_series_outside_refresh_are_read_from_the_store(adapters):
+    raw = fetch_all(CONFIG, since='2020-01-01', refresh={'A'})
+    assert raw.attrs['refreshed'] == ['A']
+    assert raw['C'].tolist() == [9.0, 9.0, 9.0]
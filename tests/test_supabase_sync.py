@@ -0,0 +1,38 @@
+"""save_to_supabase against the local PostgREST stand-in: float32 panels and the diff sync."""
+import numpy as np
+import pandas as pd
+
+from bench.fake_servers import FakePostgrestServer
+from logic.data_fetcher import save_to_supabase, supabase_table_schema
+
+
+def daily_panel():
+    index = pd.bdate_range('2024-01-01', periods=30, name='Date')
+    values = 18 + np.random.default_rng(0).standard_normal((len(index), 2)).cumsum(axis=0) / 10
+    return pd.DataFrame(values, index=index, columns=['ZAR_USD', 'VIX']).astype('float32')
+
+
+def test_float32_panel_is_stored_without_widening_noise():
+    panel = daily_panel()
+    with FakePostgrestServer() as server:
+        save_to_supabase(panel, client=server.client(), table='data_daily')
+        stored = server.tables['data_daily']
+    first = stored['2024-01-01']['ZAR_USD']
+    assert first == float(str(panel['ZAR_USD'].iloc[0]))
+    assert np.float32(first) == panel['ZAR_USD'].iloc[0]
+    assert all(len(repr(row['VIX'])) <= 10 for row in stored.values())
+
+
+def test_unchanged_float32_panel_syncs_nothing():
+    panel = daily_panel()
+    with FakePostgrestServer() as server:
+        client = server.client()
+        save_to_supabase(panel, client=client, table='data_daily')
+        again = save_to_supabase(panel, client=client, table='data_daily')
+    assert again['rows_written'] == 0
+
+
+def test_table_schema_has_a_column_per_series():
+    sql = supabase_table_schema('data_daily')
+    assert sql.startswith('CREATE TABLE IF NOT EXISTS public."data_daily"')
+    assert '"Date" date PRIMARY KEY' in sql and '"ZAR_USD" double precision' in sql
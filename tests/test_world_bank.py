@@ -0,0 +1,43 @@
+"""fetch_world_bank_gold_data against the local World Bank stand-in: cached workbook URL and its max age."""
+import pytest
+
+from bench.fake_servers import FakeWorldBankServer, build_cmo_workbook
+from logic import data_fetcher
+from logic.observation_store import ObservationStore
+
+
+@pytest.fixture
+def server(monkeypatch):
+    with FakeWorldBankServer(build_cmo_workbook(end='2020-12-01').getvalue()) as server:
+        monkeypatch.setattr(data_fetcher, 'WORLD_BANK_COMMODITY_PAGE_URL', server.page_url)
+        yield server
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ObservationStore(str(tmp_path / 'observations.sqlite'))
+
+
+def test_fresh_url_is_reused_without_scraping(server, store):
+    data_fetcher.fetch_world_bank_gold_data(store=store)
+    resolved = store.get_download('CMO-Historical-Data-Monthly.xlsx')
+    gold = data_fetcher.fetch_world_bank_gold_data(store=store)
+    assert server.page_hits == 1
+    assert server.not_modified == 1
+    assert gold.index[-1].strftime('%Y-%m-%d') == '2020-12-31'
+    # Revalidating the workbook does not make the link any younger
+    assert store.get_download('CMO-Historical-Data-Monthly.xlsx')['checked_at'] == resolved['checked_at']
+
+
+def test_stale_url_is_resolved_again(server, store, monkeypatch):
+    data_fetcher.fetch_world_bank_gold_data(store=store)
+    # A new workbook under a new URL; the old URL keeps serving the old one
+    server.publish(build_cmo_workbook(end='2021-06-01').getvalue(), '/v2/files')
+
+    assert data_fetcher.fetch_world_bank_gold_data(store=store).index[-1].strftime('%Y-%m-%d') == '2020-12-31'
+    monkeypatch.setattr(data_fetcher, 'WORLD_BANK_URL_MAX_AGE', 0)
+    gold = data_fetcher.fetch_world_bank_gold_data(store=store)
+
+    assert server.page_hits == 2
+    assert gold.index[-1].strftime('%Y-%m-%d') == '2021-06-30'
+    assert store.get_download('CMO-Historical-Data-Monthly.xlsx')['url'].endswith('/v2/files/CMO-Historical-Data-Monthly.xlsx')